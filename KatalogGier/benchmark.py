@@ -0,0 +1,732 @@
+#!/usr/bin/env python3
+"""
+===============================================================================
+PLIK: benchmark.py
+OPIS: Pomiary wydajności katalogu na dużych, syntetycznych danych
+===============================================================================
+
+URUCHOMIENIE:
+    python benchmark.py            # wszystkie pomiary
+    python benchmark.py indeks     # wybrany pomiar
+
+===============================================================================
+"""
+
+import collections
+import itertools
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from indeksy import IndeksTrigramow
+from katalog import Katalog
+from magazyn import utworz_magazyn
+import magazyn as modul_magazynu
+import statystyki
+import wymiana
+from modele import Pozycja, OcenaGra, KolumnyOcen
+
+SLOWA = [
+    "Dark", "Souls", "Ring", "Elden", "Legend", "Wiedźmin", "Dragon", "Star",
+    "Wars", "Empire", "Kingdom", "Hearts", "Final", "Fantasy", "Quest", "Shadow",
+    "Night", "City", "Racing", "Tactics", "Space", "Knight", "Hollow", "Ocean",
+    "Forest", "Źródło", "Królestwo", "Miecz", "Zamek", "Burza", "Ogień", "Lód",
+]
+
+
+def generuj_pozycje(liczba: int, ziarno: int = 42) -> List[Pozycja]:
+    """
+    Tworzy syntetyczne gry o kolejnych ID
+
+    Args:
+        liczba: Liczba gier do wygenerowania
+        ziarno: Ziarno generatora losowego
+
+    Returns:
+        Lista pozycji
+    """
+    los = random.Random(ziarno)
+    return [
+        Pozycja(i, f"{' '.join(los.choices(SLOWA, k=3))} {i}", f"Wydawca {i % 500}",
+                los.choice(Katalog.GATUNKI), los.randint(1980, 2024))
+        for i in range(1, liczba + 1)
+    ]
+
+
+def generuj_oceny(pozycje: List[Pozycja], na_gre: int, ziarno: int = 7) -> None:
+    """Dodaje każdej grze podaną liczbę losowych ocen"""
+    los = random.Random(ziarno)
+    for pozycja in pozycje:
+        for _ in range(na_gre):
+            pozycja.dodaj_ocene(OcenaGra(los.randint(1, 10)))
+
+
+def zmierz_pamiec(funkcja: Callable[[], object]) -> int:
+    """
+    Mierzy pamięć zajętą przez wynik funkcji
+
+    Returns:
+        Liczba bajtów zaalokowanych i wciąż zajętych po wywołaniu
+    """
+    tracemalloc.start()
+    wynik = funkcja()
+    zajete, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del wynik
+    return zajete
+
+
+def zmierz(funkcja: Callable[[], object], powtorzenia: int = 1) -> float:
+    """
+    Mierzy czas wykonania funkcji
+
+    Returns:
+        Czas jednego wywołania w sekundach
+    """
+    start = time.perf_counter()
+    for _ in range(powtorzenia):
+        funkcja()
+    return (time.perf_counter() - start) / powtorzenia
+
+
+# =============================================================================
+# POMIARY
+# =============================================================================
+
+def benchmark_indeks() -> None:
+    """Czas pobierz_pozycje w zależności od rozmiaru katalogu"""
+    print("pobierz_pozycje (indeks ID) vs. przeszukiwanie liniowe")
+    print(f"{'gier':>10} | {'indeks [µs]':>12} | {'liniowo [µs]':>12}")
+    for rozmiar in (1_000, 10_000, 100_000, 300_000):
+        katalog = Katalog()
+        katalog.pozycje.extend(generuj_pozycje(rozmiar))
+        los = random.Random(rozmiar)
+        ids = [los.randint(1, rozmiar) for _ in range(1000)]
+        
+        czas_indeks = zmierz(lambda: [katalog.pobierz_pozycje(i) for i in ids])
+        probka = ids[:20]
+        czas_liniowo = zmierz(
+            lambda: [next(p for p in katalog.pozycje if p.id == i) for i in probka])
+        
+        print(f"{rozmiar:>10} | {czas_indeks / len(ids) * 1e6:>12.3f} | "
+              f"{czas_liniowo / len(probka) * 1e6:>12.1f}")
+
+
+def benchmark_przydzial_id() -> None:
+    """Czas przydziału ID przy masowym dodawaniu (bez zapisu na dysk)"""
+    def stary_przydzial(katalog: Katalog) -> int:
+        uzyte_id = {p.id for p in katalog.pozycje}
+        nowe_id = 1
+        while nowe_id in uzyte_id:
+            nowe_id += 1
+        return nowe_id
+    
+    print("Przydział ID: kopiec wolnych ID vs. liniowe szukanie luki")
+    print(f"{'gier':>10} | {'kopiec [µs/ID]':>15} | {'liniowo [µs/ID]':>15}")
+    for rozmiar in (1_000, 10_000, 100_000):
+        katalog = Katalog()
+        katalog.pozycje.extend(generuj_pozycje(rozmiar))
+        # Usuń co dziesiątą grę, aby powstały luki do ponownego wykorzystania
+        del katalog.pozycje[::10]
+        
+        def dodaj(przydzial: Callable[[Katalog], int], liczba: int) -> None:
+            for _ in range(liczba):
+                katalog.pozycje.append(Pozycja(przydzial(katalog), "Nowa gra"))
+        
+        czas_kopiec = zmierz(lambda: dodaj(Katalog._przydziel_id, 1000)) / 1000
+        czas_liniowo = zmierz(lambda: dodaj(stary_przydzial, 20)) / 20
+        print(f"{rozmiar:>10} | {czas_kopiec * 1e6:>15.2f} | {czas_liniowo * 1e6:>15.1f}")
+
+
+def benchmark_wyszukiwanie(rozmiar: int = 1_000_000) -> None:
+    """Wyszukiwanie po fragmencie tytułu: indeks trigramów vs. przegląd listy"""
+    pozycje = generuj_pozycje(rozmiar)
+    indeks = IndeksTrigramow()
+    czas_budowy = zmierz(lambda: [indeks.dodaj(p.id, p.tytul) for p in pozycje])
+    print(f"Indeks trigramów dla {rozmiar} tytułów zbudowany w {czas_budowy:.1f} s")
+    
+    print(f"{'fraza':>16} | {'wyników':>8} | {'indeks [ms]':>12} | {'liniowo [ms]':>12}")
+    for fraza in ("Wiedźmin Ring 12", "hollow knight", "źródło", "999999", "ring"):
+        fraza_lower = fraza.lower()
+        wyniki = list(indeks.szukaj(fraza))
+        czas_indeks = zmierz(lambda: list(indeks.szukaj(fraza)), 3)
+        czas_liniowo = zmierz(lambda: [p for p in pozycje if fraza_lower in p.tytul.lower()])
+        print(f"{fraza:>16} | {len(wyniki):>8} | {czas_indeks * 1e3:>12.2f} | "
+              f"{czas_liniowo * 1e3:>12.1f}")
+
+
+def benchmark_filtry(rozmiar: int = 500_000) -> None:
+    """Filtrowanie po gatunku i zakresie lat: indeksy vs. przegląd listy"""
+    katalog = Katalog()
+    katalog.pozycje.extend(generuj_pozycje(rozmiar))
+    print(f"Filtry na katalogu {rozmiar} gier")
+    print(f"{'zapytanie':>22} | {'wyników':>8} | {'indeks [ms]':>12} | {'liniowo [ms]':>12}")
+    
+    zapytania = [
+        ("gatunek RPG", lambda: katalog.filtruj_po_gatunku("RPG"),
+         lambda: [p for p in katalog.pozycje if p.gatunek == "RPG"]),
+        ("lata 2000-2000", lambda: katalog.filtruj_po_roku(2000, 2000),
+         lambda: [p for p in katalog.pozycje if 2000 <= p.rok <= 2000]),
+        ("lata 2023-2024", lambda: katalog.filtruj_po_roku(2023, 2024),
+         lambda: [p for p in katalog.pozycje if 2023 <= p.rok <= 2024]),
+        ("lata 1990-1994", lambda: katalog.filtruj_po_roku(1990, 1994),
+         lambda: [p for p in katalog.pozycje if 1990 <= p.rok <= 1994]),
+        ("rozklad_gatunkow", katalog.rozklad_gatunkow, None),
+    ]
+    for nazwa, indeks, liniowo in zapytania:
+        wyniki = len(indeks())
+        czas_indeks = zmierz(indeks, 3)
+        czas_liniowo = f"{zmierz(liniowo, 3) * 1e3:>12.1f}" if liniowo else f"{'-':>12}"
+        print(f"{nazwa:>22} | {wyniki:>8} | {czas_indeks * 1e3:>12.2f} | {czas_liniowo}")
+
+
+def benchmark_ranking(rozmiar: int = 200_000) -> None:
+    """Ranking ocen: utrzymywana posortowana lista vs. sortowanie przy każdym zapytaniu"""
+    katalog = Katalog()
+    pozycje = generuj_pozycje(rozmiar)
+    generuj_oceny(pozycje, 3)
+    katalog.pozycje.extend(pozycje)
+    
+    def stare_sortowanie() -> list:
+        ocenione = [p for p in katalog.pozycje if p.oceny]
+        ocenione.sort(key=lambda p: p.srednia_ocena(), reverse=True)
+        return ocenione + [p for p in katalog.pozycje if not p.oceny]
+    
+    los = random.Random(3)
+    ids = [los.randint(1, rozmiar) for _ in range(1000)]
+    # Ocena dodawana bezpośrednio do pozycji - bez zapisu na dysk, z aktualizacją rankingu
+    czas_oceny = zmierz(lambda: [katalog.pobierz_pozycje(i).dodaj_ocene(OcenaGra(los.randint(1, 10)))
+                                 for i in ids]) / len(ids)
+    
+    print(f"Ranking ocen na katalogu {rozmiar} gier")
+    print(f"  dodanie oceny (z aktualizacją rankingu): {czas_oceny * 1e6:10.1f} µs")
+    print(f"  najlepsza():                             {zmierz(katalog.najlepsza, 100) * 1e6:10.1f} µs")
+    print(f"  najlepsza() - przegląd listy:            "
+          f"{zmierz(lambda: max(katalog.pozycje, key=lambda p: p.srednia_ocena())) * 1e6:10.1f} µs")
+    print(f"  pierwsze 50 z rankingu:                  "
+          f"{zmierz(lambda: list(itertools.islice(katalog.iteruj_po_ocenie(), 50)), 100) * 1e6:10.1f} µs")
+    print(f"  pełny ranking (sortuj_po_ocenie):        {zmierz(katalog.sortuj_po_ocenie) * 1e3:10.1f} ms")
+    print(f"  pełny ranking - sortowanie listy:        {zmierz(stare_sortowanie) * 1e3:10.1f} ms")
+
+
+def benchmark_statystyki(rozmiar: int = 200_000) -> None:
+    """Statystyki katalogu: zbiór z indeksów vs. osobne przeglądy listy gier"""
+    katalog = Katalog()
+    pozycje = generuj_pozycje(rozmiar)
+    generuj_oceny(pozycje, 3)
+    katalog.pozycje.extend(pozycje)
+    
+    def przeglady() -> tuple:
+        ocenione = [p for p in katalog.pozycje if p.oceny]
+        srednia = sum(p.srednia_ocena() for p in ocenione) / len(ocenione)
+        najlepsza = max(ocenione, key=lambda p: p.srednia_ocena())
+        najgorsza = min(ocenione, key=lambda p: p.srednia_ocena())
+        gatunki: Dict[str, int] = {}
+        for p in katalog.pozycje:
+            gatunki[p.gatunek] = gatunki.get(p.gatunek, 0) + 1
+        lata = (min(p.rok for p in katalog.pozycje), max(p.rok for p in katalog.pozycje))
+        return srednia, najlepsza, najgorsza, gatunki, lata
+    
+    los = random.Random(5)
+    ids = [los.randint(1, rozmiar) for _ in range(1000)]
+    czas_oceny = zmierz(lambda: [katalog.pobierz_pozycje(i).dodaj_ocene(OcenaGra(los.randint(1, 10)))
+                                 for i in ids]) / len(ids)
+    
+    print(f"Statystyki katalogu {rozmiar} gier")
+    print(f"  dodanie oceny (z aktualizacją sum):      {czas_oceny * 1e6:10.1f} µs")
+    print(f"  statystyki() z indeksów:                 {zmierz(katalog.statystyki, 100) * 1e6:10.1f} µs")
+    print(f"  osobne przeglądy listy:                  {zmierz(przeglady) * 1e6:10.1f} µs")
+
+
+def benchmark_raport(rozmiar: int = 500_000) -> None:
+    """Raport statystyk: pętle po grach vs. jeden przebieg po kolumnach (array / NumPy)"""
+    katalog = Katalog()
+    pozycje = generuj_pozycje(rozmiar)
+    generuj_oceny(pozycje, 3)
+    katalog.pozycje.extend(pozycje)
+    
+    def petle() -> dict:
+        wynik = {}
+        for nazwa, klucz in (("gatunki", lambda p: p.gatunek), ("lata", lambda p: p.rok)):
+            grupy: Dict[object, List[float]] = {}
+            for p in katalog.pozycje:
+                if p.oceny:
+                    grupy.setdefault(klucz(p), []).append(p.srednia_ocena())
+            wynik[nazwa] = {k: (statistics.fmean(v), statistics.pstdev(v))
+                            for k, v in grupy.items()}
+        srednie = [p.srednia_ocena() for p in katalog.pozycje if p.oceny]
+        wynik['percentyle'] = statistics.quantiles(srednie, n=4)
+        wynik['odchylenie'] = statistics.pstdev(srednie)
+        wynik['histogram'] = collections.Counter(w for p in katalog.pozycje for w in p.oceny.wartosci)
+        return wynik
+    
+    czas_kolumn = zmierz(katalog.kolumny)
+    kolumny = katalog.kolumny()
+    print(f"Raport statystyk dla {rozmiar} gier ({len(kolumny.oceny)} ocen)")
+    print(f"  pętle po grach (statistics):   {zmierz(petle):8.3f} s")
+    print(f"  eksport do kolumn:             {czas_kolumn:8.3f} s")
+    print(f"  raport - pętla po tablicach:   {zmierz(lambda: statystyki.raport(kolumny, False)):8.3f} s")
+    if statystyki.np is not None:
+        print(f"  raport - NumPy:                {zmierz(lambda: statystyki.raport(kolumny, True)):8.3f} s")
+    else:
+        print("  raport - NumPy:                (numpy nie jest zainstalowany)")
+
+
+def benchmark_zapytania(rozmiar: int = 300_000) -> None:
+    """Złożone zapytanie: leniwy planer vs. łańcuch pełnych list"""
+    katalog = Katalog()
+    pozycje = generuj_pozycje(rozmiar)
+    generuj_oceny(pozycje, 2)
+    katalog.pozycje.extend(pozycje)
+    
+    def recznie() -> list:
+        wyniki = katalog.filtruj_po_gatunku("RPG")
+        wyniki = [p for p in wyniki if 2010 <= p.rok <= 2020]
+        wyniki = [p for p in wyniki if "ring" in p.tytul.lower()]
+        wyniki.sort(key=lambda p: p.srednia_ocena(), reverse=True)
+        return wyniki[:50]
+    
+    zapytania = {
+        "gatunek+lata+tytuł+top50": katalog.zapytanie().gatunek("RPG").lata(2010, 2020)
+                                           .tytul_zawiera("ring").sortuj_ocena().limit(50),
+        "lata 2000 + top10": katalog.zapytanie().lata(2000, 2000).sortuj_ocena().limit(10),
+        "tytuł 'hollow knight'": katalog.zapytanie().tytul_zawiera("hollow knight").gatunek("RPG"),
+    }
+    print(f"Zapytania na katalogu {rozmiar} gier")
+    print(f"  łańcuch list (gatunek+lata+tytuł+top50): {zmierz(recznie, 3) * 1e3:8.2f} ms")
+    for nazwa, zapytanie in zapytania.items():
+        print(f"  {nazwa:<27} {zmierz(zapytanie.wykonaj, 3) * 1e3:8.2f} ms  [{zapytanie.plan()}]")
+
+
+def benchmark_import(gier: int = 200_000, probka: int = 10) -> None:
+    """Import wielu gier: dodaj_wiele (jeden zapis) vs. dodaj_pozycje w pętli"""
+    los = random.Random(4)
+    dane = [(p.tytul, p.wydawca, p.gatunek, p.rok) for p in generuj_pozycje(gier)]
+    oceny = [(los.randint(1, gier), los.randint(1, 10)) for _ in range(gier)]
+    
+    print(f"Import {gier} gier i {len(oceny)} ocen")
+    print(f"{'plik':>14} | {'dodaj_wiele [s]':>15} | {'dodaj_oceny_wiele [s]':>21} | "
+          f"{'pętla [ms/grę]':>14}")
+    with tempfile.TemporaryDirectory() as katalog_tymczasowy:
+        for nazwa, dziennik in (("katalog.json", False), ("dziennik.json", True), ("katalog.db", False)):
+            katalog = Katalog(os.path.join(katalog_tymczasowy, nazwa), tryb_dziennika=dziennik)
+            czas_gier = zmierz(lambda: katalog.dodaj_wiele(dane))
+            czas_ocen = zmierz(lambda: katalog.dodaj_oceny_wiele(oceny))
+            # Pętla mierzona na próbce - każde dodanie zapisuje katalog osobno
+            czas_petli = zmierz(lambda: [katalog.dodaj_pozycje(*wpis) for wpis in dane[:probka]])
+            print(f"{nazwa:>14} | {czas_gier:>15.2f} | {czas_ocen:>21.2f} | "
+                  f"{czas_petli / probka * 1e3:>14.2f}")
+            katalog.magazyn.zamknij()
+
+
+def _szczyt_pamieci(funkcja: Callable[[], object]) -> int:
+    """Szczytowa pamięć zaalokowana w trakcie wywołania funkcji (w bajtach)"""
+    tracemalloc.start()
+    funkcja()
+    _, szczyt = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return szczyt
+
+
+def benchmark_wymiana(rozmiary=(20_000, 200_000), ocen_na_gre: int = 5) -> None:
+    """Strumieniowy eksport/odczyt CSV i JSON Lines: czas i szczyt pamięci vs. rozmiar pliku"""
+    print(f"{'plik':>14} | {'gier':>7} | {'rozmiar [MB]':>12} | {'eksport [s]':>11} | "
+          f"{'odczyt [s]':>10} | {'szczyt odczytu [kB]':>19}")
+    with tempfile.TemporaryDirectory() as katalog_tymczasowy:
+        for gier in rozmiary:
+            pozycje = generuj_pozycje(gier)
+            generuj_oceny(pozycje, ocen_na_gre)
+            for nazwa in ("gry.csv", "gry.jsonl"):
+                sciezka = os.path.join(katalog_tymczasowy, nazwa)
+                czas_eksportu = zmierz(lambda: wymiana.eksportuj(pozycje, sciezka))
+                # Odczyt bez zatrzymywania wpisów - pamięć zależy tylko od bieżącego wiersza
+                czas_odczytu = zmierz(lambda: sum(1 for _ in wymiana.czytaj(sciezka)))
+                szczyt = _szczyt_pamieci(lambda: sum(1 for _ in wymiana.czytaj(sciezka)))
+                rozmiar = os.path.getsize(sciezka) / 2**20
+                print(f"{nazwa:>14} | {gier:>7} | {rozmiar:>12.1f} | {czas_eksportu:>11.2f} | "
+                      f"{czas_odczytu:>10.2f} | {szczyt / 1024:>19.0f}")
+
+
+def benchmark_wczytywanie(gier: int = 200_000, ocen_na_gre: int = 5) -> None:
+    """Wczytywanie katalogu JSON: json.load całego pliku vs. odczyt strumieniowy"""
+    pozycje = generuj_pozycje(gier)
+    generuj_oceny(pozycje, ocen_na_gre)
+    with tempfile.TemporaryDirectory() as katalog_tymczasowy:
+        sciezka = os.path.join(katalog_tymczasowy, "katalog.json")
+        utworz_magazyn(sciezka).zapisz(pozycje)
+        del pozycje
+        rozmiar = os.path.getsize(sciezka) / 2**20
+        
+        def caly_plik():
+            with open(sciezka, 'r', encoding='utf-8') as f:
+                return [Pozycja.from_dict(p) for p in json.load(f)['pozycje']]
+        
+        def pierwsza_partia():
+            return next(Katalog(sciezka).wczytuj_partiami())
+        
+        print(f"Katalog JSON: {gier} gier, {rozmiar:.1f} MB")
+        print(f"{'sposób':>22} | {'czas [s]':>8} | {'szczyt pamięci [MB]':>19}")
+        for nazwa, funkcja in (("json.load", caly_plik),
+                               ("strumieniowo", utworz_magazyn(sciezka).wczytaj),
+                               ("Katalog.wczytaj", lambda: Katalog(sciezka).wczytaj()),
+                               ("pierwsza partia", pierwsza_partia)):
+            czas = zmierz(funkcja)
+            szczyt = _szczyt_pamieci(funkcja)
+            print(f"{nazwa:>22} | {czas:>8.2f} | {szczyt / 2**20:>19.0f}")
+
+
+def benchmark_migawki(gier: int = 500_000) -> None:
+    """Widok listy dla GUI i zapisu w tle: kopia listy vs. migawka kopiowana przy zapisie"""
+    katalog = Katalog()
+    katalog.pozycje.extend(generuj_pozycje(gier))
+    migawka = katalog.migawka()
+    kopia = katalog.pobierz_wszystkie()
+    
+    print(f"Widok katalogu {gier} gier")
+    print(f"  kopia listy (pobierz_wszystkie):       {zmierz(katalog.pobierz_wszystkie, 10) * 1e3:9.3f} ms")
+    print(f"  migawka():                             {zmierz(katalog.migawka, 1000) * 1e3:9.3f} ms")
+    print(f"  przegląd kopii:                        {zmierz(lambda: sum(1 for _ in kopia)) * 1e3:9.3f} ms")
+    print(f"  przegląd migawki:                      {zmierz(lambda: sum(1 for _ in migawka)) * 1e3:9.3f} ms")
+    
+    # GUI trzyma wyświetlaną migawkę do następnego odświeżenia
+    widok = [migawka]
+    
+    def dodaj_i_odswiez() -> None:
+        katalog.pozycje.append(Pozycja(0, "Nowa gra", "Wydawca", "RPG", 2024))
+        widok[0] = katalog.migawka()
+    
+    def usun_i_odswiez() -> None:
+        katalog.pozycje.pop(0)
+        widok[0] = katalog.migawka()
+    
+    print(f"  dodanie gry przy żywej migawce:        {zmierz(dodaj_i_odswiez, 100) * 1e3:9.3f} ms")
+    print(f"  usunięcie gry przy żywej migawce:      {zmierz(usun_i_odswiez, 10) * 1e3:9.3f} ms")
+
+
+def benchmark_zapis_w_tle(gier: int = 100_000, zmian: int = 20) -> None:
+    """Czas zmiany w wątku wywołującym (GUI): zapis od razu vs. zapis w tle"""
+    pozycje = generuj_pozycje(gier)
+    print(f"Katalog {gier} gier, seria {zmian} ocen")
+    print(f"{'plik':>14} | {'tryb':>8} | {'ms/zmianę':>9} | {'zapis serii [s]':>15}")
+    with tempfile.TemporaryDirectory() as katalog_tymczasowy:
+        for nazwa, dziennik in (("katalog.json", False), ("dziennik.json", True), ("katalog.db", False)):
+            for tryb, opoznienie in (("od razu", None), ("w tle", 0.5)):
+                sciezka = os.path.join(katalog_tymczasowy, f"{tryb}_{nazwa}".replace(' ', '_'))
+                katalog = Katalog(sciezka, tryb_dziennika=dziennik, zapis_w_tle=opoznienie)
+                katalog.pozycje = list(pozycje)
+                katalog.zapisz()
+                ids = [p.id for p in pozycje[:zmian]]
+                czas_zmian = zmierz(lambda: [katalog.dodaj_ocene(id, 7) for id in ids])
+                # Czas do zapisania serii (w tle: opóźnienie + jeden zapis)
+                czas_zapisu = czas_zmian + zmierz(katalog.zamknij)
+                print(f"{nazwa:>14} | {tryb:>8} | {czas_zmian / zmian * 1e3:>9.2f} | {czas_zapisu:>15.2f}")
+                for p in pozycje:
+                    p.oceny = []
+
+
+def benchmark_wspolbieznosc(gier: int = 20_000, czytelnicy: int = 4, pisarze: int = 2,
+                            oceniajacy: int = 2, czas: float = 3.0) -> None:
+    """
+    Test obciążeniowy katalogu wielowątkowego: równoległe zapytania, dodawanie
+    i usuwanie gier oraz oceny, ze sprawdzaniem niezmienników (unikalne ID,
+    zgodne indeksy, liczby ocen) w trakcie, na końcu i po ponownym wczytaniu
+    """
+    pozycje = generuj_pozycje(gier)
+    generuj_oceny(pozycje, 2)
+    chronione = [p.id for p in pozycje[:100]]  # Gry, których pisarze nie usuwają
+    stop = threading.Event()
+    wyniki: List[tuple] = []      # (rodzaj wątku, liczba operacji)
+    bledy: List[BaseException] = []
+    oceny_watkow: List[collections.Counter] = []
+    
+    with tempfile.TemporaryDirectory() as katalog_tymczasowy:
+        sciezka = os.path.join(katalog_tymczasowy, "katalog.json")
+        katalog = Katalog(sciezka, zapis_w_tle=0.05, wielowatkowy=True)
+        katalog.pozycje = pozycje
+        katalog.zapisz()
+        poczatkowe = {id: len(katalog.pobierz_pozycje(id).oceny) for id in chronione}
+        
+        def sprawdz_niezmienniki() -> None:
+            """Spójność listy i indeksów w jednym, niezmiennym stanie katalogu"""
+            with katalog.blokada.czytanie():
+                lista = katalog.pozycje
+                ids = [p.id for p in lista]
+                assert len(set(ids)) == len(ids), "powtórzone ID"
+                assert len(lista) == len(katalog._indeks_id) == katalog.liczba_gier()
+                assert sum(katalog.rozklad_gatunkow().values()) == len(lista)
+                assert (katalog._indeks_ocen.liczba_ocenionych()
+                        == sum(1 for p in lista if p.oceny)), "ranking niezgodny z ocenami"
+        
+        def pisarz(numer: int) -> int:
+            los = random.Random(numer)
+            dodane: List[int] = []
+            operacje = 0
+            while not stop.is_set():
+                if dodane and los.random() < 0.4:
+                    assert katalog.usun_pozycje(dodane.pop(los.randrange(len(dodane))))
+                else:
+                    dodane.append(katalog.dodaj_pozycje(f"Gra wątku {numer}", "Wydawca",
+                                                        los.choice(Katalog.GATUNKI),
+                                                        los.randint(1980, 2024)).id)
+                operacje += 1
+            return operacje
+        
+        def oceniajacy_watek(numer: int) -> int:
+            los = random.Random(100 + numer)
+            moje = collections.Counter()
+            while not stop.is_set():
+                id = los.choice(chronione)
+                if katalog.dodaj_ocene(id, los.randint(1, 10)):
+                    moje[id] += 1
+            oceny_watkow.append(moje)
+            return sum(moje.values())
+        
+        def czytelnik(numer: int) -> int:
+            los = random.Random(200 + numer)
+            operacje = 0
+            while not stop.is_set():
+                gatunek = los.choice(Katalog.GATUNKI)
+                rodzaj = operacje % 6
+                if rodzaj == 0:
+                    katalog.wyszukaj(los.choice(SLOWA), limit=20)
+                elif rodzaj == 1:
+                    assert katalog.statystyki()['liczba_gier'] >= gier
+                elif rodzaj == 2:
+                    katalog.kursor('gatunek', gatunek, rozmiar_strony=100).nastepna()
+                elif rodzaj == 3:
+                    katalog.zapytanie().gatunek(gatunek).sortuj_ocena().limit(10).wykonaj()
+                elif rodzaj == 4:
+                    katalog.najlepsze(10, gatunek)
+                else:
+                    sprawdz_niezmienniki()
+                operacje += 1
+            return operacje
+        
+        def uruchom(rodzaj: str, funkcja: Callable[[int], int], numer: int) -> None:
+            try:
+                wyniki.append((rodzaj, funkcja(numer)))
+            except BaseException as blad:
+                bledy.append(blad)
+                stop.set()
+        
+        watki = [threading.Thread(target=uruchom, args=(rodzaj, funkcja, numer))
+                 for rodzaj, funkcja, liczba in (("zapytania", czytelnik, czytelnicy),
+                                                 ("zmiany gier", pisarz, pisarze),
+                                                 ("oceny", oceniajacy_watek, oceniajacy))
+                 for numer in range(liczba)]
+        for watek in watki:
+            watek.start()
+        time.sleep(czas)
+        stop.set()
+        for watek in watki:
+            watek.join()
+        katalog.zamknij()
+        if bledy:
+            raise bledy[0]
+        
+        sprawdz_niezmienniki()
+        dodane_oceny = sum(oceny_watkow, collections.Counter())
+        for id in chronione:
+            assert len(katalog.pobierz_pozycje(id).oceny) == poczatkowe[id] + dodane_oceny[id]
+        
+        # Zapis w tle korzystał z migawek - plik musi odpowiadać pamięci
+        wczytany = Katalog(sciezka)
+        wczytany.wczytaj()
+        assert [p.id for p in wczytany.pozycje] == [p.id for p in katalog.pozycje]
+        assert all(len(wczytany.pobierz_pozycje(id).oceny) == len(katalog.pobierz_pozycje(id).oceny)
+                   for id in chronione)
+        
+        print(f"Katalog {gier} gier, {len(watki)} wątków przez {czas:.1f} s - niezmienniki zachowane")
+        operacje = collections.Counter()
+        for rodzaj, liczba in wyniki:
+            operacje[rodzaj] += liczba
+        for rodzaj, liczba in operacje.items():
+            print(f"  {rodzaj:<12} {liczba / czas:>10.0f} op/s")
+        
+        # Narzut blokady przy pracy z jednego wątku
+        ids = [p.id for p in pozycje[:10_000]]
+        for opis, wielowatkowy in (("bez blokady", False), ("z blokadą", True)):
+            jednowatkowy = Katalog(os.path.join(katalog_tymczasowy, "pomiar.json"),
+                                   wielowatkowy=wielowatkowy)
+            jednowatkowy.pozycje = pozycje
+            czas_odczytu = zmierz(lambda: [jednowatkowy.pobierz_pozycje(id) for id in ids], 5)
+            print(f"  pobierz_pozycje {opis:<12} {czas_odczytu / len(ids) * 1e9:>8.0f} ns")
+
+
+def benchmark_zapis_atomowy(gier: int = 50_000, ocen_na_gre: int = 10,
+                            powtorzenia: int = 3) -> None:
+    """Narzut zapisu atomowego (plik tymczasowy + fsync + os.replace + pokolenia)"""
+    pozycje = generuj_pozycje(gier)
+    generuj_oceny(pozycje, ocen_na_gre)
+    atomowy = modul_magazynu.zapis_atomowy
+    
+    def zwykly(sciezka, tryb='w', pokolenia=0, **opcje):
+        return open(sciezka, tryb, **opcje)
+    
+    print(f"Katalog: {gier} gier, {gier * ocen_na_gre} ocen")
+    print(f"{'plik':>14} | {'open(w) [s]':>11} | {'atomowy [s]':>11} | {'narzut':>7}")
+    with tempfile.TemporaryDirectory() as katalog_tymczasowy:
+        for nazwa in ("katalog.json", "katalog.bin"):
+            magazyn = utworz_magazyn(os.path.join(katalog_tymczasowy, nazwa))
+            magazyn.zapisz(pozycje)
+            try:
+                modul_magazynu.zapis_atomowy = zwykly
+                czas_zwykly = zmierz(lambda: magazyn.zapisz(pozycje), powtorzenia)
+            finally:
+                modul_magazynu.zapis_atomowy = atomowy
+            czas_atomowy = zmierz(lambda: magazyn.zapisz(pozycje), powtorzenia)
+            narzut = (czas_atomowy - czas_zwykly) / czas_zwykly * 100
+            print(f"{nazwa:>14} | {czas_zwykly:>11.3f} | {czas_atomowy:>11.3f} | {narzut:>6.1f}%")
+
+
+def benchmark_formaty(gier: int = 20_000, ocen_na_gre: int = 50) -> None:
+    """Rozmiar i czas zapisu/odczytu katalogu w formatach JSON i binarnym"""
+    pozycje = generuj_pozycje(gier)
+    generuj_oceny(pozycje, ocen_na_gre)
+    print(f"Katalog: {gier} gier, {gier * ocen_na_gre} ocen")
+    print(f"{'plik':>14} | {'rozmiar [MB]':>12} | {'zapis [s]':>9} | {'odczyt [s]':>10}")
+    
+    with tempfile.TemporaryDirectory() as katalog_tymczasowy:
+        for nazwa in ("katalog.json", "katalog.bin"):
+            magazyn = utworz_magazyn(os.path.join(katalog_tymczasowy, nazwa))
+            czas_zapisu = zmierz(lambda: magazyn.zapisz(pozycje))
+            czas_odczytu = zmierz(magazyn.wczytaj)
+            rozmiar = os.path.getsize(magazyn.sciezka) / 2**20
+            print(f"{nazwa:>14} | {rozmiar:>12.1f} | {czas_zapisu:>9.2f} | {czas_odczytu:>10.2f}")
+
+
+def benchmark_kompresja(gier: int = 50_000, ocen_na_gre: int = 10) -> None:
+    """Rozmiar, czas zapisu i odczytu pliku JSON: wcięcia, zwarty zapis, gzip, lzma"""
+    pozycje = generuj_pozycje(gier)
+    generuj_oceny(pozycje, ocen_na_gre)
+    warianty = (
+        ("katalog.json", False, "wcięcia (indent=2)"),
+        ("katalog.json", True, "zwarty"),
+        ("katalog.json.gz", True, "zwarty + gzip"),
+        ("katalog.json.xz", True, "zwarty + lzma"),
+    )
+    print(f"Katalog: {gier} gier, {gier * ocen_na_gre} ocen")
+    print(f"{'wariant':>20} | {'rozmiar [MB]':>12} | {'zapis [s]':>9} | {'odczyt [s]':>10}")
+    
+    with tempfile.TemporaryDirectory() as katalog_tymczasowy:
+        for nazwa, kompaktowy, opis in warianty:
+            magazyn = modul_magazynu.MagazynJSON(os.path.join(katalog_tymczasowy, nazwa),
+                                                 kompaktowy=kompaktowy)
+            magazyn.POKOLENIA = 0
+            czas_zapisu = zmierz(lambda: magazyn.zapisz(pozycje))
+            czas_odczytu = zmierz(magazyn.wczytaj)
+            rozmiar = os.path.getsize(magazyn.sciezka) / 2**20
+            print(f"{opis:>20} | {rozmiar:>12.1f} | {czas_zapisu:>9.2f} | {czas_odczytu:>10.2f}")
+
+
+def benchmark_opisy(gier: int = 200_000, ocen_na_gre: int = 3) -> None:
+    """Wiersze listy: pierwsze formatowanie vs. zapamiętany opis (Pozycja.__str__)"""
+    pozycje = generuj_pozycje(gier)
+    generuj_oceny(pozycje, ocen_na_gre)
+    pierwsze = zmierz(lambda: [str(p) for p in pozycje])
+    ponowne = zmierz(lambda: [str(p) for p in pozycje], 3)
+    print(f"Opisy {gier} gier")
+    print(f"  pierwsze formatowanie: {pierwsze / gier * 1e6:6.2f} µs/grę")
+    print(f"  zapamiętany opis:      {ponowne / gier * 1e6:6.2f} µs/grę")
+
+
+def benchmark_pamiec_ocen(liczba: int = 1_000_000) -> None:
+    """Pamięć ocen: lista obiektów OcenaGra vs. KolumnyOcen"""
+    los = random.Random(1)
+    wartosci = [los.randint(1, 10) for _ in range(liczba)]
+    
+    lista = zmierz_pamiec(lambda: [OcenaGra(w) for w in wartosci])
+    kolumny = zmierz_pamiec(lambda: KolumnyOcen(OcenaGra(w) for w in wartosci))
+    
+    print(f"Pamięć {liczba} ocen")
+    print(f"  lista OcenaGra: {lista / 2**20:8.1f} MB ({lista / liczba:6.1f} B/ocenę)")
+    print(f"  KolumnyOcen:    {kolumny / 2**20:8.1f} MB ({kolumny / liczba:6.1f} B/ocenę)")
+
+
+class _OcenaBazowa:
+    """Ocena jak w pierwotnym modelu: zwykły obiekt z __dict__ (punkt odniesienia)"""
+    
+    def __init__(self, wartosc: int, data_dodania: datetime):
+        self.wartosc = wartosc
+        self.data_dodania = data_dodania
+
+
+class _PozycjaBazowa:
+    """
+    Gra jak w pierwotnym modelu (punkt odniesienia pomiarów pamięci):
+    obiekt z __dict__, napisy bez internowania, lista obiektów ocen
+    """
+    
+    def __init__(self, dane: dict):
+        # Jak pierwotne Pozycja.from_dict
+        self.id = dane['id']
+        self.tytul = dane['tytul']
+        self.rok = dane['rok']
+        self.wydawca = dane.get('wydawca', 'Nieznany')
+        self.gatunek = dane['gatunek']
+        self.oceny = [_OcenaBazowa(o['wartosc'], datetime.fromisoformat(o['data_dodania']))
+                      for o in dane.get('oceny', [])]
+
+
+def benchmark_pamiec_pozycji(gier: int = 500_000, ocen_na_gre: int = 3) -> None:
+    """Pamięć wczytanego katalogu: pierwotny układ obiektów vs. bieżący model"""
+    pozycje = generuj_pozycje(gier)
+    generuj_oceny(pozycje, ocen_na_gre)
+    with tempfile.TemporaryDirectory() as katalog_tymczasowy:
+        magazyn = utworz_magazyn(os.path.join(katalog_tymczasowy, "katalog.json"))
+        magazyn.zapisz(pozycje)
+        del pozycje
+        
+        def wczytaj_bazowo() -> list:
+            # Tak wczytywany był katalog pierwotnie: json.load + from_dict dla każdej gry
+            with open(magazyn.sciezka, 'r', encoding='utf-8') as f:
+                return [_PozycjaBazowa(p) for p in json.load(f)['pozycje']]
+        
+        przed = zmierz_pamiec(wczytaj_bazowo)
+        po = zmierz_pamiec(magazyn.wczytaj)
+    
+    print(f"Pamięć katalogu {gier} gier z {ocen_na_gre} ocenami po wczytaniu (tracemalloc)")
+    print(f"  __dict__ + lista ocen:    {przed / 2**20:8.1f} MB ({przed / gier:6.0f} B/grę)")
+    print(f"  bieżący model:            {po / 2**20:8.1f} MB ({po / gier:6.0f} B/grę)")
+
+
+POMIARY: Dict[str, Callable[[], None]] = {
+    'indeks': benchmark_indeks,
+    'przydzial_id': benchmark_przydzial_id,
+    'wyszukiwanie': benchmark_wyszukiwanie,
+    'filtry': benchmark_filtry,
+    'ranking': benchmark_ranking,
+    'statystyki': benchmark_statystyki,
+    'raport': benchmark_raport,
+    'zapytania': benchmark_zapytania,
+    'import': benchmark_import,
+    'wymiana': benchmark_wymiana,
+    'wczytywanie': benchmark_wczytywanie,
+    'migawki': benchmark_migawki,
+    'zapis_w_tle': benchmark_zapis_w_tle,
+    'wspolbieznosc': benchmark_wspolbieznosc,
+    'zapis_atomowy': benchmark_zapis_atomowy,
+    'formaty': benchmark_formaty,
+    'kompresja': benchmark_kompresja,
+    'opisy': benchmark_opisy,
+    'pamiec_ocen': benchmark_pamiec_ocen,
+    'pamiec_pozycji': benchmark_pamiec_pozycji,
+}
+
+
+if __name__ == "__main__":
+    wybrane = sys.argv[1:] or list(POMIARY)
+    for nazwa in wybrane:
+        if nazwa not in POMIARY:
+            print(f"Nieznany pomiar: {nazwa} (dostępne: {', '.join(POMIARY)})")
+            sys.exit(1)
+        POMIARY[nazwa]()
+        print()
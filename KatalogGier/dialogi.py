@@ -9,6 +9,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import Optional, Tuple, List
 from datetime import datetime
+from modele import GWIAZDKI, gwiazdki
 
 
 # PALETA KOLORÓW - ta sama co w main_window
@@ -888,7 +889,8 @@ class StatystykiDialog:
         self.top.bind('<Escape>', lambda e: self.top.destroy())
     
     def generuj_statystyki(self, katalog):
-        """Generuje tekst statystyk"""
+        """Generuje tekst statystyk (jedno wywołanie katalog.statystyki())"""
+        dane = katalog.statystyki()
         stats = []
         
         stats.append("=" * 60)
@@ -897,69 +899,60 @@ class StatystykiDialog:
         stats.append("")
         
         # Liczba gier
-        stats.append(f"Liczba gier w katalogu: {katalog.liczba_gier()}")
+        stats.append(f"Liczba gier w katalogu: {dane['liczba_gier']}")
         stats.append("")
         
         # Średnia ocena
-        srednia = katalog.srednia_ocena_katalogu()
+        srednia = dane['srednia']
         if srednia > 0:
-            pelne = round(srednia / 2.0)
-            puste = 5 - pelne
-            gwiazdki = "★" * pelne + "☆" * puste
             stats.append(f"Średnia ocena katalogu: {srednia:.2f} / 10")
-            stats.append(f"Wizualizacja: {gwiazdki}")
+            stats.append(f"Wizualizacja: {gwiazdki(srednia)}")
         else:
             stats.append("Średnia ocena: Brak ocen")
-            stats.append("Wizualizacja: ☆☆☆☆☆")
+            stats.append(f"Wizualizacja: {GWIAZDKI[0]}")
         stats.append("")
         
         # Najlepsza gra
-        najlepsza = katalog.najlepsza()
+        najlepsza = dane['najlepsza']
         if najlepsza:
             srednia_top = najlepsza.srednia_ocena()
-            pelne_top = round(srednia_top / 2.0)
-            puste_top = 5 - pelne_top
-            gwi_top = "★" * pelne_top + "☆" * puste_top
             
             stats.append("-" * 60)
             stats.append("NAJLEPSZA GRA:")
             stats.append(f"  Tytuł: {najlepsza.tytul}")
             stats.append(f"  Gatunek: {najlepsza.gatunek}")
             stats.append(f"  Rok: {najlepsza.rok}")
-            stats.append(f"  Ocena: {gwi_top} {srednia_top:.2f}/10")
+            stats.append(f"  Ocena: {gwiazdki(srednia_top)} {srednia_top:.2f}/10")
             stats.append(f"  Liczba ocen: {len(najlepsza.oceny)}")
         stats.append("")
         
         # Najgorsza gra
-        najgorsza = katalog.najgorsza()
+        najgorsza = dane['najgorsza']
         if najgorsza and (not najlepsza or najgorsza.id != najlepsza.id):
             srednia_bot = najgorsza.srednia_ocena()
-            pelne_bot = round(srednia_bot / 2.0)
-            puste_bot = 5 - pelne_bot
-            gwi_bot = "★" * pelne_bot + "☆" * puste_bot
             
             stats.append("-" * 60)
             stats.append("NAJGORSZA GRA:")
             stats.append(f"  Tytuł: {najgorsza.tytul}")
             stats.append(f"  Gatunek: {najgorsza.gatunek}")
             stats.append(f"  Rok: {najgorsza.rok}")
-            stats.append(f"  Ocena: {gwi_bot} {srednia_bot:.2f}/10")
+            stats.append(f"  Ocena: {gwiazdki(srednia_bot)} {srednia_bot:.2f}/10")
             stats.append(f"  Liczba ocen: {len(najgorsza.oceny)}")
         stats.append("")
         
         # Rozkład gatunków
-        rozklad = katalog.rozklad_gatunkow()
+        rozklad = dane['gatunki']
         if rozklad:
             stats.append("-" * 60)
             stats.append("ROZKŁAD GATUNKÓW:")
             for gatunek, liczba in sorted(rozklad.items()):
-                procent = (liczba / katalog.liczba_gier()) * 100
+                procent = (liczba / dane['liczba_gier']) * 100
                 bar = "█" * int(procent / 5)
                 stats.append(f"  {gatunek:15s} : {liczba:2d} gier ({procent:5.1f}%) {bar}")
         stats.append("")
         
         # Zakres lat
-        od, do = katalog.zakres_lat()
+        od, do = dane['zakres_lat']
         if od > 0:
             stats.append("-" * 60)
             stats.append(f"ZAKRES LAT WYDANIA: {od} - {do}")
@@ -970,3 +963,70 @@ class StatystykiDialog:
         # Wstaw do Text widget
         self.text.insert('1.0', '\n'.join(stats))
         self.text.config(state='disabled')
+
+
+class PostepDialog:
+    """Okno z paskiem postępu dla długich operacji (import, eksport)"""
+    
+    def __init__(self, parent, tytul: str):
+        """
+        Args:
+            parent: Okno nadrzędne
+            tytul: Opis wykonywanej operacji
+        """
+        self.top = tk.Toplevel(parent)
+        self.top.title(tytul)
+        self.top.geometry("420x150")
+        self.top.resizable(False, False)
+        self.top.transient(parent)
+        self.top.grab_set()
+        self.top.configure(bg=COLORS['bg_medium'])
+        # Operacji nie da się przerwać w połowie - okno zamyka się samo
+        self.top.protocol("WM_DELETE_WINDOW", lambda: None)
+        
+        # Centruj okno
+        self.top.update_idletasks()
+        x = parent.winfo_x() + (parent.winfo_width() // 2) - (420 // 2)
+        y = parent.winfo_y() + (parent.winfo_height() // 2) - (150 // 2)
+        self.top.geometry(f"+{x}+{y}")
+        
+        tk.Label(
+            self.top,
+            text=tytul,
+            font=("Segoe UI", 14, "bold"),
+            bg=COLORS['bg_medium'],
+            fg=COLORS['info']
+        ).pack(pady=(20, 10))
+        
+        self.pasek = ttk.Progressbar(self.top, orient=tk.HORIZONTAL, length=360,
+                                     mode='determinate', maximum=100)
+        self.pasek.pack(pady=5)
+        
+        self.label_procent = tk.Label(
+            self.top,
+            text="0%",
+            font=("Segoe UI", 10),
+            bg=COLORS['bg_medium'],
+            fg=COLORS['text_dim']
+        )
+        self.label_procent.pack()
+        self.top.update()
+    
+    def aktualizuj(self, wykonano: int, razem: int) -> None:
+        """
+        Przesuwa pasek postępu (sygnatura funkcji postępu z modułu wymiana)
+        
+        Args:
+            wykonano: Wykonana część pracy
+            razem: Cała praca (0 = nieznana)
+        """
+        procent = 100 * wykonano / razem if razem else 0
+        self.pasek['value'] = procent
+        self.label_procent.config(text=f"{procent:.0f}%")
+        # Operacja działa w wątku GUI - odśwież okno między porcjami danych
+        self.top.update()
+    
+    def zamknij(self) -> None:
+        """Zamyka okno postępu"""
+        self.top.grab_release()
+        self.top.destroy()
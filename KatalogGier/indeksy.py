@@ -0,0 +1,482 @@
+"""
+===============================================================================
+PLIK: indeksy.py
+OPIS: Struktury indeksujące katalog (tytuły, gatunki, lata wydania, oceny)
+===============================================================================
+"""
+
+import heapq
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from operator import itemgetter
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+
+class IndeksTrigramow:
+    """
+    Odwrócony indeks trigramów tytułów (małymi literami).
+
+    Każdy trigram wskazuje tablicę numerów kolejnych wpisów do indeksu.
+    Numery rosną, więc tablice są posortowane i wyniki zwracane są
+    w kolejności dodawania gier. Usunięte wpisy są pomijane leniwie,
+    a tablice czyszczone, gdy nieaktualnych wpisów jest zbyt wiele.
+    """
+    
+    def __init__(self):
+        """Konstruktor pustego indeksu"""
+        self._listy: Dict[str, array] = {}
+        # numer wpisu -> (id, tytuł małymi literami)
+        self._wpisy: Dict[int, Tuple[int, str]] = {}
+        # id -> numer wpisu
+        self._numery: Dict[int, int] = {}
+        self._nastepny_numer = 0
+        # Liczba numerów we wszystkich listach i liczba nieaktualnych spośród nich
+        self._rozmiar_list = 0
+        self._nieaktualne = 0
+    
+    @staticmethod
+    def trigramy(tekst: str) -> set:
+        """
+        Zwraca zbiór trigramów tekstu
+
+        Args:
+            tekst: Tekst (już zamieniony na małe litery)
+        """
+        return {tekst[i:i + 3] for i in range(len(tekst) - 2)}
+    
+    def __len__(self) -> int:
+        return len(self._wpisy)
+    
+    def dodaj(self, id: int, tytul: str) -> None:
+        """
+        Dodaje tytuł do indeksu (zastępuje poprzedni tytuł o tym samym ID)
+
+        Args:
+            id: ID gry
+            tytul: Tytuł gry
+        """
+        if id in self._numery:
+            self.usun(id)
+        
+        numer = self._nastepny_numer
+        self._nastepny_numer += 1
+        tytul_lower = tytul.lower()
+        self._wpisy[numer] = (id, tytul_lower)
+        self._numery[id] = numer
+        
+        trigramy = self.trigramy(tytul_lower)
+        for trigram in trigramy:
+            lista = self._listy.get(trigram)
+            if lista is None:
+                lista = self._listy[trigram] = array('q')
+            lista.append(numer)
+        self._rozmiar_list += len(trigramy)
+    
+    def dodaj_wiele(self, pary: Iterable[Tuple[int, str]]) -> None:
+        """
+        Dodaje wiele tytułów (to samo co dodaj w pętli, z mniejszym narzutem)
+
+        Args:
+            pary: Pary (id, tytuł)
+        """
+        listy, wpisy, numery = self._listy, self._wpisy, self._numery
+        for id, tytul in pary:
+            if id in numery:
+                self.usun(id)
+            numer = self._nastepny_numer
+            self._nastepny_numer += 1
+            tytul_lower = tytul.lower()
+            wpisy[numer] = (id, tytul_lower)
+            numery[id] = numer
+            
+            trigramy = {tytul_lower[i:i + 3] for i in range(len(tytul_lower) - 2)}
+            for trigram in trigramy:
+                lista = listy.get(trigram)
+                if lista is None:
+                    lista = listy[trigram] = array('q')
+                lista.append(numer)
+            self._rozmiar_list += len(trigramy)
+    
+    def usun(self, id: int) -> None:
+        """
+        Usuwa tytuł z indeksu
+
+        Args:
+            id: ID gry
+        """
+        numer = self._numery.pop(id, None)
+        if numer is None:
+            return
+        _, tytul_lower = self._wpisy.pop(numer)
+        self._nieaktualne += len(self.trigramy(tytul_lower))
+        
+        # Czyszczenie, gdy nieaktualne wpisy stanowią większość list
+        if self._nieaktualne > 1024 and self._nieaktualne * 2 > self._rozmiar_list:
+            self._wyczysc()
+    
+    def _wyczysc(self) -> None:
+        """Usuwa z list numery usuniętych wpisów"""
+        wpisy = self._wpisy
+        for trigram in list(self._listy):
+            lista = array('q', (n for n in self._listy[trigram] if n in wpisy))
+            if lista:
+                self._listy[trigram] = lista
+            else:
+                del self._listy[trigram]
+        self._rozmiar_list -= self._nieaktualne
+        self._nieaktualne = 0
+    
+    def oszacuj(self, fraza: str) -> int:
+        """
+        Szacuje z góry liczbę wyników szukaj(fraza) bez przeglądania tytułów
+
+        Returns:
+            Długość najkrótszej listy trigramów frazy (lub liczba tytułów)
+        """
+        trigramy = self.trigramy(fraza.lower())
+        if not trigramy:
+            return len(self._wpisy)
+        return min(len(self._listy.get(t, ())) for t in trigramy)
+    
+    def szukaj(self, fraza: str) -> Iterator[int]:
+        """
+        Zwraca ID gier, których tytuł zawiera frazę (bez rozróżniania wielkości liter)
+
+        Args:
+            fraza: Szukany fragment tytułu
+
+        Returns:
+            Generator ID w kolejności dodawania do indeksu
+        """
+        fraza_lower = fraza.lower()
+        trigramy = self.trigramy(fraza_lower)
+        
+        if not trigramy:
+            # Fraza krótsza niż 3 znaki - przeglądamy tytuły
+            for id, tytul_lower in self._wpisy.values():
+                if fraza_lower in tytul_lower:
+                    yield id
+            return
+        
+        listy = [self._listy.get(t) for t in trigramy]
+        if any(lista is None for lista in listy):
+            return
+        
+        # Kandydaci z najkrótszej listy; pozostałe trigramy sprawdza test podciągu
+        wpisy = self._wpisy
+        for numer in min(listy, key=len):
+            wpis = wpisy.get(numer)
+            if wpis is not None and fraza_lower in wpis[1]:
+                yield wpis[0]
+
+
+class IndeksWartosci:
+    """
+    Indeks haszujący: wartość pola (np. gatunek) -> ID gier o tej wartości.
+
+    ID każdej wartości trzymane są w słowniku id -> numer wpisu. Słowniki
+    zachowują kolejność wstawiania, a numery rosną, więc wyniki zwracane są
+    w kolejności dodawania gier, a ich liczba jest znana od razu.
+    """
+    
+    def __init__(self):
+        """Konstruktor pustego indeksu"""
+        self._grupy: Dict[Hashable, Dict[int, int]] = {}
+        # id -> wartość, pod którą zaindeksowano grę
+        self._wartosci: Dict[int, Hashable] = {}
+        self._nastepny_numer = 0
+    
+    def __len__(self) -> int:
+        return len(self._wartosci)
+    
+    def dodaj(self, id: int, wartosc: Hashable) -> None:
+        """
+        Dodaje grę do indeksu (zastępuje poprzedni wpis o tym samym ID)
+
+        Args:
+            id: ID gry
+            wartosc: Wartość indeksowanego pola
+        """
+        if id in self._wartosci:
+            self.usun(id)
+        
+        grupa = self._grupy.get(wartosc)
+        if grupa is None:
+            grupa = self._grupy[wartosc] = {}
+            self._nowa_wartosc(wartosc)
+        grupa[id] = self._nastepny_numer
+        self._nastepny_numer += 1
+        self._wartosci[id] = wartosc
+    
+    def usun(self, id: int) -> None:
+        """
+        Usuwa grę z indeksu
+
+        Args:
+            id: ID gry
+        """
+        if id not in self._wartosci:
+            return
+        wartosc = self._wartosci.pop(id)
+        grupa = self._grupy[wartosc]
+        del grupa[id]
+        if not grupa:
+            del self._grupy[wartosc]
+            self._usunieta_wartosc(wartosc)
+    
+    def _nowa_wartosc(self, wartosc: Hashable) -> None:
+        """Wywoływana, gdy w indeksie pojawia się nowa wartość"""
+    
+    def _usunieta_wartosc(self, wartosc: Hashable) -> None:
+        """Wywoływana, gdy ostatnia gra o danej wartości opuszcza indeks"""
+    
+    def szukaj(self, wartosc: Hashable) -> Iterator[int]:
+        """
+        Zwraca ID gier o podanej wartości
+
+        Returns:
+            Iterator ID w kolejności dodawania do indeksu
+        """
+        return iter(self._grupy.get(wartosc, ()))
+    
+    def liczba(self, wartosc: Hashable) -> int:
+        """Zwraca liczbę gier o podanej wartości"""
+        return len(self._grupy.get(wartosc, ()))
+    
+    def wartosci(self) -> List[Hashable]:
+        """Zwraca występujące wartości (w kolejności ich pojawienia się)"""
+        return list(self._grupy)
+    
+    def rozklad(self) -> Dict[Hashable, int]:
+        """Zwraca słownik {wartość: liczba gier}"""
+        return {wartosc: len(grupa) for wartosc, grupa in self._grupy.items()}
+
+
+class IndeksZakresowy(IndeksWartosci):
+    """
+    Indeks wartości uporządkowanych (np. lat wydania) z zapytaniami o zakres.
+
+    Oprócz grup utrzymuje posortowaną listę różnych wartości, więc zakres
+    wyznacza bisect, a wyniki z kolejnych grup są scalane po numerze wpisu.
+    """
+    
+    def __init__(self):
+        """Konstruktor pustego indeksu"""
+        super().__init__()
+        self._posortowane: List = []
+    
+    def _nowa_wartosc(self, wartosc) -> None:
+        insort(self._posortowane, wartosc)
+    
+    def _usunieta_wartosc(self, wartosc) -> None:
+        del self._posortowane[bisect_left(self._posortowane, wartosc)]
+    
+    def zakres(self, od, do) -> Iterator[int]:
+        """
+        Zwraca ID gier o wartości z przedziału [od, do]
+
+        Args:
+            od: Dolna granica (włącznie)
+            do: Górna granica (włącznie)
+
+        Returns:
+            Iterator ID w kolejności dodawania do indeksu
+        """
+        poczatek = bisect_left(self._posortowane, od)
+        koniec = bisect_right(self._posortowane, do)
+        grupy = [self._grupy[w].items() for w in self._posortowane[poczatek:koniec]]
+        if len(grupy) == 1:
+            return iter(self._grupy[self._posortowane[poczatek]])
+        return (id for id, _ in heapq.merge(*grupy, key=itemgetter(1)))
+    
+    def liczba_w_zakresie(self, od, do) -> int:
+        """Zwraca liczbę gier o wartości z przedziału [od, do] (bez ich wyliczania)"""
+        poczatek = bisect_left(self._posortowane, od)
+        koniec = bisect_right(self._posortowane, do)
+        return sum(len(self._grupy[w]) for w in self._posortowane[poczatek:koniec])
+    
+    def najmniejsza(self) -> Optional[Hashable]:
+        """Najmniejsza wartość w indeksie (lub None)"""
+        return self._posortowane[0] if self._posortowane else None
+    
+    def najwieksza(self) -> Optional[Hashable]:
+        """Największa wartość w indeksie (lub None)"""
+        return self._posortowane[-1] if self._posortowane else None
+
+
+class IndeksRankingu:
+    """
+    Ranking gier według średniej oceny: posortowana lista (średnia, numer, id).
+
+    Lista utrzymywana jest przez bisect przy każdej zmianie średniej, więc
+    najgorsza gra leży na początku, najlepsza na końcu, a pełny ranking
+    można przeglądać bez sortowania. Numer wpisu nie zmienia się przy
+    aktualizacji średniej - gry o równej średniej pozostają w kolejności
+    dodania (tak jak przy stabilnym sortowaniu listy katalogu).
+    Gry bez ocen przechowywane są osobno, w kolejności dodania.
+    Suma średnich ocenionych gier aktualizowana jest przy każdej zmianie,
+    więc średnia ocena katalogu nie wymaga przeglądania gier. Suma jest
+    liczbą całkowitą w jednostkach 1/SKALA_SUMY: średnie ocen 1-10 mają
+    w tych jednostkach dokładną wartość, więc dodawanie i odejmowanie
+    nie kumuluje błędów zaokrągleń.
+    """
+    
+    # Średnie z przedziału [1, 16) pomnożone przez 2**52 są liczbami całkowitymi
+    SKALA_SUMY = 2 ** 52
+    
+    def __init__(self):
+        """Konstruktor pustego rankingu"""
+        self._ranking: List[Tuple[float, int, int]] = []
+        # id -> klucz w rankingu
+        self._klucze: Dict[int, Tuple[float, int, int]] = {}
+        # id -> numer wpisu (gry bez ocen); False = słownik nie jest uporządkowany
+        # po numerach (gra straciła oceny) i zostanie posortowany przy przeglądaniu
+        self._nieocenione: Dict[int, int] = {}
+        self._nieocenione_po_kolei = True
+        self._nastepny_numer = 0
+        # Suma średnich wszystkich gier w self._ranking (w jednostkach 1/SKALA_SUMY)
+        self._suma = 0
+    
+    def __len__(self) -> int:
+        return len(self._klucze) + len(self._nieocenione)
+    
+    def ustaw(self, id: int, srednia: Optional[float]) -> None:
+        """
+        Dodaje grę do rankingu lub aktualizuje jej średnią
+
+        Args:
+            id: ID gry
+            srednia: Średnia ocena lub None, gdy gra nie ma ocen
+        """
+        numer = self._usun(id)
+        if numer is None:
+            numer = self._nastepny_numer
+            self._nastepny_numer += 1
+        
+        if srednia is None:
+            self._dodaj_nieoceniona(id, numer)
+        else:
+            klucz = (srednia, numer, id)
+            insort(self._ranking, klucz)
+            self._klucze[id] = klucz
+            self._suma += self._jednostki(srednia)
+    
+    def ustaw_wiele(self, srednie: Dict[int, Optional[float]]) -> None:
+        """
+        Aktualizuje średnie wielu gier naraz
+
+        Przy dużej liczbie zmian ranking jest budowany od nowa jednym
+        sortowaniem zamiast wielu wstawień do listy.
+
+        Args:
+            srednie: Słownik {id: średnia lub None}
+        """
+        if len(srednie) * 16 < len(self._ranking):
+            for id, srednia in srednie.items():
+                self.ustaw(id, srednia)
+            return
+        
+        nowe = []
+        for id, srednia in srednie.items():
+            stary = self._klucze.pop(id, None)
+            if stary is not None:
+                numer = stary[1]
+            elif id in self._nieocenione:
+                numer = self._nieocenione.pop(id)
+            else:
+                numer = self._nastepny_numer
+                self._nastepny_numer += 1
+            
+            if srednia is None:
+                self._dodaj_nieoceniona(id, numer)
+            else:
+                klucz = self._klucze[id] = (srednia, numer, id)
+                nowe.append(klucz)
+        
+        # Pozostają tylko niezmienione wpisy; nowe klucze dołączane są przed sortowaniem
+        self._ranking = [k for k in self._ranking if self._klucze.get(k[2]) is k]
+        self._ranking.extend(nowe)
+        self._ranking.sort()
+        self._suma = sum(self._jednostki(k[0]) for k in self._ranking)
+    
+    def _dodaj_nieoceniona(self, id: int, numer: int) -> None:
+        """Dodaje grę bez ocen, zapamiętując, czy zaburzyła kolejność numerów"""
+        nieocenione = self._nieocenione
+        if nieocenione and numer < next(reversed(nieocenione.values())):
+            self._nieocenione_po_kolei = False
+        nieocenione[id] = numer
+    
+    @classmethod
+    def _jednostki(cls, srednia: float) -> int:
+        """Średnia w jednostkach sumy (ta sama wartość przy dodaniu i odjęciu)"""
+        return int(srednia * cls.SKALA_SUMY)
+    
+    def usun(self, id: int) -> None:
+        """
+        Usuwa grę z rankingu
+
+        Args:
+            id: ID gry
+        """
+        self._usun(id)
+    
+    def _usun(self, id: int) -> Optional[int]:
+        """Usuwa wpis gry i zwraca jego numer (lub None, gdy gry nie było)"""
+        if id in self._nieocenione:
+            return self._nieocenione.pop(id)
+        klucz = self._klucze.pop(id, None)
+        if klucz is None:
+            return None
+        del self._ranking[bisect_left(self._ranking, klucz)]
+        self._suma -= self._jednostki(klucz[0])
+        return klucz[1]
+    
+    def liczba_ocenionych(self) -> int:
+        """Liczba gier, które mają oceny"""
+        return len(self._ranking)
+    
+    def srednia(self) -> Optional[float]:
+        """Średnia ze średnich ocenionych gier (lub None, gdy żadna nie ma ocen)"""
+        if not self._ranking:
+            return None
+        # Dzielenie liczb całkowitych zaokrągla wynik tylko raz
+        return self._suma / (len(self._ranking) * self.SKALA_SUMY)
+    
+    def najlepszy(self) -> Optional[int]:
+        """ID gry o najwyższej średniej (najwcześniej dodanej przy remisie) lub None"""
+        if not self._ranking:
+            return None
+        najwyzsza = self._ranking[-1][0]
+        return self._ranking[bisect_left(self._ranking, (najwyzsza,))][2]
+    
+    def najgorszy(self) -> Optional[int]:
+        """ID gry o najniższej średniej (najwcześniej dodanej przy remisie) lub None"""
+        return self._ranking[0][2] if self._ranking else None
+    
+    def przegladaj(self, malejaco: bool = True) -> Iterator[int]:
+        """
+        Zwraca ID gier w kolejności średniej oceny, a po nich gry bez ocen
+
+        Args:
+            malejaco: True = od najlepszej do najgorszej
+
+        Returns:
+            Generator ID (bez sortowania i kopiowania rankingu)
+        """
+        ranking = self._ranking
+        if malejaco:
+            # Grupy równych średnich od końca, wewnątrz grupy kolejność dodania
+            koniec = len(ranking)
+            while koniec > 0:
+                poczatek = bisect_left(ranking, (ranking[koniec - 1][0],), 0, koniec)
+                for i in range(poczatek, koniec):
+                    yield ranking[i][2]
+                koniec = poczatek
+        else:
+            for _, _, id in ranking:
+                yield id
+        if not self._nieocenione_po_kolei:
+            # Nowy słownik zamiast sortowania w miejscu - inne wątki mogą przeglądać stary
+            self._nieocenione = dict(sorted(self._nieocenione.items(), key=itemgetter(1)))
+            self._nieocenione_po_kolei = True
+        yield from self._nieocenione
@@ -5,10 +5,189 @@ OPIS: Zarządza kolekcją gier - główna logika biznesowa
 ===============================================================================
 """
 
-import json
-import os
-from typing import List, Optional, Tuple, Dict
-from modele import Pozycja, OcenaGra
+import heapq
+import weakref
+from collections import abc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from itertools import islice, takewhile
+from typing import Any, List, Optional, Tuple, Dict, Iterable, Iterator, Sequence, Union
+from modele import Pozycja, OcenaGra, ocena_calkowita
+from magazyn import Magazyn, utworz_magazyn
+from indeksy import IndeksTrigramow, IndeksWartosci, IndeksZakresowy, IndeksRankingu
+from zapytania import Kursor, Zapytanie
+from statystyki import KolumnyKatalogu
+from wspolbieznosc import BlokadaRW, pod_odczytem, pod_pisaniem
+import wymiana
+
+# Jedyny opis zmian przekazywany magazynom nieprzyrostowym - i tak zapisują
+# cały katalog, więc opisy poszczególnych zmian nie są budowane
+ZMIANA_KATALOGU = {'op': 'zmiana'}
+
+
+class Migawka(abc.Sequence):
+    """
+    Niezmienny widok listy gier z chwili utworzenia (kopiowanie przy zapisie).
+
+    Migawka nie kopiuje listy - pamięta tylko jej długość. Dopisywanie gier
+    na końcu listy (append, extend) nie zmienia pierwszych `len(migawka)`
+    elementów, więc migawka dalej dzieli z nią pamięć. Dopiero zmiana
+    wcześniejszych elementów (usunięcie, wstawienie, sortowanie, ...) sprawia,
+    że lista przed modyfikacją przekazuje migawce kopię jej zawartości.
+
+    Widok obejmuje skład i kolejność gier; same gry są współdzielone, więc
+    nowe oceny są w nich widoczne. Migawkę można czytać z innego wątku
+    (np. zapis w tle): odczyt sprawdza, czy w międzyczasie nie dostała kopii.
+    """
+    
+    __slots__ = ('_dane', '_dlugosc', 'wersja', '__weakref__')
+    
+    def __init__(self, dane: List[Pozycja], wersja: int = 0):
+        """
+        Args:
+            dane: Lista, której widokiem jest migawka
+            wersja: Wersja katalogu (licznik zmian) w chwili utworzenia
+        """
+        self._dane = dane
+        self._dlugosc = len(dane)
+        self.wersja = wersja
+    
+    def _odlacz(self, kopia: List[Pozycja]) -> None:
+        """Przełącza migawkę na własną kopię (wywoływane przed zmianą listy)"""
+        self._dane = kopia
+    
+    def __len__(self) -> int:
+        return self._dlugosc
+    
+    def __getitem__(self, indeks):
+        if isinstance(indeks, slice):
+            indeks = slice(*indeks.indices(self._dlugosc))
+        else:
+            if indeks < 0:
+                indeks += self._dlugosc
+            if not 0 <= indeks < self._dlugosc:
+                raise IndexError("indeks migawki poza zakresem")
+        dane = self._dane
+        wynik = dane[indeks]
+        # Kopia powstaje przed zmianą listy - jeśli migawka ją dostała,
+        # odczyt mógł trafić na już zmienioną listę i jest powtarzany
+        if self._dane is not dane:
+            wynik = self._dane[indeks]
+        return wynik
+    
+    def __iter__(self) -> Iterator[Pozycja]:
+        # Kawałkami - wycinek listy powstaje atomowo, a przegląd jest prawie tak szybki jak listy
+        for poczatek in range(0, self._dlugosc, 1024):
+            yield from self[poczatek:min(poczatek + 1024, self._dlugosc)]
+    
+    def __repr__(self) -> str:
+        return f"Migawka({self._dlugosc} gier, wersja {self.wersja})"
+
+
+class ListaPozycji(list):
+    """
+    Lista pozycji katalogu powiadamiająca katalog o każdej zmianie.
+    Dzięki temu indeksy katalogu pozostają spójne także przy bezpośredniej
+    modyfikacji `katalog.pozycje` (append, remove, del, przypisanie, ...).
+    Przed zmianą wcześniejszych elementów odłącza współdzielące ją migawki.
+    """
+    
+    def __init__(self, katalog: 'Katalog', pozycje: Iterable[Pozycja] = ()):
+        """
+        Args:
+            katalog: Katalog, którego indeksy mają być aktualizowane
+            pozycje: Początkowa zawartość listy
+        """
+        super().__init__(pozycje)
+        self._katalog = katalog
+        self._migawki: 'weakref.WeakSet[Migawka]' = weakref.WeakSet()
+    
+    def migawka(self) -> Migawka:
+        """Zwraca niezmienny widok bieżącej zawartości listy (w czasie stałym)"""
+        migawka = Migawka(self, self._katalog._wersja)
+        self._migawki.add(migawka)
+        return migawka
+    
+    def _odlacz_migawki(self) -> None:
+        """Daje każdej żywej migawce kopię jej zawartości (jedna kopia na długość)"""
+        if not self._migawki:
+            return
+        kopie: Dict[int, List[Pozycja]] = {}
+        for migawka in list(self._migawki):
+            kopia = kopie.get(migawka._dlugosc)
+            if kopia is None:
+                kopia = kopie[migawka._dlugosc] = list.__getitem__(self, slice(migawka._dlugosc))
+            migawka._odlacz(kopia)
+        self._migawki = weakref.WeakSet()
+    
+    def append(self, pozycja: Pozycja) -> None:
+        super().append(pozycja)
+        self._katalog._zaindeksuj(pozycja)
+    
+    def insert(self, indeks: int, pozycja: Pozycja) -> None:
+        self._odlacz_migawki()
+        super().insert(indeks, pozycja)
+        self._katalog._zaindeksuj(pozycja)
+    
+    def extend(self, pozycje: Iterable[Pozycja]) -> None:
+        nowe = list(pozycje)
+        super().extend(nowe)
+        self._katalog._zaindeksuj_wiele(nowe)
+    
+    def __iadd__(self, pozycje: Iterable[Pozycja]) -> 'ListaPozycji':
+        self.extend(pozycje)
+        return self
+    
+    def __imul__(self, n: int) -> 'ListaPozycji':
+        if n < 1:
+            self._odlacz_migawki()
+        super().__imul__(n)
+        self._katalog._przebuduj_indeksy()
+        return self
+    
+    def remove(self, pozycja: Pozycja) -> None:
+        self._odlacz_migawki()
+        super().remove(pozycja)
+        self._katalog._usun_z_indeksu(pozycja)
+    
+    def pop(self, indeks: int = -1) -> Pozycja:
+        self._odlacz_migawki()
+        pozycja = super().pop(indeks)
+        self._katalog._usun_z_indeksu(pozycja)
+        return pozycja
+    
+    def clear(self) -> None:
+        self._odlacz_migawki()
+        super().clear()
+        self._katalog._przebuduj_indeksy()
+    
+    def __setitem__(self, indeks, wartosc) -> None:
+        stare = self[indeks] if isinstance(indeks, slice) else [self[indeks]]
+        if isinstance(indeks, slice):
+            wartosc = list(wartosc)
+        self._odlacz_migawki()
+        super().__setitem__(indeks, wartosc)
+        for pozycja in stare:
+            self._katalog._usun_z_indeksu(pozycja)
+        for pozycja in (wartosc if isinstance(indeks, slice) else [wartosc]):
+            self._katalog._zaindeksuj(pozycja)
+    
+    def __delitem__(self, indeks) -> None:
+        stare = self[indeks] if isinstance(indeks, slice) else [self[indeks]]
+        self._odlacz_migawki()
+        super().__delitem__(indeks)
+        for pozycja in stare:
+            self._katalog._usun_z_indeksu(pozycja)
+    
+    def sort(self, *args, **kwargs) -> None:
+        self._odlacz_migawki()
+        super().sort(*args, **kwargs)
+    
+    def reverse(self) -> None:
+        self._odlacz_migawki()
+        super().reverse()
+
+
 class Katalog:
     """
     Zarządza całą kolekcją gier
@@ -50,15 +229,236 @@ class Katalog:
         "Inne"
     ]
     
-    def __init__(self):
-        """Konstruktor katalogu"""
+    def __init__(self, sciezka_pliku: str = "katalog.json", tryb_dziennika: bool = False,
+                 magazyn: Optional[Magazyn] = None, zapis_w_tle: Optional[float] = None,
+                 wielowatkowy: bool = False):
+        """
+        Konstruktor katalogu
+        
+        Args:
+            sciezka_pliku: Plik z danymi (format wybierany po rozszerzeniu)
+            tryb_dziennika: True = każda zmiana jest dopisywana do dziennika
+                            zamiast zapisywania całego katalogu (tylko JSON)
+            magazyn: Własny magazyn danych (zastępuje sciezka_pliku)
+            zapis_w_tle: Opóźnienie w sekundach, po którym seria zmian jest
+                         zapisywana w osobnym wątku (None = zapis od razu)
+            wielowatkowy: True = metody katalogu chronione blokadą czytelników
+                          i pisarzy (zapytania równolegle, zmiany na wyłączność)
+        """
+        # Blokada metod katalogu (None = katalog używany z jednego wątku)
+        self.blokada: Optional[BlokadaRW] = BlokadaRW() if wielowatkowy else None
+        self.magazyn = magazyn or utworz_magazyn(sciezka_pliku, tryb_dziennika, zapis_w_tle)
+        # Licznik zmian katalogu; magazyn jest zgodny z pamięcią,
+        # gdy _wersja_magazynu == _wersja
+        self._wersja = 0
+        self._wersja_magazynu = 0
+        self._indeks_id: Dict[int, Pozycja] = {}
+        self._indeks_tytulow = IndeksTrigramow()
+        self._indeks_gatunkow = IndeksWartosci()
+        self._indeks_lat = IndeksZakresowy()
+        self._indeks_ocen = IndeksRankingu()
+        # Przydział ID: kopiec zwolnionych ID + znacznik najwyższego ID.
+        # Każde ID mniejsze od _nastepne_id jest zajęte albo leży w kopcu.
+        self._wolne_id: List[int] = []
+        self._nastepne_id = 1
+        # Transakcja: głębokość zagnieżdżenia i zmiany czekające na utrwalenie
+        self._transakcja = 0
+        self._odlozone: List[dict] = []
+        self._odlozone_zgodne = True
+        self._wersja_odlozonych = 0
+        # Gry czekające na aktualizację rankingu w trakcie operacji zbiorczej
+        # (dodaj_oceny_wiele, import, wczytywanie) - ranking po jej zakończeniu
+        self._zmienione_oceny: Optional[Dict[int, Pozycja]] = None
         self.pozycje: List[Pozycja] = []
-        self.sciezka_pliku = "katalog.json"
+        # Dane już zapisane w magazynie nie są w pamięci, dopóki katalog ich nie
+        # wczyta - do tego czasu pierwszy zapis zastępuje je całym katalogiem
+        self._wersja_magazynu = self._wersja if self.magazyn.pusty else -1
+    
+    @property
+    def sciezka_pliku(self) -> str:
+        """Ścieżka pliku z danymi katalogu"""
+        return self.magazyn.sciezka
+    
+    @sciezka_pliku.setter
+    @pod_pisaniem
+    def sciezka_pliku(self, sciezka: str) -> None:
+        self.magazyn.zamknij()
+        self.magazyn = utworz_magazyn(sciezka, getattr(self.magazyn, 'tryb_dziennika', False),
+                                      getattr(self.magazyn, 'opoznienie', None))
+        # Nowy magazyn nie zawiera katalogu - następny zapis (także koniec
+        # trwającej transakcji) będzie pełny
+        self._wersja_magazynu = -1
+        self._odlozone_zgodne = False
+    
+    @property
+    def pozycje(self) -> List[Pozycja]:
+        """Lista wszystkich gier (zmiany są odzwierciedlane w indeksach)"""
+        return self._pozycje
+    
+    @pozycje.setter
+    @pod_pisaniem
+    def pozycje(self, pozycje: Iterable[Pozycja]) -> None:
+        self._pozycje = ListaPozycji(self, pozycje)
+        self._przebuduj_indeksy()
+    
+    def _czytanie(self):
+        """Blok z blokadą odczytu (bez blokady w trybie jednowątkowym)"""
+        return nullcontext() if self.blokada is None else self.blokada.czytanie()
+    
+    def _pisanie(self):
+        """Blok z blokadą zapisu (bez blokady w trybie jednowątkowym)"""
+        return nullcontext() if self.blokada is None else self.blokada.pisanie()
+    
+    # =========================================================================
+    # INDEKSY
+    # =========================================================================
+    
+    def _zaindeksuj(self, pozycja: Pozycja) -> None:
+        """Dodaje pozycję do indeksów katalogu"""
+        self._wersja += 1
+        self._indeks_id[pozycja.id] = pozycja
+        self._indeks_tytulow.dodaj(pozycja.id, pozycja.tytul)
+        self._indeks_gatunkow.dodaj(pozycja.id, pozycja.gatunek)
+        self._indeks_lat.dodaj(pozycja.id, pozycja.rok)
+        self._indeks_ocen.ustaw(pozycja.id, pozycja.srednia_ocena() if pozycja.oceny else None)
+        pozycja._obserwator = self._pozycja_zmieniona
+    
+    def _zaindeksuj_wiele(self, pozycje: List[Pozycja]) -> None:
+        """Dodaje wiele pozycji do indeksów (ranking budowany jednym sortowaniem)"""
+        self._wersja += 1
+        indeks_id = self._indeks_id
+        obserwator = self._pozycja_zmieniona
+        for pozycja in pozycje:
+            indeks_id[pozycja.id] = pozycja
+            pozycja._obserwator = obserwator
+        self._indeks_tytulow.dodaj_wiele((p.id, p.tytul) for p in pozycje)
+        dodaj_gatunek, dodaj_rok = self._indeks_gatunkow.dodaj, self._indeks_lat.dodaj
+        for pozycja in pozycje:
+            dodaj_gatunek(pozycja.id, pozycja.gatunek)
+            dodaj_rok(pozycja.id, pozycja.rok)
+        if self._zmienione_oceny is not None:
+            self._zmienione_oceny.update((p.id, p) for p in pozycje)
+        else:
+            self._indeks_ocen.ustaw_wiele(
+                {p.id: p.srednia_ocena() if p.oceny else None for p in pozycje})
+    
+    def _usun_z_indeksu(self, pozycja: Pozycja) -> None:
+        """Usuwa pozycję z indeksów katalogu"""
+        self._wersja += 1
+        if self._indeks_id.get(pozycja.id) is pozycja:
+            del self._indeks_id[pozycja.id]
+            self._indeks_tytulow.usun(pozycja.id)
+            self._indeks_gatunkow.usun(pozycja.id)
+            self._indeks_lat.usun(pozycja.id)
+            self._indeks_ocen.usun(pozycja.id)
+            if self._zmienione_oceny is not None:
+                self._zmienione_oceny.pop(pozycja.id, None)
+            pozycja._obserwator = None
+            if 1 <= pozycja.id < self._nastepne_id:
+                heapq.heappush(self._wolne_id, pozycja.id)
+    
+    def _przebuduj_indeksy(self) -> None:
+        """Odbudowuje wszystkie indeksy na podstawie listy pozycji"""
+        self._wersja += 1
+        self._indeks_id = {}
+        self._indeks_tytulow = IndeksTrigramow()
+        self._indeks_gatunkow = IndeksWartosci()
+        self._indeks_lat = IndeksZakresowy()
+        self._indeks_ocen = IndeksRankingu()
+        self._zaindeksuj_wiele(self._pozycje)
+        self._przelicz_wolne_id()
+    
+    def _przelicz_wolne_id(self) -> None:
+        """Wyznacza kopiec wolnych ID i następne ID na podstawie indeksu ID"""
+        # Luki w numeracji trafiają do kopca (posortowana lista jest kopcem)
+        najwyzsze = max(self._indeks_id, default=0)
+        self._wolne_id = [i for i in range(1, najwyzsze) if i not in self._indeks_id]
+        self._nastepne_id = najwyzsze + 1
+    
+    def _pozycja_zmieniona(self, pozycja: Pozycja, pole: str) -> None:
+        """
+        Aktualizuje indeksy po zmianie gry z katalogu (także bezpośredniej,
+        np. pozycja.tytul = ...)
+        
+        Args:
+            pozycja: Zmieniona gra
+            pole: 'oceny' lub nazwa zmienionego pola
+        """
+        self._wersja += 1
+        if self._indeks_id.get(pozycja.id) is not pozycja:
+            return
+        if pole == 'tytul':
+            self._indeks_tytulow.dodaj(pozycja.id, pozycja.tytul)
+        elif pole == 'gatunek':
+            self._indeks_gatunkow.dodaj(pozycja.id, pozycja.gatunek)
+        elif pole == 'rok':
+            self._indeks_lat.dodaj(pozycja.id, pozycja.rok)
+        elif self._zmienione_oceny is not None:
+            self._zmienione_oceny[pozycja.id] = pozycja
+        else:
+            self._indeks_ocen.ustaw(pozycja.id, pozycja.srednia_ocena() if pozycja.oceny else None)
+    
+    @contextmanager
+    def _odlozony_ranking(self):
+        """
+        Odkłada aktualizacje rankingu do końca bloku (jedno ustaw_wiele
+        zamiast wstawiania każdej gry osobno do posortowanej listy)
+        """
+        if self._zmienione_oceny is not None:
+            yield
+            return
+        self._zmienione_oceny = {}
+        try:
+            yield
+        finally:
+            zmienione, self._zmienione_oceny = self._zmienione_oceny, None
+            self._indeks_ocen.ustaw_wiele(
+                {id: p.srednia_ocena() if p.oceny else None for id, p in zmienione.items()})
+    
+    def _przydziel_id(self) -> int:
+        """
+        Zwraca najmniejsze wolne ID (bez rezerwowania go)
+        
+        Returns:
+            ID, które zostanie zajęte po dodaniu pozycji do katalogu
+        """
+        # ID zajęte w międzyczasie (np. bezpośrednim append) są pomijane leniwie
+        while self._wolne_id and self._wolne_id[0] in self._indeks_id:
+            heapq.heappop(self._wolne_id)
+        if self._wolne_id:
+            return self._wolne_id[0]
+        
+        while self._nastepne_id in self._indeks_id:
+            self._nastepne_id += 1
+        return self._nastepne_id
+    
+    def _przydziel_wiele_id(self, liczba: int) -> List[int]:
+        """
+        Rezerwuje podaną liczbę najmniejszych wolnych ID (jednym przebiegiem)
+        
+        Returns:
+            Rosnąca lista ID, które muszą zostać od razu zajęte
+        """
+        ids: List[int] = []
+        while len(ids) < liczba and self._wolne_id:
+            id = heapq.heappop(self._wolne_id)
+            # Kopiec może zawierać ID zajęte w międzyczasie lub powtórzone
+            if id not in self._indeks_id and (not ids or ids[-1] != id):
+                ids.append(id)
+        
+        nastepne = self._nastepne_id
+        while len(ids) < liczba:
+            if nastepne not in self._indeks_id:
+                ids.append(nastepne)
+            nastepne += 1
+        self._nastepne_id = max(self._nastepne_id, nastepne)
+        return ids
     
     # =========================================================================
     # ZARZĄDZANIE DANYMI (CRUD)
     # =========================================================================
     
+    @pod_pisaniem
     def dodaj_pozycje(self, tytul: str, wydawca: str, gatunek: str, rok: int) -> Pozycja:  # MŻ
         """
         Dodaje nową grę do katalogu
@@ -72,17 +472,103 @@ class Katalog:
         Returns:
             Nowo utworzona pozycja
         """
-        # Znajdź najmniejsze wolne ID
-        uzyte_id = {p.id for p in self.pozycje}
-        nowe_id = 1
-        while nowe_id in uzyte_id:
-            nowe_id += 1
-        
-        pozycja = Pozycja(nowe_id, tytul, wydawca, gatunek, rok)
+        pozycja = Pozycja(self._przydziel_id(), tytul, wydawca, gatunek, rok)
+        wersja = self._wersja
         self.pozycje.append(pozycja)
-        self.zapisz()
+        self._zapisz_zmiane({'op': 'dodaj', 'pozycja': pozycja.to_dict()}, wersja)
         return pozycja
     
+    @pod_pisaniem
+    def dodaj_wiele(self, dane: Iterable[Union[dict, Sequence[Any]]]) -> List[Pozycja]:
+        """
+        Dodaje wiele gier naraz i utrwala je jednym zapisem
+        
+        Wszystkie dane są sprawdzane przed dodaniem czegokolwiek - przy błędzie
+        katalog pozostaje bez zmian.
+        
+        Args:
+            dane: Słowniki {'tytul', 'wydawca', 'gatunek', 'rok'} (opcjonalnie
+                  'oceny': wartości 1-10 lub słowniki {'wartosc', 'data_dodania'})
+                  lub krotki (tytul, wydawca, gatunek, rok)
+        
+        Returns:
+            Nowo utworzone pozycje
+        
+        Raises:
+            ValueError: Gdy któraś gra ma niepoprawne dane
+        """
+        return self._dodaj_wiele(dane)
+    
+    def _dodaj_wiele(self, dane: Iterable[Union[dict, Sequence[Any]]],
+                     pierwszy_nr: int = 0) -> List[Pozycja]:
+        """dodaj_wiele z numeracją wpisów w komunikatach błędów od `pierwszy_nr`"""
+        sprawdzone = [self._sprawdz_dane_gry(nr, wpis) for nr, wpis in enumerate(dane, pierwszy_nr)]
+        ids = self._przydziel_wiele_id(len(sprawdzone))
+        nowe = []
+        for id, (tytul, wydawca, gatunek, rok, oceny) in zip(ids, sprawdzone):
+            pozycja = Pozycja(id, tytul, wydawca, gatunek, rok)
+            for wartosc, data_dodania in oceny:
+                pozycja.oceny.dodaj(wartosc, data_dodania)
+            nowe.append(pozycja)
+        
+        wersja = self._wersja
+        self.pozycje.extend(nowe)
+        self._zapisz_zmiany(({'op': 'dodaj', 'pozycja': p.to_dict()} for p in nowe), wersja)
+        return nowe
+    
+    @staticmethod
+    def _sprawdz_dane_gry(nr: int, wpis: Union[dict, Sequence[Any]]
+                          ) -> Tuple[str, str, str, int, List[Tuple[int, datetime]]]:
+        """
+        Sprawdza dane gry (te same reguły co w oknie dodawania gry)
+        
+        Args:
+            nr: Numer wpisu (do komunikatu błędu)
+            wpis: Słownik lub krotka z danymi gry
+        
+        Returns:
+            (tytul, wydawca, gatunek, rok, [(ocena, data_dodania), ...])
+        """
+        try:
+            if isinstance(wpis, dict):
+                tytul, wydawca, gatunek, rok = (wpis['tytul'], wpis['wydawca'],
+                                                wpis['gatunek'], wpis['rok'])
+            else:
+                tytul, wydawca, gatunek, rok = wpis
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"Gra nr {nr}: wymagane pola to tytul, wydawca, gatunek, rok")
+        
+        tytul, wydawca, gatunek = str(tytul).strip(), str(wydawca).strip(), str(gatunek).strip()
+        if not tytul or not wydawca or not gatunek:
+            raise ValueError(f"Gra nr {nr}: wszystkie pola są wymagane")
+        try:
+            rok = int(rok)
+        except (TypeError, ValueError):
+            raise ValueError(f"Gra nr {nr}: rok musi być liczbą")
+        if rok < 1900 or rok > datetime.now().year:
+            raise ValueError(f"Gra nr {nr}: rok musi być między 1900 a {datetime.now().year}")
+        
+        oceny = []
+        teraz = datetime.now()
+        lista_ocen = (wpis.get('oceny') or ()) if isinstance(wpis, dict) else ()
+        if not isinstance(lista_ocen, (list, tuple)):
+            raise ValueError(f"Gra nr {nr}: oceny muszą być listą")
+        for ocena in lista_ocen:
+            data_dodania = None
+            if isinstance(ocena, dict):
+                ocena, data_dodania = ocena.get('wartosc'), ocena.get('data_dodania')
+            calkowita = ocena_calkowita(ocena)
+            if calkowita is None:
+                raise ValueError(f"Gra nr {nr}: ocena musi być liczbą całkowitą od 1 do 10 "
+                                 f"(podano {ocena!r})")
+            try:
+                data_dodania = datetime.fromisoformat(data_dodania) if data_dodania else teraz
+            except (TypeError, ValueError):
+                raise ValueError(f"Gra nr {nr}: niepoprawna data oceny {data_dodania!r}")
+            oceny.append((calkowita, data_dodania))
+        return tytul, wydawca, gatunek, rok, oceny
+    
+    @pod_pisaniem
     def usun_pozycje(self, id: int) -> bool:  # MŻ
         """
         Usuwa grę z katalogu
@@ -95,8 +581,9 @@ class Katalog:
         """
         pozycja = self.pobierz_pozycje(id)
         if pozycja:
+            wersja = self._wersja
             self.pozycje.remove(pozycja)
-            self.zapisz()
+            self._zapisz_zmiane({'op': 'usun', 'id': id}, wersja)
             return True
         return False
     
@@ -110,20 +597,56 @@ class Katalog:
         Returns:
             Pozycja lub None jeśli nie znaleziono
         """
-        for pozycja in self.pozycje:
-            if pozycja.id == id:
-                return pozycja
-        return None
+        pozycja = self._z_indeksu_id(id)
+        if pozycja is None or pozycja.id == id:
+            return pozycja
+        # ID zmienione bezpośrednio na obiekcie - indeks jest nieaktualny.
+        # Przebudowa zmienia katalog, więc odbywa się pod blokadą zapisu;
+        # wątek z blokadą odczytu szuka gry na liście bez przebudowy.
+        if self.blokada is not None and self.blokada.czyta_bez_pisania():
+            return next((p for p in self._pozycje if p.id == id), None)
+        with self._pisanie():
+            pozycja = self._indeks_id.get(id)
+            if pozycja is not None and pozycja.id != id:
+                self._przebuduj_indeksy()
+                pozycja = self._indeks_id.get(id)
+            return pozycja
     
-    def pobierz_wszystkie(self) -> List[Pozycja]:
+    @pod_odczytem
+    def _z_indeksu_id(self, id: int) -> Optional[Pozycja]:
+        """Gra wskazana przez indeks ID (bez sprawdzania, czy indeks jest aktualny)"""
+        return self._indeks_id.get(id)
+    
+    @pod_odczytem
+    def pobierz_wszystkie(self, limit: Optional[int] = None, offset: int = 0) -> List[Pozycja]:
         """
         Zwraca wszystkie gry
         
+        Args:
+            limit: Maksymalna liczba zwróconych gier (None = bez limitu)
+            offset: Liczba gier pominiętych od początku
+        
         Returns:
-            Lista wszystkich pozycji
+            Lista wszystkich pozycji (lub wybranej strony)
         """
-        return self.pozycje.copy()
+        koniec = None if limit is None else offset + limit
+        return self.pozycje[offset:koniec]
     
+    @pod_odczytem
+    def migawka(self) -> Migawka:
+        """
+        Zwraca niezmienny widok listy gier (bez kopiowania)
+        
+        Widok nie zmienia się przy późniejszym dodawaniu i usuwaniu gier;
+        kopia listy powstaje dopiero wtedy, gdy zmieniana jest jej część
+        widoczna w żywej migawce (dodawanie gier na końcu jej nie wymaga).
+        
+        Returns:
+            Migawka z wersją katalogu z chwili utworzenia
+        """
+        return self._pozycje.migawka()
+    
+    @pod_odczytem
     def liczba_gier(self) -> int:
         """
         Zwraca liczbę gier w katalogu
@@ -137,66 +660,191 @@ class Katalog:
     # OCENY
     # =========================================================================
     
+    @pod_pisaniem
     def dodaj_ocene(self, id: int, ocena: int) -> bool:  # MŻ
         """
         Dodaje ocenę do gry
         
         Args:
             id: ID gry
-            ocena: Ocena w zakresie 1-10
+            ocena: Ocena - liczba całkowita w zakresie 1-10
             
         Returns:
-            True jeśli dodano, False jeśli nie znaleziono gry
+            True jeśli dodano, False jeśli nie znaleziono gry lub ocena jest niepoprawna
         """
         pozycja = self.pobierz_pozycje(id)
-        if pozycja and 1 <= ocena <= 10:
-            pozycja.oceny.append(OcenaGra(ocena))
-            self.zapisz()
+        wartosc = ocena_calkowita(ocena)
+        if pozycja and wartosc is not None:
+            nowa = OcenaGra(wartosc)
+            wersja = self._wersja
+            pozycja.dodaj_ocene(nowa)  # Ranking aktualizuje _pozycja_zmieniona
+            self._zapisz_zmiane({'op': 'ocena', 'id': id, 'wartosc': wartosc,
+                                 'data_dodania': nowa.data_dodania.isoformat()}, wersja)
             return True
         return False
     
+    @pod_pisaniem
+    def dodaj_oceny_wiele(self, oceny: Iterable[Tuple[int, int]]) -> int:
+        """
+        Dodaje wiele ocen naraz i utrwala je jednym zapisem
+        
+        Wszystkie oceny są sprawdzane przed dodaniem którejkolwiek.
+        
+        Args:
+            oceny: Pary (id_gry, ocena 1-10)
+        
+        Returns:
+            Liczba dodanych ocen
+        
+        Raises:
+            ValueError: Gdy gra nie istnieje lub ocena jest spoza zakresu
+        """
+        sprawdzone = []
+        for nr, (id, wartosc) in enumerate(oceny):
+            pozycja = self.pobierz_pozycje(id)
+            if pozycja is None:
+                raise ValueError(f"Ocena nr {nr}: brak gry o ID {id}")
+            calkowita = ocena_calkowita(wartosc)
+            if calkowita is None:
+                raise ValueError(f"Ocena nr {nr}: ocena musi być liczbą całkowitą od 1 do 10 "
+                                 f"(podano {wartosc!r})")
+            sprawdzone.append((pozycja, calkowita))
+        
+        teraz = datetime.now()
+        data_dodania = teraz.isoformat()
+        wersja = self._wersja
+        # Ranking aktualizowany raz, po dodaniu wszystkich ocen
+        with self._odlozony_ranking():
+            for pozycja, wartosc in sprawdzone:
+                pozycja.dodaj_ocene(OcenaGra(wartosc, teraz))
+        
+        self._zapisz_zmiany(({'op': 'ocena', 'id': pozycja.id, 'wartosc': wartosc,
+                              'data_dodania': data_dodania} for pozycja, wartosc in sprawdzone),
+                            wersja)
+        return len(sprawdzone)
+    
     # =========================================================================
     # WYSZUKIWANIE I FILTROWANIE
     # =========================================================================
     
-    def wyszukaj(self, fraza: str) -> List[Pozycja]:  # MŻ
+    @pod_odczytem
+    def wyszukaj(self, fraza: str, limit: Optional[int] = None,
+                 offset: int = 0) -> List[Pozycja]:  # MŻ
         """
         Wyszukuje gry po tytule
         
         Args:
             fraza: Fraza do wyszukania
+            limit: Maksymalna liczba wyników (None = wszystkie)
+            offset: Liczba pominiętych wyników
             
         Returns:
             Lista znalezionych gier
         """
-        fraza_lower = fraza.lower()
-        return [p for p in self.pozycje if fraza_lower in p.tytul.lower()]
+        return self._wykonaj('wyszukaj', fraza, limit=limit, offset=offset)
     
-    def filtruj_po_gatunku(self, gatunek: str) -> List[Pozycja]:  # MŻ
+    @pod_odczytem
+    def filtruj_po_gatunku(self, gatunek: str, limit: Optional[int] = None,
+                           offset: int = 0) -> List[Pozycja]:  # MŻ
         """
         Filtruje gry po gatunku
         
         Args:
             gatunek: Gatunek do filtrowania
+            limit: Maksymalna liczba wyników (None = wszystkie)
+            offset: Liczba pominiętych wyników
             
         Returns:
             Lista przefiltrowanych gier
         """
-        return [p for p in self.pozycje if p.gatunek == gatunek]
+        return self._wykonaj('gatunek', gatunek, limit=limit, offset=offset)
     
-    def filtruj_po_roku(self, od_roku: int, do_roku: int) -> List[Pozycja]:  # AY
+    @pod_odczytem
+    def filtruj_po_roku(self, od_roku: int, do_roku: int, limit: Optional[int] = None,
+                        offset: int = 0) -> List[Pozycja]:  # AY
         """
         Filtruje gry po zakresie lat
         
         Args:
             od_roku: Początkowy rok
             do_roku: Końcowy rok
+            limit: Maksymalna liczba wyników (None = wszystkie)
+            offset: Liczba pominiętych wyników
             
         Returns:
             Lista przefiltrowanych gier
         """
-        return [p for p in self.pozycje if od_roku <= p.rok <= do_roku]
+        return self._wykonaj('rok', od_roku, do_roku, limit=limit, offset=offset)
+    
+    def zapytanie(self) -> Zapytanie:
+        """
+        Tworzy puste zapytanie do łączenia filtrów, np.
+        katalog.zapytanie().gatunek("RPG").lata(2010, 2020).sortuj_ocena().limit(50)
+        
+        Returns:
+            Leniwe zapytanie (wykonywane przy iteracji lub wykonaj())
+        """
+        return Zapytanie(self)
     
+    def kursor(self, zapytanie: str = 'wszystkie', *argumenty,
+               rozmiar_strony: int = 50) -> Kursor:
+        """
+        Tworzy kursor zwracający wyniki zapytania stronami
+        
+        Args:
+            zapytanie: 'wszystkie', 'wyszukaj', 'gatunek', 'rok' lub 'sortuj'
+            argumenty: Parametry zapytania (jak w odpowiednich metodach)
+            rozmiar_strony: Liczba gier na stronie
+        
+        Returns:
+            Kursor (metoda nastepna() lub iteracja po stronach)
+        """
+        self._strumien(zapytanie, *argumenty)  # Sprawdza nazwę zapytania od razu
+        return Kursor(self, lambda: self._strumien(zapytanie, *argumenty), rozmiar_strony)
+    
+    def _strumien(self, zapytanie: str, *argumenty) -> Iterator[Pozycja]:
+        """
+        Zwraca leniwy strumień wyników zapytania z indeksów w pamięci
+        
+        Args:
+            zapytanie: 'wszystkie', 'wyszukaj', 'gatunek', 'rok' lub 'sortuj'
+            argumenty: Parametry zapytania
+        """
+        indeks_id = self._indeks_id
+        if zapytanie == 'wszystkie':
+            return iter(self.pozycje)
+        if zapytanie == 'wyszukaj':
+            (fraza,) = argumenty
+            return (indeks_id[i] for i in self._indeks_tytulow.szukaj(fraza))
+        if zapytanie == 'gatunek':
+            (gatunek,) = argumenty
+            return (indeks_id[i] for i in self._indeks_gatunkow.szukaj(gatunek))
+        if zapytanie == 'rok':
+            od_roku, do_roku = argumenty
+            # Scalanie wielu lat kosztuje ok. 20x więcej na wynik niż przegląd listy,
+            # więc przy szerokim zakresie szybszy (i wciąż ~proporcjonalny do wyniku)
+            # jest zwykły przegląd
+            if (od_roku < do_roku and
+                    self._indeks_lat.liczba_w_zakresie(od_roku, do_roku) * 16 > len(self.pozycje)):
+                return (p for p in self.pozycje if od_roku <= p.rok <= do_roku)
+            return (indeks_id[i] for i in self._indeks_lat.zakres(od_roku, do_roku))
+        if zapytanie == 'sortuj':
+            (malejaco,) = argumenty
+            return self.iteruj_po_ocenie(malejaco)
+        raise ValueError(f"Nieznane zapytanie: {zapytanie}")
+    
+    def _wykonaj(self, zapytanie: str, *argumenty, limit: Optional[int] = None,
+                 offset: int = 0) -> List[Pozycja]:
+        """
+        Wykonuje zapytanie na indeksach w pamięci
+        
+        Returns:
+            Lista wyników ograniczona do strony [offset, offset + limit)
+        """
+        koniec = None if limit is None else offset + limit
+        return list(islice(self._strumien(zapytanie, *argumenty), offset, koniec))
+    
+    @pod_odczytem
     def pobierz_gatunki(self) -> List[str]:
         """
         Zwraca listę unikalnych gatunków
@@ -204,13 +852,13 @@ class Katalog:
         Returns:
             Posortowana lista gatunków
         """
-        gatunki = set(p.gatunek for p in self.pozycje)
-        return sorted(gatunki)
+        return sorted(self._indeks_gatunkow.wartosci())
     
     # =========================================================================
     # STATYSTYKI
     # =========================================================================
     
+    @pod_odczytem
     def najlepsza(self) -> Optional[Pozycja]:  # AY
         """
         Zwraca najlepiej ocenioną grę
@@ -218,11 +866,10 @@ class Katalog:
         Returns:
             Gra z najwyższą średnią oceną lub None
         """
-        ocenione = [p for p in self.pozycje if p.oceny]
-        if not ocenione:
-            return None
-        return max(ocenione, key=lambda p: p.srednia_ocena())
+        id = self._indeks_ocen.najlepszy()
+        return None if id is None else self._indeks_id[id]
     
+    @pod_odczytem
     def najgorsza(self) -> Optional[Pozycja]:  # AY
         """
         Zwraca najgorzej ocenioną grę
@@ -230,46 +877,73 @@ class Katalog:
         Returns:
             Gra z najniższą średnią oceną lub None
         """
-        ocenione = [p for p in self.pozycje if p.oceny]
-        if not ocenione:
-            return None
-        return min(ocenione, key=lambda p: p.srednia_ocena())
+        id = self._indeks_ocen.najgorszy()
+        return None if id is None else self._indeks_id[id]
     
-    def sortuj_po_ocenie(self, malejaco: bool = True) -> List[Pozycja]:  # AY
+    @pod_odczytem
+    def sortuj_po_ocenie(self, malejaco: bool = True, limit: Optional[int] = None,
+                         offset: int = 0) -> List[Pozycja]:  # AY
         """
         Sortuje gry po średniej ocenie
         
         Args:
             malejaco: True = od najlepszej do najgorszej (domyślnie)
                      False = od najgorszej do najlepszej
+            limit: Maksymalna liczba wyników (None = wszystkie)
+            offset: Liczba pominiętych wyników
         
         Returns:
             Posortowana lista gier (gry ocenione + nieocenione na końcu)
         """
-        # Rozdziel gry ocenione od nieocenionych
-        ocenione = [p for p in self.pozycje if p.oceny]
-        nieocenione = [p for p in self.pozycje if not p.oceny]
+        return self._wykonaj('sortuj', malejaco, limit=limit, offset=offset)
+    
+    @pod_odczytem
+    def najlepsze(self, k: int, gatunek: Optional[str] = None) -> List[Pozycja]:
+        """
+        Zwraca k najlepiej ocenionych gier (opcjonalnie tylko z jednego gatunku)
         
-        # Sortuj gry ocenione
-        ocenione.sort(key=lambda p: p.srednia_ocena(), reverse=malejaco)
+        Args:
+            k: Liczba gier
+            gatunek: Gatunek lub None = cały katalog
         
-        # Zwróć ocenione + nieocenione
-        return ocenione + nieocenione
+        Returns:
+            Do k ocenionych gier, od najlepszej (przy remisie w kolejności katalogu)
+        """
+        if gatunek is None:
+            # Gry bez ocen są na końcu rankingu - przegląd kończy się na pierwszej z nich
+            return list(islice(takewhile(lambda p: p.oceny, self.iteruj_po_ocenie()), k))
+        # Wybór przez kopiec - bez sortowania wszystkich gier gatunku
+        kandydaci = (p for p in self._strumien('gatunek', gatunek) if p.oceny)
+        return heapq.nlargest(k, kandydaci, key=Pozycja.srednia_ocena)
+    
+    def iteruj_po_ocenie(self, malejaco: bool = True) -> Iterator[Pozycja]:
+        """
+        Przegląda gry w kolejności średniej oceny (bez sortowania katalogu)
+        
+        Args:
+            malejaco: True = od najlepszej do najgorszej
+        
+        Returns:
+            Generator pozycji (gry ocenione, potem nieocenione)
+        
+        Generator nie trzyma blokady katalogu - w trybie wielowątkowym należy
+        go przeglądać wewnątrz `with katalog.blokada.czytanie():`.
+        """
+        for id in self._indeks_ocen.przegladaj(malejaco):
+            yield self._indeks_id[id]
     
+    @pod_odczytem
     def srednia_ocena_katalogu(self) -> float:  # AY
         """
-        Oblicza średnią ocenę wszystkich gier
+        Zwraca średnią ze średnich ocen ocenionych gier (z sumy utrzymywanej
+        przez ranking - bez przeglądania katalogu)
         
         Returns:
             Średnia ocena lub 0
         """
-        ocenione = [p for p in self.pozycje if p.oceny]
-        if not ocenione:
-            return 0.0
-        
-        suma = sum(p.srednia_ocena() for p in ocenione)
-        return suma / len(ocenione)
+        return self._indeks_ocen.srednia() or 0.0
     
+    @pod_odczytem
     def rozklad_gatunkow(self) -> Dict[str, int]:
         """
         Zwraca rozkład gier po gatunkach
@@ -277,11 +951,9 @@ class Katalog:
         Returns:
             Słownik {gatunek: liczba_gier}
         """
-        rozklad = {}
-        for pozycja in self.pozycje:
-            rozklad[pozycja.gatunek] = rozklad.get(pozycja.gatunek, 0) + 1
-        return rozklad
+        return self._indeks_gatunkow.rozklad()
     
+    @pod_odczytem
     def zakres_lat(self) -> Tuple[int, int]:
         """
         Zwraca zakres lat wydania gier
@@ -291,47 +963,279 @@ class Katalog:
         """
         if not self.pozycje:
             return (0, 0)
-        lata = [p.rok for p in self.pozycje]
-        return (min(lata), max(lata))
+        return (self._indeks_lat.najmniejsza(), self._indeks_lat.najwieksza())
+    
+    @pod_odczytem
+    def statystyki(self) -> Dict[str, Any]:
+        """
+        Zbiera statystyki katalogu z indeksów (koszt zależy od liczby
+        gatunków, nie od liczby gier i ocen)
+        
+        Returns:
+            Słownik z kluczami: liczba_gier, liczba_ocenionych, srednia,
+            najlepsza, najgorsza, gatunki ({gatunek: liczba_gier}), zakres_lat
+        """
+        return {
+            'liczba_gier': self.liczba_gier(),
+            'liczba_ocenionych': self._indeks_ocen.liczba_ocenionych(),
+            'srednia': self.srednia_ocena_katalogu(),
+            'najlepsza': self.najlepsza(),
+            'najgorsza': self.najgorsza(),
+            'gatunki': self.rozklad_gatunkow(),
+            'zakres_lat': self.zakres_lat(),
+        }
+    
+    # =========================================================================
+    # IMPORT/EKSPORT (CSV, JSON Lines)
+    # =========================================================================
+    
+    def importuj(self, sciezka: str, postep: Optional[wymiana.Postep] = None,
+                 partia: int = 10_000) -> int:
+        """
+        Importuje gry z pliku CSV lub JSON Lines (gry dostają nowe ID)
+        
+        Plik czytany jest strumieniowo i dodawany partiami przez dodaj_wiele.
+        Przy magazynie przyrostowym (dziennik, SQLite) każda partia jest
+        utrwalana od razu, przy pozostałych - jednym zapisem na końcu importu.
+        Przy błędzie w danych wcześniejsze partie pozostają w katalogu.
+        W trybie wielowątkowym blokada zapisu obejmuje jedną partię (przy
+        magazynie nieprzyrostowym - cały import, bo jest on transakcją).
+        
+        Args:
+            sciezka: Ścieżka pliku (.csv lub .jsonl)
+            postep: Funkcja postępu (przeczytane bajty, rozmiar pliku)
+            partia: Liczba gier dodawanych naraz
+        
+        Returns:
+            Liczba zaimportowanych gier
+        
+        Raises:
+            ValueError: Gdy format pliku jest nieobsługiwany lub dane niepoprawne
+        """
+        wpisy = wymiana.czytaj(sciezka, postep)
+        dodane = 0
+        # W trybie wielowątkowym ranking aktualizuje każda partia - zapytania
+        # między partiami widzą wszystkie zaimportowane już gry
+        ranking = self._odlozony_ranking() if self.blokada is None else nullcontext()
+        with nullcontext() if self.magazyn.przyrostowy else self.transakcja(), ranking:
+            while True:
+                paczka = list(islice(wpisy, partia))  # Plik czytany bez blokady
+                if not paczka:
+                    return dodane
+                with self._pisanie():
+                    dodane += len(self._dodaj_wiele(paczka, dodane))
+    
+    def eksportuj(self, sciezka: str, postep: Optional[wymiana.Postep] = None,
+                  pozycje: Optional[Iterable[Pozycja]] = None) -> int:
+        """
+        Eksportuje gry do pliku CSV lub JSON Lines (zapis strumieniowy)
+        
+        Args:
+            sciezka: Ścieżka pliku (.csv lub .jsonl)
+            postep: Funkcja postępu (zapisane gry, liczba gier)
+            pozycje: Gry do eksportu (domyślnie cały katalog, np. wynik zapytania)
+        
+        Returns:
+            Liczba wyeksportowanych gier
+        """
+        return wymiana.eksportuj(self.migawka() if pozycje is None else pozycje,
+                                 sciezka, postep)
+    
+    @pod_odczytem
+    def kolumny(self, pozycje: Optional[Iterable[Pozycja]] = None) -> KolumnyKatalogu:
+        """
+        Eksportuje gry do postaci kolumnowej (dla statystyki.raport)
+        
+        Args:
+            pozycje: Gry do eksportu (domyślnie cały katalog, np. wynik zapytania)
+        
+        Returns:
+            Tablice ID, lat, kodów gatunków oraz sum i liczb ocen
+        """
+        return KolumnyKatalogu.z_pozycji(self.pozycje if pozycje is None else pozycje)
     
     # =========================================================================
-    # ZAPIS/ODCZYT JSON
+    # ZAPIS/ODCZYT
     # =========================================================================
     
+    @pod_pisaniem
     def zapisz(self) -> None:
-        """Zapisuje katalog do pliku JSON"""
-        data = {
-            'pozycje': [p.to_dict() for p in self.pozycje]
-        }
+        """Zapisuje pełny stan katalogu w magazynie"""
+        self.magazyn.zapisz(self.pozycje)
+        self._wersja_magazynu = self._wersja
+    
+    @pod_pisaniem
+    def kompaktuj(self) -> None:
+        """Scala dziennik zmian z plikiem katalogu"""
+        self.zapisz()
+    
+    @pod_pisaniem
+    def zamknij(self) -> None:
+        """
+        Kończy pracę z magazynem (czeka na zapis zmian odłożonych w tle)
+        
+        Jeżeli katalog zmieniono z pominięciem API i magazyn nie jest z nim
+        zgodny, przed zamknięciem zapisywany jest pełny stan katalogu.
+        """
+        if self._wersja_magazynu != self._wersja and not self._transakcja:
+            self.zapisz()
+        self.magazyn.zamknij()
+    
+    @contextmanager
+    def transakcja(self):
+        """
+        Odkłada utrwalanie zmian do końca bloku `with` (jeden zapis na całą serię)
         
-        with open(self.sciezka_pliku, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        Zmiany w pamięci są widoczne od razu. Po wyjściu z bloku (także przez
+        wyjątek) wszystkie wykonane zmiany trafiają do magazynu naraz;
+        zagnieżdżone transakcje zapisują się razem z zewnętrzną.
+        W trybie wielowątkowym cały blok ma blokadę zapisu.
+        """
+        with self._pisanie():
+            self._transakcja += 1
+            try:
+                yield self
+            finally:
+                self._transakcja -= 1
+                if not self._transakcja and self._odlozone:
+                    rekordy, self._odlozone = self._odlozone, []
+                    self._utrwal(rekordy, self._odlozone_zgodne
+                                 and self._wersja_odlozonych == self._wersja)
     
+    def _zapisz_zmiane(self, rekord: dict, wersja_przed: int) -> None:
+        """
+        Utrwala pojedynczą zmianę katalogu
+        
+        Args:
+            rekord: Opis zmiany ('op' + dane operacji)
+            wersja_przed: Wersja katalogu sprzed zmiany
+        """
+        self._zapisz_zmiany([rekord], wersja_przed)
+    
+    def _zapisz_zmiany(self, rekordy: Iterable[dict], wersja_przed: int) -> None:
+        """
+        Utrwala serię zmian katalogu (w transakcji - odkłada je do jej końca)
+        
+        Opisy zmian są potrzebne tylko magazynom przyrostowym; pozostałe
+        dostają jeden rekord ZMIANA_KATALOGU, więc np. import w transakcji
+        nie trzyma w pamięci drugiej kopii importowanych gier.
+        
+        Args:
+            rekordy: Opisy zmian w kolejności wykonania (np. generator -
+                     przeglądany tylko dla magazynu przyrostowego)
+            wersja_przed: Wersja katalogu sprzed pierwszej zmiany
+        """
+        przyrostowy = self.magazyn.przyrostowy
+        if self._transakcja:
+            # Magazyn będzie zgodny po zapisie tylko, jeśli między odłożonymi
+            # zmianami nie było zmian z pominięciem API katalogu
+            if not self._odlozone:
+                self._odlozone_zgodne = self._wersja_magazynu == wersja_przed
+            elif wersja_przed != self._wersja_odlozonych:
+                self._odlozone_zgodne = False
+            if przyrostowy:
+                self._odlozone.extend(rekordy)
+            elif not self._odlozone:
+                self._odlozone.append(ZMIANA_KATALOGU)
+            self._wersja_odlozonych = self._wersja
+            return
+        
+        self._utrwal(list(rekordy) if przyrostowy else [ZMIANA_KATALOGU],
+                     self._wersja_magazynu == wersja_przed)
+    
+    def _utrwal(self, rekordy: List[dict], zgodny: bool) -> None:
+        """
+        Zapisuje zmiany w magazynie
+        
+        Args:
+            rekordy: Opisy zmian w kolejności wykonania
+            zgodny: True = magazyn był zgodny z katalogiem sprzed zmian i
+                    wystarczy dopisać rekordy; False = katalog zmieniono
+                    bezpośrednio, więc zapisywany jest jego pełny stan
+        """
+        if zgodny:
+            self.magazyn.zapisz_zmiany(rekordy, self.pozycje)
+        else:
+            self.magazyn.zapisz(self.pozycje)
+        self._wersja_magazynu = self._wersja
+    
+    @pod_pisaniem
     def wczytaj(self) -> bool:
         """
-        Wczytuje katalog z pliku JSON
+        Wczytuje katalog z magazynu
         
         Returns:
             True jeśli wczytano, False jeśli plik nie istnieje
         """
-        if not os.path.exists(self.sciezka_pliku):
-            return False
-        
         try:
-            with open(self.sciezka_pliku, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            self.pozycje = [Pozycja.from_dict(p) for p in data['pozycje']]
-            # nastepne_id nie jest już używane - ID są teraz dynamicznie przydzielane
-            return True
+            wczytywanie = self.wczytuj_partiami()
+            if wczytywanie is None:
+                return False
+            for _ in wczytywanie:
+                pass
         except Exception as e:
             print(f"Błąd wczytywania: {e}")
             return False
+        return True
+    
+    def wczytuj_partiami(self, partia: int = 10_000) -> Optional[Iterator[int]]:
+        """
+        Wczytuje katalog stopniowo - gry trafiają do katalogu partiami,
+        w miarę czytania pliku (pierwsze strony są dostępne od razu)
+        
+        Do zakończenia wczytywania katalogu nie należy zmieniać, a ranking
+        ocen jest budowany dopiero po ostatniej partii (w trybie
+        wielowątkowym - po każdej partii). Przy błędzie
+        odczytu katalog zostaje pusty. Zamknięcie katalogu przed końcem
+        wczytywania nie zapisuje niepełnego stanu w magazynie.
+        
+        Args:
+            partia: Liczba gier dodawanych do katalogu naraz
+        
+        Returns:
+            Generator liczby wczytanych dotąd gier (po każdej partii) lub None,
+            gdy magazyn nie zawiera jeszcze danych
+        """
+        strumien = self.magazyn.wczytaj_strumieniowo()
+        if strumien is None:
+            return None
+        return self._wczytuj(strumien, partia)
+    
+    def _wczytuj(self, strumien: Iterator[Pozycja], partia: int) -> Iterator[int]:
+        # Blokada zapisu obejmuje pojedyncze partie (nie czas między nimi);
+        # w trybie wielowątkowym ranking jest aktualizowany po każdej partii.
+        # Wczytana część katalogu jest fragmentem magazynu, więc magazyn
+        # jest oznaczany jako zgodny po każdej partii - zamknięcie w trakcie
+        # wczytywania (albo po jego przerwaniu) niczego nie nadpisuje.
+        with self._pisanie():
+            self.pozycje = []
+            self._wersja_magazynu = self._wersja
+        wczytane = 0
+        try:
+            with self._odlozony_ranking() if self.blokada is None else nullcontext():
+                while True:
+                    paczka = list(islice(strumien, partia))
+                    if not paczka:
+                        break
+                    with self._pisanie():
+                        self.pozycje.extend(paczka)
+                        self._wersja_magazynu = self._wersja
+                    wczytane += len(paczka)
+                    yield wczytane
+        except BaseException:
+            with self._pisanie():
+                self.pozycje = []
+                self._wersja_magazynu = self._wersja
+            raise
+        with self._pisanie():
+            self._przelicz_wolne_id()
+            self._wersja_magazynu = self._wersja
     
     # =========================================================================
     # DANE TESTOWE
     # =========================================================================
     
+    @pod_pisaniem
     def dodaj_dane_testowe(self) -> None:
         """Dodaje 100 przykładowych gier do katalogu - ze wszystkich 32 gatunków"""
         
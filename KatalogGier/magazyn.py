@@ -0,0 +1,1119 @@
+"""
+===============================================================================
+PLIK: magazyn.py
+OPIS: Warstwa przechowywania danych katalogu (plik JSON, baza SQLite)
+===============================================================================
+"""
+
+import gzip
+import io
+import json
+import lzma
+import os
+import shutil
+import sqlite3
+import struct
+import sys
+import threading
+import time
+from array import array
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import chain
+from typing import IO, Dict, Iterator, List, Optional, Sequence, Set, TextIO, Tuple
+from modele import Pozycja, OcenaGra, KolumnyOcen
+
+
+@contextmanager
+def zapis_atomowy(sciezka: str, tryb: str = 'w', pokolenia: int = 0, **opcje) -> Iterator[IO]:
+    """
+    Zapisuje plik w całości albo wcale
+
+    Dane trafiają do pliku `<sciezka>.tmp`, który po udanym zapisie jest
+    utrwalany na dysku (fsync) i atomowo podmieniany z docelowym (os.replace).
+    Awaria w trakcie zapisu zostawia poprzednią wersję pliku nietkniętą.
+
+    Args:
+        sciezka: Plik docelowy
+        tryb: 'w' (tekstowy) lub 'wb' (binarny)
+        pokolenia: Liczba poprzednich wersji zachowywanych jako
+                   `<sciezka>.1` (najnowsza) ... `<sciezka>.N`
+        opcje: Dodatkowe argumenty open() (np. encoding)
+    """
+    tymczasowy = sciezka + '.tmp'
+    try:
+        with open(tymczasowy, tryb, **opcje) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        if pokolenia and os.path.exists(sciezka):
+            _przesun_pokolenia(sciezka, pokolenia)
+        os.replace(tymczasowy, sciezka)
+    except BaseException:
+        if os.path.exists(tymczasowy):
+            os.remove(tymczasowy)
+        raise
+    _utrwal_katalog(os.path.dirname(os.path.abspath(sciezka)))
+
+
+def _przesun_pokolenia(sciezka: str, pokolenia: int) -> None:
+    """Przesuwa kopie <sciezka>.1..N o jedną pozycję i zapamiętuje bieżący plik jako .1"""
+    for nr in range(pokolenia - 1, 0, -1):
+        if os.path.exists(f"{sciezka}.{nr}"):
+            os.replace(f"{sciezka}.{nr}", f"{sciezka}.{nr + 1}")
+    if os.path.exists(sciezka + '.1'):
+        os.remove(sciezka + '.1')
+    # Dowiązanie zamiast przeniesienia - plik docelowy istnieje przez cały czas
+    try:
+        os.link(sciezka, sciezka + '.1')
+    except OSError:
+        shutil.copyfile(sciezka, sciezka + '.1')
+
+
+def _utrwal_katalog(katalog: str) -> None:
+    """Utrwala wpis katalogu po os.replace (tylko POSIX; w Windows nie jest potrzebne)"""
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    fd = os.open(katalog, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+# Kompresja pliku katalogu JSON wybierana po rozszerzeniu:
+# funkcja(plik binarny, tryb 'rb'/'wb') -> strumień (de)kompresujący
+KOMPRESJA = {
+    '.gz': lambda plik, tryb: gzip.GzipFile(filename='', mode=tryb, fileobj=plik,
+                                            compresslevel=6, mtime=0),
+    '.xz': lambda plik, tryb: lzma.LZMAFile(plik, tryb),
+}
+
+
+class CzytnikJSON:
+    """
+    Przyrostowy odczyt pliku JSON postaci {"klucz": wartość, ..., "tablica": [...]}.
+
+    Plik czytany jest blokami, a kolejne wartości dekodowane przez
+    JSONDecoder.raw_decode - w pamięci jest tylko bieżący blok i bieżący
+    element tablicy, zamiast całego tekstu i całego drzewa obiektów.
+    """
+    
+    ROZMIAR_BLOKU = 1 << 16
+    BIALE_ZNAKI = ' \t\n\r'
+    
+    def __init__(self, plik: TextIO):
+        """
+        Args:
+            plik: Plik otwarty w trybie tekstowym
+        """
+        self._plik = plik
+        self._dekoder = json.JSONDecoder()
+        self._bufor = ''
+        self._poz = 0
+        self._koniec_pliku = False
+    
+    def _doczytaj(self) -> bool:
+        """Dokleja kolejny blok pliku (co najmniej tyle, ile już czeka w buforze)"""
+        if self._koniec_pliku:
+            return False
+        reszta = self._bufor[self._poz:]
+        blok = self._plik.read(max(self.ROZMIAR_BLOKU, len(reszta)))
+        if not blok:
+            self._koniec_pliku = True
+            return False
+        self._bufor = reszta + blok
+        self._poz = 0
+        return True
+    
+    def _znak(self) -> str:
+        """Zwraca następny znak poza białymi znakami (bez przesuwania), '' na końcu pliku"""
+        while True:
+            bufor, poz = self._bufor, self._poz
+            while poz < len(bufor) and bufor[poz] in self.BIALE_ZNAKI:
+                poz += 1
+            self._poz = poz
+            if poz < len(bufor):
+                return bufor[poz]
+            if not self._doczytaj():
+                return ''
+    
+    def _oczekuj(self, znaki: str) -> str:
+        """Pobiera następny znak, który musi być jednym z `znaki`"""
+        znak = self._znak()
+        if not znak or znak not in znaki:
+            raise ValueError(f"Niepoprawny JSON: oczekiwano jednego z {znaki!r}, "
+                             f"jest {znak or 'koniec pliku'!r}")
+        self._poz += 1
+        return znak
+    
+    def _wartosc(self):
+        """Dekoduje następną wartość JSON, doczytując plik aż będzie kompletna"""
+        self._znak()
+        while True:
+            try:
+                wartosc, koniec = self._dekoder.raw_decode(self._bufor, self._poz)
+            except json.JSONDecodeError:
+                if self._doczytaj():
+                    continue
+                raise
+            # Liczba na końcu bufora mogła zostać ucięta w połowie
+            if koniec == len(self._bufor) and self._doczytaj():
+                continue
+            self._poz = koniec
+            return wartosc
+    
+    def elementy(self, klucz: str, naglowek: dict) -> Iterator:
+        """
+        Zwraca kolejne elementy tablicy spod klucza najwyższego poziomu
+
+        Args:
+            klucz: Klucz tablicy (np. 'pozycje')
+            naglowek: Słownik uzupełniany pozostałymi kluczami obiektu - klucze
+                      zapisane przed tablicą są w nim przed pierwszym elementem
+
+        Raises:
+            ValueError: Gdy plik nie jest poprawnym JSON-em tej postaci
+        """
+        self._oczekuj('{')
+        if self._znak() == '}':
+            return
+        while True:
+            nazwa = self._wartosc()
+            self._oczekuj(':')
+            if nazwa == klucz:
+                self._oczekuj('[')
+                if self._znak() == ']':
+                    self._poz += 1
+                else:
+                    while True:
+                        yield self._wartosc()
+                        if self._oczekuj(',]') == ']':
+                            break
+            else:
+                naglowek[nazwa] = self._wartosc()
+            if self._oczekuj(',}') == '}':
+                return
+
+
+class Magazyn:
+    """
+    Klasa bazowa magazynu danych.
+    Katalog trzyma gry w pamięci, a magazyn odpowiada za ich utrwalanie.
+    """
+    
+    # Czy zapis zmiany kosztuje proporcjonalnie do jej rozmiaru (a nie całego katalogu)
+    przyrostowy = False
+    
+    def __init__(self, sciezka: str):
+        """
+        Args:
+            sciezka: Ścieżka pliku z danymi
+        """
+        self.sciezka = sciezka
+    
+    @property
+    def pusty(self) -> bool:
+        """Czy magazyn na pewno nie zawiera jeszcze danych (False = zawiera lub nie wiadomo)"""
+        return False
+    
+    def wczytaj(self) -> Optional[List[Pozycja]]:
+        """
+        Wczytuje wszystkie gry
+
+        Returns:
+            Lista pozycji lub None jeśli magazyn nie zawiera jeszcze danych
+        """
+        raise NotImplementedError
+    
+    def wczytaj_strumieniowo(self) -> Optional[Iterator[Pozycja]]:
+        """
+        Wczytuje gry po jednej (domyślnie: wczytaj i zwróć iterator listy)
+
+        Returns:
+            Iterator pozycji lub None jeśli magazyn nie zawiera jeszcze danych
+        """
+        pozycje = self.wczytaj()
+        return None if pozycje is None else iter(pozycje)
+    
+    def zapisz(self, pozycje: Sequence[Pozycja]) -> None:
+        """
+        Zapisuje pełny stan katalogu
+
+        Args:
+            pozycje: Wszystkie gry katalogu
+        """
+        raise NotImplementedError
+    
+    def zapisz_zmiane(self, rekord: dict, pozycje: Sequence[Pozycja]) -> None:
+        """
+        Utrwala pojedynczą zmianę katalogu (domyślnie: pełny zapis)
+
+        Args:
+            rekord: Opis zmiany - 'op' ('dodaj', 'usun', 'ocena') + dane operacji;
+                    magazyn nieprzyrostowy dostaje tylko {'op': 'zmiana'}
+            pozycje: Wszystkie gry katalogu (już po zmianie)
+        """
+        self.zapisz(pozycje)
+    
+    def zapisz_zmiany(self, rekordy: Sequence[dict], pozycje: Sequence[Pozycja]) -> None:
+        """
+        Utrwala serię zmian naraz (np. import lub transakcja katalogu)
+
+        Args:
+            rekordy: Opisy zmian w kolejności wykonania
+            pozycje: Wszystkie gry katalogu (już po zmianach)
+        """
+        for rekord in rekordy:
+            self.zapisz_zmiane(rekord, pozycje)
+    
+    def zapytaj(self, zapytanie: str, *argumenty, limit: Optional[int] = None,
+                offset: int = 0) -> Optional[List[Pozycja]]:
+        """
+        Wykonuje zapytanie po stronie magazynu, bez wczytywania całego katalogu
+
+        Args:
+            zapytanie: 'wyszukaj', 'gatunek', 'rok' lub 'sortuj'
+            argumenty: Parametry zapytania (jak w metodach Katalogu)
+            limit: Maksymalna liczba wyników (None = wszystkie)
+            offset: Liczba pominiętych wyników
+
+        Returns:
+            Gry z wyniku (razem z ocenami) lub None, gdy magazyn nie obsługuje zapytań
+        """
+        return None
+    
+    def zamknij(self) -> None:
+        """Zwalnia zasoby magazynu"""
+
+
+class MagazynJSON(Magazyn):
+    """
+    Magazyn w pliku JSON z opcjonalnym dziennikiem zmian.
+
+    W trybie dziennika każda zmiana jest dopisywana (jedna linia JSON) do pliku
+    `<sciezka>.dziennik`. Przy wczytywaniu dziennik jest odtwarzany na pliku
+    katalogu, a po przekroczeniu PROG_KOMPAKTOWANIA scalany z nim.
+
+    Plik z rozszerzeniem .gz lub .xz (np. katalog.json.gz) jest kompresowany
+    przezroczyście (gzip / lzma z biblioteki standardowej); dziennik zostaje
+    zwykłym plikiem tekstowym.
+    """
+    
+    # Rozmiar dziennika (w bajtach), po którym jest on scalany z plikiem katalogu
+    PROG_KOMPAKTOWANIA = 1024 * 1024
+    # Liczba poprzednich wersji pliku katalogu (katalog.json.1 ... katalog.json.N)
+    POKOLENIA = 2
+    
+    def __init__(self, sciezka: str, tryb_dziennika: bool = False,
+                 kompaktowy: Optional[bool] = None):
+        """
+        Args:
+            sciezka: Ścieżka pliku katalogu (.json.gz / .json.xz = plik skompresowany)
+            tryb_dziennika: True = zmiany dopisywane do dziennika
+            kompaktowy: True = JSON bez wcięć i spacji; None = tylko dla
+                        plików skompresowanych (zwykły plik zostaje czytelny)
+        """
+        super().__init__(sciezka)
+        self.tryb_dziennika = tryb_dziennika
+        self.kompresja = KOMPRESJA.get(os.path.splitext(sciezka)[1].lower())
+        self.kompaktowy = self.kompresja is not None if kompaktowy is None else kompaktowy
+        # Numer ostatniej zmiany - pozwala pominąć przy odtwarzaniu wpisy
+        # dziennika, które już trafiły do pliku katalogu (None = nieznany,
+        # dopóki magazyn nie był wczytany - zob. _ustal_nr_zmiany)
+        self._nr_zmiany: Optional[int] = None
+        # Czy koniec dziennika sprawdzono przed pierwszym dopisaniem (zob. _domknij_dziennik)
+        self._dziennik_domkniety = False
+    
+    @property
+    def przyrostowy(self) -> bool:
+        """W trybie dziennika zmiany są dopisywane, bez przepisywania pliku"""
+        return self.tryb_dziennika
+    
+    @property
+    def sciezka_dziennika(self) -> str:
+        """Ścieżka pliku dziennika zmian"""
+        return self.sciezka + ".dziennik"
+    
+    @property
+    def pusty(self) -> bool:
+        """Brak pliku katalogu i dziennika"""
+        return not os.path.exists(self.sciezka) and not os.path.exists(self.sciezka_dziennika)
+    
+    def _ustal_nr_zmiany(self) -> None:
+        """
+        Odczytuje numer ostatniej zmiany z plików przed pierwszym zapisem do
+        niewczytanego magazynu - nowe wpisy dziennika muszą mieć wyższe numery
+        niż plik katalogu i dotychczasowy dziennik
+        """
+        if self._nr_zmiany is not None:
+            return
+        nr = 0
+        if os.path.exists(self.sciezka):
+            migawka = self._strumien_migawki()
+            next(migawka, None)  # Numer zmiany jest znany po odczycie pierwszej gry
+            migawka.close()
+            nr = self._nr_zmiany
+        if os.path.exists(self.sciezka_dziennika):
+            with open(self.sciezka_dziennika, 'r', encoding='utf-8') as f:
+                for linia in f:
+                    try:
+                        nr = max(nr, json.loads(linia)['nr'])
+                    except ValueError:
+                        break  # Urwany ostatni wpis
+        self._nr_zmiany = nr
+    
+    def _domknij_dziennik(self) -> None:
+        """
+        Przygotowuje dziennik do dopisywania po awarii w trakcie zapisu wpisu
+
+        Wpis bez znaku nowej linii na końcu pliku jest kończony, jeśli jest
+        kompletny (przy wczytywaniu został odtworzony), a urwany - obcinany.
+        Inaczej następny wpis zostałby doklejony do tej samej linii i przy
+        odtwarzaniu zginąłby razem z nią.
+        """
+        self._dziennik_domkniety = True
+        try:
+            f = open(self.sciezka_dziennika, 'r+b')
+        except FileNotFoundError:
+            return
+        with f:
+            koniec = f.seek(0, os.SEEK_END)
+            poczatek = koniec
+            while poczatek > 0:
+                krok = min(poczatek, 4096)
+                f.seek(poczatek - krok)
+                blok = f.read(krok)
+                nowa_linia = blok.rfind(b"\n")
+                if nowa_linia >= 0:
+                    poczatek -= krok - nowa_linia - 1
+                    break
+                poczatek -= krok
+            if poczatek == koniec:
+                return
+            f.seek(poczatek)
+            try:
+                json.loads(f.read())
+            except ValueError:
+                f.truncate(poczatek)
+            else:
+                f.write(b"\n")
+    
+    def _zapisz_migawke(self, pozycje: Sequence[Pozycja]) -> None:
+        """Zapisuje pełny stan katalogu do pliku"""
+        if self.kompresja is None:
+            with zapis_atomowy(self.sciezka, 'w', self.POKOLENIA, encoding='utf-8') as f:
+                self._zapisz_json(pozycje, f)
+        else:
+            with zapis_atomowy(self.sciezka, 'wb', self.POKOLENIA) as surowy, \
+                    io.TextIOWrapper(self.kompresja(surowy, 'wb'), encoding='utf-8') as f:
+                self._zapisz_json(pozycje, f)
+    
+    def _zapisz_json(self, pozycje: Sequence[Pozycja], f: TextIO) -> None:
+        """
+        Zapisuje dokument {'nr_zmiany', 'pozycje'} do otwartego pliku
+
+        Zwarty zapis koduje grę po grze i zapisuje je partiami - json.dump
+        wywołuje write() dla każdego fragmentu, co przy strumieniu
+        kompresującym kosztuje więcej niż samo kodowanie.
+        """
+        if not self.kompaktowy:
+            data = {
+                'nr_zmiany': self._nr_zmiany,
+                'pozycje': [p.to_dict() for p in pozycje]
+            }
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            return
+        
+        koduj = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+        f.write(f'{{"nr_zmiany":{self._nr_zmiany},"pozycje":[')
+        partia, separator = [], ''
+        for pozycja in pozycje:
+            partia.append(koduj(pozycja.to_dict()))
+            if len(partia) == 1000:
+                f.write(separator + ','.join(partia))
+                partia, separator = [], ','
+        if partia:
+            f.write(separator + ','.join(partia))
+        f.write(']}')
+    
+    def _tekst(self, surowy: IO[bytes]) -> TextIO:
+        """Nakłada na otwarty binarnie plik katalogu dekompresję (wg rozszerzenia) i UTF-8"""
+        if self.kompresja is not None:
+            surowy = self.kompresja(surowy, 'rb')
+        return io.TextIOWrapper(surowy, encoding='utf-8')
+    
+    def _strumien_migawki(self) -> Iterator[Pozycja]:
+        """
+        Czyta gry z pliku katalogu po jednej
+
+        Numer ostatniej zmiany (zapisany przed tablicą gier) jest ustawiany
+        w self._nr_zmiany przed zwróceniem pierwszej gry.
+        """
+        naglowek = {}
+        with open(self.sciezka, 'rb') as surowy, self._tekst(surowy) as f:
+            elementy = CzytnikJSON(f).elementy('pozycje', naglowek)
+            pierwszy = next(elementy, None)
+            self._nr_zmiany = naglowek.get('nr_zmiany', 0)
+            if pierwszy is None:
+                return
+            for dane in chain((pierwszy,), elementy):
+                yield Pozycja.from_dict(dane)
+    
+    def zapisz(self, pozycje: Sequence[Pozycja]) -> None:
+        """
+        Zapisuje katalog do pliku.
+        Pełny zapis zawiera wszystkie zmiany, więc dziennik zostaje wyczyszczony.
+        """
+        self._ustal_nr_zmiany()
+        self._zapisz_migawke(pozycje)
+        
+        if os.path.exists(self.sciezka_dziennika):
+            os.remove(self.sciezka_dziennika)
+    
+    def zapisz_zmiane(self, rekord: dict, pozycje: Sequence[Pozycja]) -> None:
+        """Dopisuje zmianę do dziennika lub zapisuje cały katalog"""
+        self.zapisz_zmiany([rekord], pozycje)
+    
+    def zapisz_zmiany(self, rekordy: Sequence[dict], pozycje: Sequence[Pozycja]) -> None:
+        """
+        Dopisuje serię zmian do dziennika jednym zapisem lub zapisuje cały katalog
+
+        W trybie dziennika `pozycje` mogą być None - dziennik jest wtedy
+        kompaktowany na podstawie plików (zob. kompaktuj).
+        """
+        if not rekordy:
+            return
+        self._ustal_nr_zmiany()
+        if not self.tryb_dziennika:
+            self._nr_zmiany += len(rekordy)
+            self.zapisz(pozycje)
+            return
+        
+        if not self._dziennik_domkniety:
+            self._domknij_dziennik()
+        linie = []
+        for rekord in rekordy:
+            self._nr_zmiany += 1
+            rekord = {'nr': self._nr_zmiany, **rekord}
+            linie.append(json.dumps(rekord, ensure_ascii=False, separators=(',', ':')) + "\n")
+        with open(self.sciezka_dziennika, 'a', encoding='utf-8') as f:
+            f.write(''.join(linie))
+            rozmiar = f.tell()
+        
+        if rozmiar >= self.PROG_KOMPAKTOWANIA:
+            if pozycje is None:
+                self.kompaktuj()
+            else:
+                self.zapisz(pozycje)
+    
+    def kompaktuj(self) -> None:
+        """
+        Scala dziennik z plikiem katalogu na podstawie samych plików
+
+        Nie korzysta z gier w pamięci, więc może działać w innym wątku
+        niż ten, który zmienia katalog.
+        """
+        pozycje = self.wczytaj()
+        if pozycje is not None:
+            self.zapisz(pozycje)
+    
+    def _odtworz_dziennik(self) -> Tuple[Set[int], Dict[int, Pozycja], Dict[int, List[OcenaGra]]]:
+        """
+        Odczytuje zmiany z dziennika nowsze niż plik katalogu
+
+        Gry z pliku nie są jeszcze wczytane, więc wynikiem jest opis zmian,
+        nakładany na gry w trakcie ich odczytu.
+
+        Returns:
+            (ID gier z pliku usuniętych lub zastąpionych,
+             gry dodane w dzienniku {id: pozycja} w kolejności dodania,
+             oceny dodane grom z pliku {id: [ocena, ...]})
+        """
+        usuniete: Set[int] = set()
+        nowe: Dict[int, Pozycja] = {}
+        oceny: Dict[int, List[OcenaGra]] = {}
+        with open(self.sciezka_dziennika, 'r', encoding='utf-8') as f:
+            for linia in f:
+                try:
+                    rekord = json.loads(linia)
+                except ValueError:
+                    break  # Urwany ostatni wpis (np. awaria w trakcie zapisu)
+                
+                if rekord['nr'] <= self._nr_zmiany:
+                    continue  # Zmiana jest już w pliku katalogu
+                self._nr_zmiany = rekord['nr']
+                
+                if rekord['op'] == 'dodaj':
+                    pozycja = Pozycja.from_dict(rekord['pozycja'])
+                    usuniete.add(pozycja.id)
+                    nowe.pop(pozycja.id, None)
+                    nowe[pozycja.id] = pozycja
+                elif rekord['op'] == 'usun':
+                    usuniete.add(rekord['id'])
+                    nowe.pop(rekord['id'], None)
+                elif rekord['op'] == 'ocena':
+                    ocena = OcenaGra(rekord['wartosc'],
+                                     datetime.fromisoformat(rekord['data_dodania']))
+                    if rekord['id'] in nowe:
+                        nowe[rekord['id']].dodaj_ocene(ocena)
+                    elif rekord['id'] not in usuniete:
+                        oceny.setdefault(rekord['id'], []).append(ocena)
+        return usuniete, nowe, oceny
+    
+    def wczytaj(self) -> Optional[List[Pozycja]]:
+        """Wczytuje plik katalogu i odtwarza zmiany z dziennika"""
+        strumien = self.wczytaj_strumieniowo()
+        return None if strumien is None else list(strumien)
+    
+    def wczytaj_strumieniowo(self) -> Optional[Iterator[Pozycja]]:
+        """Czyta plik katalogu po jednej grze, nakładając zmiany z dziennika"""
+        jest_plik = os.path.exists(self.sciezka)
+        jest_dziennik = os.path.exists(self.sciezka_dziennika)
+        if not jest_plik and not jest_dziennik:
+            return None
+        return self._strumien(jest_plik, jest_dziennik)
+    
+    def _strumien(self, jest_plik: bool, jest_dziennik: bool) -> Iterator[Pozycja]:
+        self._nr_zmiany = 0
+        migawka = self._strumien_migawki() if jest_plik else iter(())
+        if not jest_dziennik:
+            yield from migawka
+            return
+        
+        # Po odczycie pierwszej gry znany jest numer zmiany zapisany w pliku,
+        # od którego zaczyna się odtwarzanie dziennika
+        pierwsza = next(migawka, None)
+        usuniete, nowe, oceny = self._odtworz_dziennik()
+        for pozycja in chain(() if pierwsza is None else (pierwsza,), migawka):
+            if pozycja.id in usuniete:
+                continue
+            for ocena in oceny.get(pozycja.id, ()):
+                pozycja.dodaj_ocene(ocena)
+            yield pozycja
+        yield from nowe.values()
+
+
+class MagazynBinarny(MagazynJSON):
+    """
+    Magazyn w zwartym formacie binarnym (szybki odczyt dużych katalogów).
+
+    Układ pliku (little-endian):
+        b'KGB1', nr_zmiany (q)
+        tablica napisów: liczba (I), napisy (I długość + UTF-8)
+        liczba gier (I), dla każdej gry:
+            id (q), rok (i), tytuł (I długość + UTF-8),
+            wydawca (I indeks), gatunek (I indeks), liczba ocen (I),
+            wartości ocen (n × b), daty ocen (n × q, mikrosekundy od modele.EPOKA)
+
+    Wydawcy i gatunki powtarzają się, więc trafiają do tablicy napisów.
+    Daty ocen ze strefą czasową zapisywane są w czasie lokalnym (bez strefy).
+    Dziennik zmian działa tak samo jak w MagazynJSON.
+    """
+    
+    SYGNATURA = b'KGB1'
+    
+    @staticmethod
+    def _do_bajtow(tablica: array) -> bytes:
+        """Zwraca zawartość tablicy w kolejności little-endian"""
+        if sys.byteorder == 'big':
+            tablica = array(tablica.typecode, tablica)
+            tablica.byteswap()
+        return tablica.tobytes()
+    
+    @staticmethod
+    def _z_bajtow(typ: str, dane) -> array:
+        """Tworzy tablicę z bajtów zapisanych jako little-endian"""
+        tablica = array(typ)
+        tablica.frombytes(dane)
+        if sys.byteorder == 'big':
+            tablica.byteswap()
+        return tablica
+    
+    def _zapisz_migawke(self, pozycje: Sequence[Pozycja]) -> None:
+        """Zapisuje pełny stan katalogu w formacie binarnym"""
+        napisy: Dict[str, int] = {}
+        for p in pozycje:
+            napisy.setdefault(p.wydawca, len(napisy))
+            napisy.setdefault(p.gatunek, len(napisy))
+        
+        czesci = [self.SYGNATURA, struct.pack('<qI', self._nr_zmiany, len(napisy))]
+        for napis in napisy:
+            dane = napis.encode('utf-8')
+            czesci.append(struct.pack('<I', len(dane)))
+            czesci.append(dane)
+        
+        czesci.append(struct.pack('<I', len(pozycje)))
+        for p in pozycje:
+            tytul = p.tytul.encode('utf-8')
+            czesci.append(struct.pack('<qiI', p.id, p.rok, len(tytul)))
+            czesci.append(tytul)
+            # Zapis w tle: oceny dopisywane w trakcie zapisu (najpierw wartość,
+            # potem data) są pomijane - liczba ocen brana jest z tablicy dat
+            liczba_ocen = len(p.oceny.daty)
+            czesci.append(struct.pack('<III', napisy[p.wydawca], napisy[p.gatunek], liczba_ocen))
+            czesci.append(self._do_bajtow(p.oceny.wartosci[:liczba_ocen]))
+            czesci.append(self._do_bajtow(p.oceny.daty[:liczba_ocen]))
+        
+        with zapis_atomowy(self.sciezka, 'wb', self.POKOLENIA) as f:
+            f.write(b''.join(czesci))
+    
+    def _wczytaj_migawke(self) -> Tuple[List[Pozycja], int]:
+        """Wczytuje pełny stan katalogu z pliku binarnego"""
+        with open(self.sciezka, 'rb') as f:
+            dane = memoryview(f.read())
+        
+        if bytes(dane[:4]) != self.SYGNATURA:
+            raise ValueError(f"{self.sciezka} nie jest plikiem katalogu binarnego")
+        nr_zmiany, liczba_napisow = struct.unpack_from('<qI', dane, 4)
+        poz = 16
+        
+        napisy = []
+        for _ in range(liczba_napisow):
+            (dlugosc,) = struct.unpack_from('<I', dane, poz)
+            poz += 4
+            napisy.append(str(dane[poz:poz + dlugosc], 'utf-8'))
+            poz += dlugosc
+        
+        (liczba_gier,) = struct.unpack_from('<I', dane, poz)
+        poz += 4
+        pozycje = []
+        for _ in range(liczba_gier):
+            id, rok, dlugosc = struct.unpack_from('<qiI', dane, poz)
+            poz += 16
+            tytul = str(dane[poz:poz + dlugosc], 'utf-8')
+            poz += dlugosc
+            wydawca, gatunek, liczba_ocen = struct.unpack_from('<III', dane, poz)
+            poz += 12
+            
+            pozycja = Pozycja(id, tytul, napisy[wydawca], napisy[gatunek], rok)
+            wartosci = self._z_bajtow('b', dane[poz:poz + liczba_ocen])
+            poz += liczba_ocen
+            daty = self._z_bajtow('q', dane[poz:poz + 8 * liczba_ocen])
+            poz += 8 * liczba_ocen
+            # Agregaty ocen zostaną przeliczone przy pierwszym odczycie
+            pozycja.oceny = KolumnyOcen.z_tablic(wartosci, daty)
+            pozycje.append(pozycja)
+        
+        return pozycje, nr_zmiany
+    
+    def _strumien_migawki(self) -> Iterator[Pozycja]:
+        """Plik binarny jest zwarty - wczytywany w całości, gry zwracane po jednej"""
+        pozycje, self._nr_zmiany = self._wczytaj_migawke()
+        yield from pozycje
+
+
+class MagazynSQLite(Magazyn):
+    """
+    Magazyn w bazie SQLite (tryb WAL).
+    Każda zmiana to pojedyncza transakcja. Wczytany katalog odpowiada na
+    zapytania z indeksów w pamięci; bazę zbyt dużą, by ją wczytać, można
+    przeszukiwać, filtrować i sortować w SQL metodą zapytaj(), która
+    wczytuje tylko gry z żądanej strony wyników.
+    """
+    
+    SCHEMAT = """
+        CREATE TABLE IF NOT EXISTS gry (
+            id       INTEGER NOT NULL UNIQUE,
+            tytul    TEXT NOT NULL,
+            wydawca  TEXT NOT NULL,
+            gatunek  TEXT NOT NULL,
+            rok      INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS oceny (
+            gra_id        INTEGER NOT NULL REFERENCES gry(id) ON DELETE CASCADE,
+            wartosc       INTEGER NOT NULL,
+            data_dodania  TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_gry_gatunek ON gry(gatunek);
+        CREATE INDEX IF NOT EXISTS idx_gry_rok ON gry(rok);
+        CREATE INDEX IF NOT EXISTS idx_gry_tytul ON gry(tytul);
+        CREATE INDEX IF NOT EXISTS idx_oceny_gra ON oceny(gra_id);
+    """
+    
+    # Maksymalna liczba parametrów jednego zapytania (limit starszych wersji SQLite)
+    MAKS_PARAMETROW = 900
+    
+    przyrostowy = True
+    
+    def __init__(self, sciezka: str):
+        """
+        Args:
+            sciezka: Ścieżka pliku bazy danych
+        """
+        super().__init__(sciezka)
+        self._nowa_baza = not os.path.exists(sciezka)
+        self._polaczenie: Optional[sqlite3.Connection] = None
+        # Połączenie jest współdzielone przez wątki (zapis w tle, katalog
+        # wielowątkowy) - każde jego użycie odbywa się pod tą blokadą
+        self._blokada = threading.RLock()
+    
+    @property
+    def polaczenie(self) -> sqlite3.Connection:
+        """Połączenie z bazą (otwierane przy pierwszym użyciu; używać pod self._blokada)"""
+        if self._polaczenie is None:
+            # Połączenie używane także w wątku MagazynWTle - dostęp chroni self._blokada
+            self._polaczenie = sqlite3.connect(self.sciezka, check_same_thread=False)
+            self._polaczenie.execute("PRAGMA journal_mode=WAL")
+            self._polaczenie.execute("PRAGMA foreign_keys=ON")
+            # lower() w SQLite zmienia tylko litery ASCII - używamy Pythonowego,
+            # aby wyszukiwanie działało tak samo jak w pamięci ("Ź" -> "ź")
+            self._polaczenie.create_function("py_lower", 1, str.lower, deterministic=True)
+            self._polaczenie.executescript(self.SCHEMAT)
+        return self._polaczenie
+    
+    @property
+    def pusty(self) -> bool:
+        """Baza jeszcze nie istnieje"""
+        return self._nowa_baza
+    
+    @staticmethod
+    def _wiersz_gry(pozycja: Pozycja) -> tuple:
+        return (pozycja.id, pozycja.tytul, pozycja.wydawca, pozycja.gatunek, pozycja.rok)
+    
+    @staticmethod
+    def _wiersze_ocen(pozycja: Pozycja) -> List[tuple]:
+        # pary(): tylko oceny kompletne (zapis w tle)
+        return [(pozycja.id, w, d.isoformat()) for w, d in pozycja.oceny.pary()]
+    
+    def wczytaj(self) -> Optional[List[Pozycja]]:
+        """Wczytuje wszystkie gry z bazy (w kolejności dodania)"""
+        if self._nowa_baza:
+            return None
+        
+        pozycje: Dict[int, Pozycja] = {}
+        with self._blokada:
+            for id, tytul, wydawca, gatunek, rok in self.polaczenie.execute(
+                    "SELECT id, tytul, wydawca, gatunek, rok FROM gry ORDER BY rowid"):
+                pozycje[id] = Pozycja(id, tytul, wydawca, gatunek, rok)
+            
+            for gra_id, wartosc, data_dodania in self.polaczenie.execute(
+                    "SELECT gra_id, wartosc, data_dodania FROM oceny ORDER BY rowid"):
+                pozycje[gra_id].dodaj_ocene(OcenaGra(wartosc, datetime.fromisoformat(data_dodania)))
+        
+        return list(pozycje.values())
+    
+    def zapisz(self, pozycje: Sequence[Pozycja]) -> None:
+        """Zastępuje zawartość bazy pełnym stanem katalogu (jedna transakcja)"""
+        with self._blokada, self.polaczenie as db:
+            db.execute("DELETE FROM oceny")
+            db.execute("DELETE FROM gry")
+            db.executemany("INSERT INTO gry VALUES (?, ?, ?, ?, ?)",
+                           [self._wiersz_gry(p) for p in pozycje])
+            db.executemany("INSERT INTO oceny VALUES (?, ?, ?)",
+                           [w for p in pozycje for w in self._wiersze_ocen(p)])
+        self._nowa_baza = False
+    
+    def zapisz_zmiane(self, rekord: dict, pozycje: Sequence[Pozycja]) -> None:
+        """Wykonuje zmianę jako pojedynczą transakcję w bazie"""
+        self.zapisz_zmiany([rekord], pozycje)
+    
+    def zapisz_zmiany(self, rekordy: Sequence[dict], pozycje: Sequence[Pozycja]) -> None:
+        """Wykonuje serię zmian w jednej transakcji w bazie"""
+        with self._blokada, self.polaczenie as db:
+            for rekord in rekordy:
+                if rekord['op'] == 'dodaj':
+                    pozycja = Pozycja.from_dict(rekord['pozycja'])
+                    db.execute("INSERT INTO gry VALUES (?, ?, ?, ?, ?)", self._wiersz_gry(pozycja))
+                    db.executemany("INSERT INTO oceny VALUES (?, ?, ?)",
+                                   self._wiersze_ocen(pozycja))
+                elif rekord['op'] == 'usun':
+                    db.execute("DELETE FROM oceny WHERE gra_id = ?", (rekord['id'],))
+                    db.execute("DELETE FROM gry WHERE id = ?", (rekord['id'],))
+                elif rekord['op'] == 'ocena':
+                    db.execute("INSERT INTO oceny VALUES (?, ?, ?)",
+                               (rekord['id'], rekord['wartosc'], rekord['data_dodania']))
+        self._nowa_baza = False
+    
+    def zapytaj(self, zapytanie: str, *argumenty, limit: Optional[int] = None,
+                offset: int = 0) -> Optional[List[Pozycja]]:
+        """Wykonuje wyszukiwanie, filtrowanie lub sortowanie w SQL (indeksy bazy)"""
+        if zapytanie == 'wyszukaj':
+            (fraza,) = argumenty
+            sql = "SELECT * FROM gry WHERE instr(py_lower(tytul), ?) > 0 ORDER BY rowid"
+            parametry: tuple = (fraza.lower(),)
+        elif zapytanie == 'gatunek':
+            sql = "SELECT * FROM gry WHERE gatunek = ? ORDER BY rowid"
+            parametry = tuple(argumenty)
+        elif zapytanie == 'rok':
+            sql = "SELECT * FROM gry WHERE rok BETWEEN ? AND ? ORDER BY rowid"
+            parametry = tuple(argumenty)
+        elif zapytanie == 'sortuj':
+            (malejaco,) = argumenty
+            # Gry bez ocen na końcu; przy równych średnich zachowana kolejność dodania
+            sql = f"""
+                SELECT g.* FROM gry g
+                LEFT JOIN (SELECT gra_id, AVG(wartosc) AS srednia
+                           FROM oceny GROUP BY gra_id) o ON o.gra_id = g.id
+                ORDER BY o.srednia IS NULL, o.srednia {'DESC' if malejaco else 'ASC'}, g.rowid
+            """
+            parametry = ()
+        else:
+            return None
+        if self._nowa_baza:
+            return []
+        
+        # LIMIT -1 = bez limitu
+        sql += " LIMIT ? OFFSET ?"
+        parametry += (-1 if limit is None else limit, offset)
+        with self._blokada:
+            pozycje = {wiersz[0]: Pozycja(*wiersz)
+                       for wiersz in self.polaczenie.execute(sql, parametry)}
+            ids = list(pozycje)
+            for poczatek in range(0, len(ids), self.MAKS_PARAMETROW):
+                czesc = ids[poczatek:poczatek + self.MAKS_PARAMETROW]
+                for gra_id, wartosc, data_dodania in self.polaczenie.execute(
+                        f"SELECT gra_id, wartosc, data_dodania FROM oceny "
+                        f"WHERE gra_id IN ({', '.join('?' * len(czesc))}) ORDER BY rowid", czesc):
+                    pozycje[gra_id].dodaj_ocene(
+                        OcenaGra(wartosc, datetime.fromisoformat(data_dodania)))
+        return list(pozycje.values())
+    
+    def zamknij(self) -> None:
+        """Zamyka połączenie z bazą"""
+        with self._blokada:
+            if self._polaczenie is not None:
+                self._polaczenie.close()
+                self._polaczenie = None
+
+
+class MagazynWTle(Magazyn):
+    """
+    Zapis w tle: opakowuje inny magazyn i utrwala zmiany w wątku roboczym.
+
+    Zmiany trafiają do kolejki, a wątek zapisuje je jednym zapisem dopiero
+    po `opoznienie` sekundach bez nowych zmian (seria kliknięć = jeden zapis).
+    Magazyny przyrostowe dostają tylko opisy zmian; pozostałe także migawkę
+    listy gier z chwili ostatniej zmiany (widok kopiowany przy zapisie).
+    Rekordy zmian są serializowane w wątku wywołującym. Oceny gier z migawki
+    są wyłącznie dopisywane (wartość, potem data), a zapis czyta tylko oceny
+    z datą, kopiując każdą tablicę jednym krokiem - zapis w tle może najwyżej
+    uwzględnić oceny nowsze niż migawka (trafią one do magazynu i tak, razem
+    z kolejną zmianą). Dziennik jest w tym trybie
+    kompaktowany na podstawie plików, a nie gier z pamięci.
+
+    Pełny zapis (zapisz), odczyt i zamknij najpierw czekają na opróżnienie
+    kolejki i działają synchronicznie.
+    """
+    
+    # Zmiany czekające dłużej niż tyle opóźnień są zapisywane mimo trwającej serii
+    MAKS_OPOZNIEN = 10
+    
+    def __init__(self, magazyn: Magazyn, opoznienie: float = 1.0):
+        """
+        Args:
+            magazyn: Magazyn, do którego trafiają zmiany
+            opoznienie: Czas bez nowych zmian (w sekundach), po którym są zapisywane
+        """
+        super().__init__(magazyn.sciezka)
+        self.magazyn = magazyn
+        self.opoznienie = opoznienie
+        self._warunek = threading.Condition()
+        # Tylko jeden zapis do magazynu naraz (wątek roboczy lub pełny zapis)
+        self._blokada_zapisu = threading.Lock()
+        self._rekordy: List[dict] = []
+        self._migawka: Optional[Sequence[Pozycja]] = None
+        self._pierwsza_zmiana = 0.0
+        self._ostatnia_zmiana = 0.0
+        self._w_toku = False
+        self._natychmiast = False
+        self._koniec = False
+        self._blad: Optional[Exception] = None
+        self._watek = threading.Thread(target=self._petla, name="MagazynWTle", daemon=True)
+        self._watek.start()
+    
+    def __getattr__(self, nazwa: str):
+        # Pozostałe atrybuty (np. tryb_dziennika) pochodzą z opakowanego magazynu
+        if nazwa == 'magazyn':
+            raise AttributeError(nazwa)
+        return getattr(self.magazyn, nazwa)
+    
+    @property
+    def przyrostowy(self) -> bool:
+        return self.magazyn.przyrostowy
+    
+    @property
+    def pusty(self) -> bool:
+        # Zmiany z kolejki nie są jeszcze w opakowanym magazynie
+        with self._warunek:
+            if self._rekordy or self._w_toku:
+                return False
+        return self.magazyn.pusty
+    
+    # =========================================================================
+    # API MAGAZYNU
+    # =========================================================================
+    
+    def wczytaj(self) -> Optional[List[Pozycja]]:
+        self.oproznij()
+        with self._blokada_zapisu:
+            return self.magazyn.wczytaj()
+    
+    def wczytaj_strumieniowo(self) -> Optional[Iterator[Pozycja]]:
+        self.oproznij()
+        return self.magazyn.wczytaj_strumieniowo()
+    
+    def zapisz(self, pozycje: Sequence[Pozycja]) -> None:
+        """Zapisuje pełny stan katalogu synchronicznie (po zapisaniu kolejki)"""
+        self.oproznij()
+        with self._blokada_zapisu:
+            self.magazyn.zapisz(pozycje)
+    
+    def zapisz_zmiane(self, rekord: dict, pozycje: Sequence[Pozycja]) -> None:
+        self.zapisz_zmiany([rekord], pozycje)
+    
+    def zapisz_zmiany(self, rekordy: Sequence[dict], pozycje: Sequence[Pozycja]) -> None:
+        """Dodaje zmiany do kolejki (zapis w tle po ustaniu serii zmian)"""
+        if not rekordy:
+            return
+        migawka = None
+        if not self.magazyn.przyrostowy:
+            # Lista katalogu daje migawkę bez kopiowania (Katalog.migawka)
+            utworz = getattr(pozycje, 'migawka', None)
+            migawka = utworz() if utworz is not None else list(pozycje)
+        with self._warunek:
+            if self._koniec:
+                raise RuntimeError("Magazyn został zamknięty")
+            teraz = time.monotonic()
+            if not self._rekordy:
+                self._pierwsza_zmiana = teraz
+            self._ostatnia_zmiana = teraz
+            self._rekordy.extend(rekordy)
+            self._migawka = migawka
+            self._warunek.notify_all()
+    
+    def zapytaj(self, zapytanie: str, *argumenty, limit: Optional[int] = None,
+                offset: int = 0) -> Optional[List[Pozycja]]:
+        """Zapytanie do opakowanego magazynu po zapisaniu zmian z kolejki"""
+        self.oproznij()
+        return self.magazyn.zapytaj(zapytanie, *argumenty, limit=limit, offset=offset)
+    
+    def oproznij(self) -> None:
+        """
+        Czeka, aż wszystkie zmiany z kolejki zostaną zapisane (bez opóźnienia)
+
+        Raises:
+            Exception: Błąd ostatniego zapisu w tle (zmiany pozostają w kolejce)
+        """
+        with self._warunek:
+            # Liczy się wynik zapisu rozpoczętego już po wywołaniu oproznij
+            while self._w_toku:
+                self._warunek.wait()
+            self._blad = None
+            self._natychmiast = True
+            self._warunek.notify_all()
+            while (self._rekordy or self._w_toku) and self._blad is None:
+                self._warunek.wait()
+            self._natychmiast = False
+            blad, self._blad = self._blad, None
+        if blad is not None:
+            raise blad
+    
+    def zamknij(self) -> None:
+        """Zapisuje kolejkę, kończy wątek roboczy i zamyka opakowany magazyn"""
+        try:
+            self.oproznij()
+        finally:
+            with self._warunek:
+                self._koniec = True
+                self._warunek.notify_all()
+            self._watek.join()
+            self.magazyn.zamknij()
+    
+    # =========================================================================
+    # WĄTEK ROBOCZY
+    # =========================================================================
+    
+    def _termin(self) -> float:
+        """Chwila, w której odłożone zmiany powinny zostać zapisane"""
+        if self._natychmiast or self._koniec:
+            return 0.0
+        return min(self._ostatnia_zmiana + self.opoznienie,
+                   self._pierwsza_zmiana + self.MAKS_OPOZNIEN * self.opoznienie)
+    
+    def _petla(self) -> None:
+        while True:
+            with self._warunek:
+                while not self._rekordy and not self._koniec:
+                    self._warunek.wait()
+                if not self._rekordy:
+                    return
+                while True:
+                    pozostalo = self._termin() - time.monotonic()
+                    if pozostalo <= 0:
+                        break
+                    self._warunek.wait(pozostalo)
+                rekordy, self._rekordy = self._rekordy, []
+                migawka, self._migawka = self._migawka, None
+                self._w_toku = True
+            
+            blad = None
+            try:
+                with self._blokada_zapisu:
+                    self.magazyn.zapisz_zmiany(rekordy, migawka)
+            except Exception as e:
+                print(f"Błąd zapisu w tle: {e}")
+                blad = e
+            
+            with self._warunek:
+                self._w_toku = False
+                self._blad = blad
+                if blad is not None:
+                    # Ponowna próba razem z następną serią zmian
+                    self._rekordy[:0] = rekordy
+                    if self._migawka is None:
+                        self._migawka = migawka
+                    self._pierwsza_zmiana = self._ostatnia_zmiana = time.monotonic()
+                    # Oczekujący oproznij dostaje błąd; następna próba po opóźnieniu
+                    self._natychmiast = False
+                self._warunek.notify_all()
+                if blad is not None and self._koniec:
+                    return  # Przy zamykaniu jedna nieudana próba kończy wątek (bez pętli ponowień)
+
+
+def utworz_magazyn(sciezka: str, tryb_dziennika: bool = False,
+                   zapis_w_tle: Optional[float] = None) -> Magazyn:
+    """
+    Tworzy magazyn odpowiedni dla rozszerzenia pliku
+
+    Args:
+        sciezka: Ścieżka pliku (.db/.sqlite/.sqlite3 = SQLite,
+                 .bin = format binarny, .json.gz/.json.xz = skompresowany JSON,
+                 pozostałe = JSON)
+        tryb_dziennika: Tryb dziennika dla magazynów plikowych
+        zapis_w_tle: Opóźnienie zapisu w tle w sekundach (None = zapis od razu)
+
+    Returns:
+        Obiekt magazynu
+    """
+    if sciezka.lower().endswith(('.db', '.sqlite', '.sqlite3')):
+        magazyn = MagazynSQLite(sciezka)
+    elif sciezka.lower().endswith('.bin'):
+        magazyn = MagazynBinarny(sciezka, tryb_dziennika)
+    else:
+        magazyn = MagazynJSON(sciezka, tryb_dziennika)
+    if zapis_w_tle is not None:
+        magazyn = MagazynWTle(magazyn, zapis_w_tle)
+    return magazyn
+
+
+def konwertuj(sciezka_zrodla: str, sciezka_celu: str) -> int:
+    """
+    Przenosi katalog między formatami (np. katalog.json -> katalog.db i z powrotem)
+
+    Args:
+        sciezka_zrodla: Plik źródłowy
+        sciezka_celu: Plik docelowy (format wybierany po rozszerzeniu)
+
+    Returns:
+        Liczba przeniesionych gier
+    """
+    zrodlo = utworz_magazyn(sciezka_zrodla)
+    cel = utworz_magazyn(sciezka_celu)
+    try:
+        pozycje = zrodlo.wczytaj() or []
+        cel.zapisz(pozycje)
+        return len(pozycje)
+    finally:
+        zrodlo.zamknij()
+        cel.zamknij()
@@ -6,11 +6,12 @@ OPIS: Główne okno aplikacji Katalog Gier
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox, font
-from typing import Optional, List
+from tkinter import ttk, messagebox, font, filedialog
+from typing import Optional, Sequence
 from katalog import Katalog
-from modele import Pozycja
+from modele import Pozycja, GWIAZDKI, gwiazdki
 from dialogi import *
+from widzety import ListaWirtualna
 
 
 class MainWindow:
@@ -36,16 +37,17 @@ class MainWindow:
     def __init__(self, root: tk.Tk):
         """Konstruktor głównego okna"""
         self.root = root
-        self.katalog = Katalog()
-        self.katalog.wczytaj()
+        # Zmiany zapisywane w tle, seria kliknięć = jeden zapis
+        self.katalog = Katalog(tryb_dziennika=True, zapis_w_tle=1.0)
+        # Katalog wczytywany partiami w tle pętli zdarzeń (None = wczytany)
+        try:
+            self.wczytywanie = self.katalog.wczytuj_partiami()
+        except Exception as e:
+            print(f"Błąd wczytywania: {e}")
+            self.wczytywanie = None
         
         # Lista aktualnie wyświetlanych pozycji (może być przefiltrowana)
-        self.aktualne_pozycje: List[Pozycja] = []
-        
-        # Automatyczne ładowanie przykładowych gier przy pierwszym uruchomieniu
-        if self.katalog.liczba_gier() == 0:
-            self.katalog.dodaj_dane_testowe()
-            self.katalog.zapisz()
+        self.aktualne_pozycje: Sequence[Pozycja] = ()
         
         # Konfiguracja okna
         self.root.title("🎮 Katalog Gier")
@@ -70,8 +72,13 @@ class MainWindow:
         # Stwórz interfejs
         self.stworz_interface()
         
-        # Odśwież listę
-        self.odswiez_liste()
+        # Pierwsza partia gier od razu, reszta w kolejnych obiegach pętli zdarzeń
+        if self.wczytywanie is not None:
+            for przycisk in self.przyciski:
+                przycisk.config(state=tk.DISABLED)
+            self.wczytaj_partie()
+        else:
+            self.zakoncz_wczytywanie()
         
         # Bind resize event
         self.root.bind('<Configure>', self.on_window_resize)
@@ -144,9 +151,12 @@ class MainWindow:
             ("🎭 Filtruj", self.filtruj, self.COLORS['purple']),
             ("🔽 Sortuj", self.sortuj, self.COLORS['warning']),
             ("📊 Statystyki", self.pokaz_statystyki, self.COLORS['info']),
+            ("📥 Importuj", self.importuj, self.COLORS['success']),
+            ("📤 Eksportuj", self.eksportuj, self.COLORS['purple']),
             ("🔄 Odśwież", self.odswiez_liste, self.COLORS['bg_light']),
         ]
         
+        self.przyciski = []
         for text, command, color in buttons:
             btn = tk.Button(
                 left_frame,
@@ -161,6 +171,7 @@ class MainWindow:
                 pady=8  # Zmniejszone z 12 na 8
             )
             btn.pack(pady=4, padx=10)  # Zmniejszone z 6 na 4
+            self.przyciski.append(btn)
             
             # Zapisz oryginalny kolor
             btn.original_color = color
@@ -217,30 +228,18 @@ class MainWindow:
         )
         self.label_licznik.pack(side=tk.RIGHT, padx=15)
         
-        # Lista z scrollbar
-        list_container = tk.Frame(middle_frame, bg=self.COLORS['bg_medium'])
-        list_container.pack(fill=tk.BOTH, expand=True, pady=10, padx=10)
-        
-        scrollbar = tk.Scrollbar(list_container, bg=self.COLORS['bg_medium'])
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        self.listbox_gry = tk.Listbox(
-            list_container,
+        # Lista wirtualna - rysuje i formatuje tylko widoczne wiersze
+        self.lista_gier = ListaWirtualna(
+            middle_frame,
+            formatuj=str,
             font=self.font_text,  # Większa czcionka (11pt)
-            yscrollcommand=scrollbar.set,
-            selectmode=tk.SINGLE,
             bg=self.COLORS['bg_light'],
             fg=self.COLORS['text'],
             selectbackground=self.COLORS['accent'],
-            selectforeground='white',
-            relief=tk.FLAT,
-            highlightthickness=0,
-            borderwidth=0
+            selectforeground='white'
         )
-        self.listbox_gry.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        self.listbox_gry.bind('<<ListboxSelect>>', self.on_selection_changed)
-        
-        scrollbar.config(command=self.listbox_gry.yview)
+        self.lista_gier.pack(fill=tk.BOTH, expand=True, pady=10, padx=10)
+        self.lista_gier.bind('<<ListboxSelect>>', self.on_selection_changed)
         
         # PRAWY PANEL - SZCZEGÓŁY
         right_frame = tk.Frame(
@@ -270,7 +269,7 @@ class MainWindow:
         # Gwiazdki
         self.label_gwiazdki = tk.Label(
             details_container,
-            text="☆☆☆☆☆",
+            text=GWIAZDKI[0],
             font=self.font_star,
             bg=self.COLORS['bg_medium'],
             fg=self.COLORS['star']
@@ -360,16 +359,45 @@ class MainWindow:
     # METODY INTERFEJSU
     
     def odswiez_liste(self):  # AY
-        """Odświeża listę gier"""
-        self.listbox_gry.delete(0, tk.END)
-        
-        pozycje = self.katalog.pobierz_wszystkie()
+        """Odświeża listę gier (migawka katalogu - bez kopiowania listy)"""
+        self.pokaz_pozycje(self.katalog.migawka())
+    
+    def pokaz_pozycje(self, pozycje: Sequence[Pozycja], zachowaj_widok: bool = False):
+        """Wyświetla podane gry na liście (wiersze formatowane dopiero przy rysowaniu)"""
         self.aktualne_pozycje = pozycje  # Zapisz aktualnie wyświetlane
+        self.lista_gier.ustaw(pozycje, zachowaj_widok)
+        self.label_licznik.config(text=f"{len(pozycje)} gier")
+    
+    def wczytaj_partie(self):
+        """Dodaje do listy kolejną wczytaną partię gier i planuje następną"""
+        try:
+            wczytane = next(self.wczytywanie, None)
+        except Exception as e:
+            messagebox.showerror("❌ Błąd wczytywania", f"Nie udało się wczytać katalogu:\n{e}")
+            wczytane = None
         
-        for pozycja in pozycje:
-            self.listbox_gry.insert(tk.END, str(pozycja))
+        if wczytane is None:
+            self.zakoncz_wczytywanie()
+            return
         
-        self.label_licznik.config(text=f"{len(pozycje)} gier")
+        # Wczytane gry są dopisywane na końcu - migawka niczego nie kopiuje
+        self.pokaz_pozycje(self.katalog.migawka(), zachowaj_widok=True)
+        self.label_licznik.config(text=f"{wczytane} gier (wczytywanie...)")
+        self.root.after(1, self.wczytaj_partie)
+    
+    def zakoncz_wczytywanie(self):
+        """Odblokowuje przyciski po wczytaniu katalogu"""
+        self.wczytywanie = None
+        
+        # Automatyczne ładowanie przykładowych gier przy pierwszym uruchomieniu
+        if self.katalog.liczba_gier() == 0:
+            with self.katalog.transakcja():
+                self.katalog.dodaj_dane_testowe()
+            self.katalog.zapisz()
+        
+        for przycisk in self.przyciski:
+            przycisk.config(state=tk.NORMAL)
+        self.pokaz_pozycje(self.katalog.migawka(), zachowaj_widok=True)
     
     def wyswietl_szczegoly(self, pozycja: Optional[Pozycja]):  # AY
         """Wyświetla szczegóły wybranej gry"""
@@ -387,13 +415,10 @@ class MainWindow:
             self.label_oceny.config(text=oceny_str)
             
             srednia = pozycja.srednia_ocena()
-            pelne = round(srednia / 2.0)
-            puste = 5 - pelne
-            gwiazdki = "★" * pelne + "☆" * puste
-            self.label_gwiazdki.config(text=f"{gwiazdki}\n{srednia:.1f}/10")
+            self.label_gwiazdki.config(text=f"{gwiazdki(srednia)}\n{srednia:.1f}/10")
         else:
             self.label_oceny.config(text="Brak ocen")
-            self.label_gwiazdki.config(text="☆☆☆☆☆\nBrak ocen")
+            self.label_gwiazdki.config(text=f"{GWIAZDKI[0]}\nBrak ocen")
     
     def wyczysc_szczegoly(self):
         """Czyści panel szczegółów"""
@@ -402,11 +427,11 @@ class MainWindow:
         self.label_gatunek.config(text="-")
         self.label_rok.config(text="-")
         self.label_oceny.config(text="-")
-        self.label_gwiazdki.config(text="☆☆☆☆☆")
+        self.label_gwiazdki.config(text=GWIAZDKI[0])
     
     def pobierz_wybrana_pozycje(self) -> Optional[Pozycja]:  # AY
         """Zwraca aktualnie wybraną grę z listy"""
-        selection = self.listbox_gry.curselection()
+        selection = self.lista_gier.curselection()
         if not selection:
             return None
         
@@ -462,7 +487,7 @@ class MainWindow:
             return
         
         # Zapamiętaj indeks przed odświeżeniem
-        selection = self.listbox_gry.curselection()
+        selection = self.lista_gier.curselection()
         selected_index = selection[0] if selection else None
         
         dialog = DodajOceneDialog(self.root, pozycja.tytul)
@@ -473,9 +498,9 @@ class MainWindow:
             self.odswiez_liste()
             
             # Przywróć zaznaczenie
-            if selected_index is not None and selected_index < self.listbox_gry.size():
-                self.listbox_gry.selection_set(selected_index)
-                self.listbox_gry.see(selected_index)
+            if selected_index is not None and selected_index < self.lista_gier.size():
+                self.lista_gier.selection_set(selected_index)
+                self.lista_gier.see(selected_index)
             
             self.wyswietl_szczegoly(self.pobierz_wybrana_pozycje())
             messagebox.showinfo("✅ Sukces", f"Dodano ocenę: {ocena}/10 ⭐")
@@ -488,13 +513,7 @@ class MainWindow:
             fraza = dialog.result
             wyniki = self.katalog.wyszukaj(fraza)
             
-            self.aktualne_pozycje = wyniki  # Zapisz wyniki wyszukiwania
-            
-            self.listbox_gry.delete(0, tk.END)
-            for pozycja in wyniki:
-                self.listbox_gry.insert(tk.END, str(pozycja))
-            
-            self.label_licznik.config(text=f"{len(wyniki)} gier")
+            self.pokaz_pozycje(wyniki)  # Zapisz wyniki wyszukiwania
             
             if not wyniki:
                 messagebox.showinfo("🔍 Wynik", f"Nie znaleziono:\n'{fraza}'")
@@ -508,13 +527,7 @@ class MainWindow:
         if dialog.result:
             wyniki = dialog.result
             
-            self.aktualne_pozycje = wyniki  # Zapisz wyniki filtrowania
-            
-            self.listbox_gry.delete(0, tk.END)
-            for pozycja in wyniki:
-                self.listbox_gry.insert(tk.END, str(pozycja))
-            
-            self.label_licznik.config(text=f"{len(wyniki)} gier")
+            self.pokaz_pozycje(wyniki)  # Zapisz wyniki filtrowania
             messagebox.showinfo("🎭 Wynik", f"Znaleziono: {len(wyniki)} gier")
     
     def sortuj(self):  # AY
@@ -529,11 +542,7 @@ class MainWindow:
             malejaco = dialog.result
             posortowane = self.katalog.sortuj_po_ocenie(malejaco)
             
-            self.aktualne_pozycje = posortowane  # Zapisz posortowane wyniki
-            
-            self.listbox_gry.delete(0, tk.END)
-            for pozycja in posortowane:
-                self.listbox_gry.insert(tk.END, str(pozycja))
+            self.pokaz_pozycje(posortowane)  # Zapisz posortowane wyniki
             
             kierunek = "najlepszej do najgorszej" if malejaco else "najgorszej do najlepszej"
             messagebox.showinfo("🔽 Posortowano", f"Gry posortowane od {kierunek}!")
@@ -542,16 +551,81 @@ class MainWindow:
         """Wyświetla okno ze statystykami"""
         StatystykiDialog(self.root, self.katalog)
     
-    def on_closing(self):
-        """Obsługuje zamykanie aplikacji"""
-        self.katalog.zapisz()
+    def importuj(self):
+        """Importuje gry z pliku CSV lub JSON Lines"""
+        sciezka = filedialog.askopenfilename(
+            parent=self.root,
+            title="📥 Importuj gry",
+            filetypes=[("CSV / JSON Lines", "*.csv *.jsonl"), ("Wszystkie pliki", "*.*")]
+        )
+        if not sciezka:
+            return
         
-        odpowiedz = messagebox.askyesno(
-            "❓ Zamknąć program?",
-            "Czy na pewno chcesz zamknąć Katalog Gier?\n\n"
-            "Wszystkie dane zostały zapisane."
+        postep = PostepDialog(self.root, "📥 Importowanie...")
+        try:
+            liczba = self.katalog.importuj(sciezka, postep.aktualizuj)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("❌ Błąd importu", str(e))
+            return
+        finally:
+            postep.zamknij()
+            self.odswiez_liste()
+        messagebox.showinfo("✅ Sukces", f"Zaimportowano: {liczba} gier")
+    
+    def eksportuj(self):
+        """Eksportuje wyświetlane gry do pliku CSV lub JSON Lines"""
+        sciezka = filedialog.asksaveasfilename(
+            parent=self.root,
+            title="📤 Eksportuj wyświetlane gry",
+            defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("JSON Lines", "*.jsonl")]
         )
+        if not sciezka:
+            return
+        
+        postep = PostepDialog(self.root, "📤 Eksportowanie...")
+        try:
+            liczba = self.katalog.eksportuj(sciezka, postep.aktualizuj, self.aktualne_pozycje)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("❌ Błąd eksportu", str(e))
+            return
+        finally:
+            postep.zamknij()
+        messagebox.showinfo("✅ Sukces", f"Wyeksportowano: {liczba} gier")
+    
+    def on_closing(self):
+        """Obsługuje zamykanie aplikacji"""
+        # Niedokończone wczytywanie: katalog w pamięci jest niepełny, plik bez zmian
+        blad_zapisu = None
+        if self.wczytywanie is None:
+            try:
+                self.katalog.zapisz()  # Czeka na zapis w tle, potem pełny zapis
+            except Exception as e:
+                blad_zapisu = e
+        
+        if blad_zapisu is None:
+            odpowiedz = messagebox.askyesno(
+                "❓ Zamknąć program?",
+                "Czy na pewno chcesz zamknąć Katalog Gier?\n\n"
+                "Wszystkie dane zostały zapisane."
+            )
+        else:
+            # Błąd zapisu nie może blokować zamknięcia okna
+            odpowiedz = messagebox.askyesno(
+                "❌ Błąd zapisu",
+                f"Nie udało się zapisać katalogu:\n{blad_zapisu}\n\n"
+                "Zamknąć program mimo to? Niezapisane zmiany zostaną utracone."
+            )
         
         if odpowiedz:
+            if self.wczytywanie is not None:
+                # Przerwanie wczytywania zamyka plik; katalog nie zapisuje
+                # niepełnego stanu (magazyn zostaje bez zmian)
+                self.wczytywanie.close()
+                self.wczytywanie = None
+            try:
+                self.katalog.zamknij()
+            except Exception as e:
+                print(f"Błąd zamykania magazynu: {e}")
             self.root.quit()
             self.root.destroy()
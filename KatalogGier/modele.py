@@ -5,16 +5,125 @@ OPIS: Klasy modelu danych dla aplikacji Katalog Gier
 ===============================================================================
 """
 
-from datetime import datetime
-from typing import List
+import sys
+import weakref
+from array import array
+from datetime import datetime, timedelta
+from collections import abc
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+# Daty ocen w kolumnach przechowywane są jako mikrosekundy od tej chwili
+EPOKA = datetime(1970, 1, 1)
+_MIKROSEKUNDA = timedelta(microseconds=1)
+
+# Skala ocen (kolumna ocen przechowuje liczby całkowite w jednym bajcie)
+OCENA_MIN, OCENA_MAX = 1, 10
+
+
+# Ocena na skali 5 gwiazdek: GWIAZDKI[n] = n pełnych i 5 - n pustych
+GWIAZDKI = tuple("★" * n + "☆" * (5 - n) for n in range(6))
+
+
+def gwiazdki(srednia: float) -> str:
+    """Zamienia średnią ocenę (0-10) na napis z gwiazdkami (bez tworzenia nowego napisu)"""
+    return GWIAZDKI[round(srednia / 2.0)]  # 10 punktów -> 5 gwiazdek
+
+
+def data_na_mikrosekundy(data: datetime) -> int:
+    """
+    Zamienia datę na liczbę mikrosekund od EPOKA (bezstratnie)
+    
+    Daty ze strefą czasową są najpierw zamieniane na czas lokalny (jak
+    datetime.now() przy nowych ocenach); samą strefę przechowuje KolumnyOcen.
+    """
+    if data.tzinfo is not None:
+        data = data.astimezone().replace(tzinfo=None)
+    return (data - EPOKA) // _MIKROSEKUNDA
+
+
+def ocena_calkowita(wartosc: Any) -> Optional[int]:
+    """
+    Sprawdza ocenę podaną przez użytkownika lub program
+    
+    Args:
+        wartosc: Ocena (liczba lub napis z liczbą)
+    
+    Returns:
+        Ocena jako int lub None, gdy nie jest liczbą całkowitą z zakresu 1-10
+    """
+    if isinstance(wartosc, bool):
+        return None
+    try:
+        liczba = int(wartosc)
+    except (TypeError, ValueError, OverflowError):
+        return None
+    if not isinstance(wartosc, str) and liczba != wartosc:
+        return None  # Ocena ułamkowa
+    return liczba if OCENA_MIN <= liczba <= OCENA_MAX else None
+
+
+def wartosc_do_kolumny(wartosc: Any) -> int:
+    """
+    Sprawdza ocenę zapisywaną w kolumnie ocen (np. wczytaną z pliku)
+    
+    Raises:
+        ValueError: Gdy ocena nie jest liczbą całkowitą z zakresu 1-10
+    """
+    liczba = ocena_calkowita(wartosc)
+    if liczba is None:
+        raise ValueError(f"Niepoprawna ocena: {wartosc!r} "
+                         f"(wymagana liczba całkowita od {OCENA_MIN} do {OCENA_MAX})")
+    return liczba
+
+
+def mikrosekundy_na_date(mikrosekundy: int) -> datetime:
+    """Zamienia liczbę mikrosekund od EPOKA na datę"""
+    return EPOKA + timedelta(microseconds=mikrosekundy)
+
+
+def _wspolny_napis(wartosc: Any) -> Any:
+    """Zwraca jedną wspólną kopię napisu (sys.intern przyjmuje tylko str)"""
+    return sys.intern(wartosc) if type(wartosc) is str else wartosc
+
+
+def _pole_obserwowane(nazwa: str, opis: str,
+                      przeksztalc: Optional[Callable[[Any], Any]] = None) -> property:
+    """
+    Tworzy właściwość przechowywaną w slocie '_<nazwa>', która po zmianie
+    wartości wywołuje _pole_zmienione(nazwa) (np. aby katalog uaktualnił indeks)
+    
+    Args:
+        nazwa: Nazwa pola
+        opis: Docstring właściwości
+        przeksztalc: Funkcja stosowana do przypisywanej wartości (opcjonalnie)
+    """
+    slot = '_' + nazwa
+    
+    def ustaw(self, wartosc) -> None:
+        if przeksztalc is not None:
+            wartosc = przeksztalc(wartosc)
+        if getattr(self, slot) != wartosc:
+            setattr(self, slot, wartosc)
+            self._pole_zmienione(nazwa)
+    
+    # Odczyt przez attrgetter (bez wywołania funkcji Pythona) - pola czytane są często
+    return property(attrgetter(slot), ustaw, doc=opis)
 
 
 class ElementKatalogu:
     """
     Klasa bazowa dla wszystkich elementów w katalogu.
     Możliwe rozszerzenia: Gra, Film, Książka, Album muzyczny, etc.
+    Klasy modelu używają __slots__ (brak __dict__ w każdej instancji),
+    więc klasy pochodne też powinny deklarować swoje pola w __slots__.
     """
     
+    __slots__ = ('id', '_tytul', '_rok')
+    
+    tytul = _pole_obserwowane('tytul', "Tytuł elementu")
+    rok = _pole_obserwowane('rok', "Rok wydania/powstania")
+    
     def __init__(self, id: int, tytul: str, rok: int):
         """
         Konstruktor klasy bazowej
@@ -25,8 +134,17 @@ class ElementKatalogu:
             rok: Rok wydania/powstania
         """
         self.id = id
-        self.tytul = tytul
-        self.rok = rok
+        self._tytul = tytul
+        self._rok = rok
+    
+    def _pole_zmienione(self, pole: str) -> None:
+        """
+        Wywoływana po zmianie obserwowanego pola (klasy pochodne mogą
+        tu powiadamiać katalog)
+        
+        Args:
+            pole: Nazwa zmienionego pola
+        """
     
     def informacje_podstawowe(self) -> str:
         """
@@ -47,13 +165,399 @@ class ElementKatalogu:
 class OcenaGra:
     """Reprezentuje pojedynczą ocenę gry"""
     
-    def __init__(self, wartosc: int):
+    __slots__ = ('wartosc', 'data_dodania')
+    
+    def __init__(self, wartosc: int, data_dodania: Optional[datetime] = None):
         """
         Args:
             wartosc: Ocena w zakresie 1-10
+            data_dodania: Data wystawienia oceny (domyślnie teraz)
         """
         self.wartosc = wartosc
-        self.data_dodania = datetime.now()
+        self.data_dodania = data_dodania or datetime.now()
+
+
+class WidokOceny:
+    """
+    Lekki widok pojedynczej oceny przechowywanej w KolumnyOcen.
+    Udostępnia te same pola co OcenaGra (.wartosc, .data_dodania).
+    Widoki porównywane są po wartości i dacie (także z OcenaGra).
+    """
+    
+    __slots__ = ('_kolumny', '_indeks', '__weakref__')
+    
+    def __init__(self, kolumny: 'KolumnyOcen', indeks: int):
+        self._kolumny = kolumny
+        self._indeks = indeks
+    
+    @property
+    def wartosc(self) -> int:
+        return self._kolumny.wartosci[self._indeks]
+    
+    @wartosc.setter
+    def wartosc(self, wartosc: int) -> None:
+        self._kolumny.wartosci[self._indeks] = wartosc_do_kolumny(wartosc)
+        self._kolumny._zmienione()
+    
+    @property
+    def data_dodania(self) -> datetime:
+        return self._kolumny._data(self._indeks)
+    
+    @data_dodania.setter
+    def data_dodania(self, data: datetime) -> None:
+        self._kolumny._ustaw_date(self._indeks, data)
+        self._kolumny._zmienione()
+    
+    def _odlacz(self) -> None:
+        """Przenosi ocenę usuwaną ze zbioru do własnych kolumn (widok dalej ją pokazuje)"""
+        self._kolumny = KolumnyOcen((self,))
+        self._indeks = 0
+    
+    def __eq__(self, inna: object) -> bool:
+        try:
+            return self.wartosc == inna.wartosc and self.data_dodania == inna.data_dodania
+        except AttributeError:
+            return NotImplemented
+    
+    __hash__ = None  # Ocena jest zmienna (jak lista ocen)
+    
+    def __repr__(self) -> str:
+        return f"WidokOceny({self.wartosc}, {self.data_dodania!r})"
+
+
+class _RefWidoku(weakref.ref):
+    """Słaba referencja do widoku oceny pamiętająca jego indeks w zbiorze"""
+    
+    __slots__ = ('indeks',)
+    
+    def __new__(cls, widok: WidokOceny, wywolanie: Callable, indeks: int):
+        ref = super().__new__(cls, widok, wywolanie)
+        ref.indeks = indeks
+        return ref
+    
+    def __init__(self, widok: WidokOceny, wywolanie: Callable, indeks: int):
+        super().__init__(widok, wywolanie)
+
+
+class KolumnyOcen(abc.MutableSequence):
+    """
+    Kolumnowy zbiór ocen jednej gry: wartości w array('b'), daty w array('q').
+    Zajmuje kilkanaście razy mniej pamięci niż lista obiektów OcenaGra,
+    a przy iteracji i indeksowaniu zwraca obiekty WidokOceny.
+    
+    Zbiór zachowuje się jak lista ocen: obsługuje wstawianie, usuwanie,
+    sortowanie i przypisanie wycinka, a ta sama ocena daje ten sam widok
+    (dopóki jakiś widok do niej istnieje). Widok oceny usuniętej ze zbioru
+    dalej pokazuje jej wartość i datę. Każda zmiana ocen unieważnia agregaty
+    gry, do której zbiór należy.
+    
+    Wartości spoza skali 1-10 są odrzucane (ValueError). Daty ze strefą
+    czasową są w kolumnie zapisywane w czasie lokalnym, a oryginalna data
+    trafia do rzadkiego słownika - odczyt zwraca ją bez zmian.
+    """
+    
+    __slots__ = ('wartosci', 'daty', '_wlasciciel', '_widoki', '_daty_strefowe')
+    
+    def __init__(self, oceny: Iterable[Union[OcenaGra, WidokOceny]] = ()):
+        """
+        Args:
+            oceny: Początkowe oceny (obiekty z polami wartosc i data_dodania)
+        """
+        self.wartosci = array('b')
+        self.daty = array('q')
+        # Gra, której oceny przechowuje zbiór (ustawia Pozycja.oceny)
+        self._wlasciciel: Optional['Pozycja'] = None
+        # Żywe widoki {indeks: weakref} i daty ze strefą {indeks: data};
+        # None, dopóki nie są potrzebne (większość gier nie ma żadnych)
+        self._widoki: Optional[Dict[int, _RefWidoku]] = None
+        self._daty_strefowe: Optional[Dict[int, datetime]] = None
+        for ocena in oceny:
+            self._dopisz(ocena.wartosc, ocena.data_dodania)
+    
+    @classmethod
+    def z_tablic(cls, wartosci: array, daty: array) -> 'KolumnyOcen':
+        """
+        Tworzy zbiór ocen bezpośrednio z tablic (bez kopiowania)
+        
+        Args:
+            wartosci: array('b') z ocenami
+            daty: array('q') z datami w mikrosekundach od EPOKA
+        
+        Raises:
+            ValueError: Gdy tablice mają różne długości lub ocena jest spoza skali
+        """
+        if len(wartosci) != len(daty):
+            raise ValueError("Różna liczba wartości i dat ocen")
+        for skrajna in ((min(wartosci), max(wartosci)) if wartosci else ()):
+            wartosc_do_kolumny(skrajna)  # ValueError dla oceny spoza skali
+        kolumny = cls.__new__(cls)
+        kolumny.wartosci = wartosci
+        kolumny.daty = daty
+        kolumny._wlasciciel = None
+        kolumny._widoki = None
+        kolumny._daty_strefowe = None
+        return kolumny
+    
+    def append(self, ocena: Union[OcenaGra, WidokOceny]) -> None:
+        """Dodaje ocenę na koniec"""
+        self.dodaj(ocena.wartosc, ocena.data_dodania)
+    
+    def dodaj(self, wartosc: int, data_dodania: datetime) -> None:
+        """Dodaje ocenę podaną jako wartość i datę"""
+        self._dopisz(wartosc, data_dodania)
+        self._zmienione()
+    
+    def extend(self, oceny: Iterable[Union[OcenaGra, WidokOceny]]) -> None:
+        for ocena in list(oceny):  # list(): także extend samym sobą
+            self._dopisz(ocena.wartosc, ocena.data_dodania)
+        self._zmienione()
+    
+    def _dopisz(self, wartosc: int, data_dodania: datetime) -> int:
+        """Dopisuje ocenę do kolumn bez powiadamiania gry; zwraca zapisaną wartość"""
+        if type(wartosc) is not int or not OCENA_MIN <= wartosc <= OCENA_MAX:
+            wartosc = wartosc_do_kolumny(wartosc)
+        mikrosekundy = data_na_mikrosekundy(data_dodania)
+        # Najpierw wartość, potem data: ocena jest kompletna, gdy ma datę
+        # (zapis w tle czyta tylko len(daty) pierwszych ocen)
+        self.wartosci.append(wartosc)
+        if data_dodania.tzinfo is not None:
+            self._strefowe()[len(self.daty)] = data_dodania
+        self.daty.append(mikrosekundy)
+        return wartosc
+    
+    def _zmienione(self) -> None:
+        """Unieważnia agregaty gry-właściciela po zmianie ocen"""
+        if self._wlasciciel is not None:
+            self._wlasciciel._oceny_zmienione()
+    
+    # =========================================================================
+    # DATY
+    # =========================================================================
+    
+    def _strefowe(self) -> Dict[int, datetime]:
+        if self._daty_strefowe is None:
+            self._daty_strefowe = {}
+        return self._daty_strefowe
+    
+    def _data(self, indeks: int) -> datetime:
+        """Data oceny o podanym indeksie (ze strefą czasową, jeśli ją miała)"""
+        if self._daty_strefowe:
+            data = self._daty_strefowe.get(indeks)
+            if data is not None:
+                return data
+        return mikrosekundy_na_date(self.daty[indeks])
+    
+    def _ustaw_date(self, indeks: int, data: datetime) -> None:
+        self.daty[indeks] = data_na_mikrosekundy(data)
+        if data.tzinfo is not None:
+            self._strefowe()[indeks] = data
+        elif self._daty_strefowe:
+            self._daty_strefowe.pop(indeks, None)
+    
+    def pary(self) -> List[Tuple[int, datetime]]:
+        """
+        Zwraca kopię ocen jako pary (wartość, data)
+        
+        Kopiowane są tylko oceny kompletne (z datą), każda tablica naraz -
+        bezpieczne, gdy inny wątek właśnie dopisuje oceny (zapis w tle).
+        """
+        wartosci, daty, strefowe = self.wartosci, self.daty, self._daty_strefowe
+        liczba_ocen = len(daty)
+        wartosci, daty = wartosci[:liczba_ocen], daty[:liczba_ocen]
+        strefowe = strefowe.copy() if strefowe else {}
+        return [(w, strefowe.get(i) or mikrosekundy_na_date(d))
+                for i, (w, d) in enumerate(zip(wartosci, daty))]
+    
+    # =========================================================================
+    # PROTOKÓŁ LISTY
+    # =========================================================================
+    
+    def _widok(self, indeks: int) -> WidokOceny:
+        """Zwraca widok oceny (ten sam obiekt, dopóki ktoś go używa)"""
+        widoki = self._widoki
+        if widoki is None:
+            widoki = self._widoki = {}
+        else:
+            ref = widoki.get(indeks)
+            widok = ref() if ref is not None else None
+            if widok is not None:
+                return widok
+        widok = WidokOceny(self, indeks)
+        widoki[indeks] = _RefWidoku(widok, self._widok_usuniety, indeks)
+        return widok
+    
+    def _widok_usuniety(self, ref: _RefWidoku) -> None:
+        """Usuwa z pamięci podręcznej wpis widoku, który przestał istnieć"""
+        widoki = self._widoki
+        if widoki is not None and widoki.get(ref.indeks) is ref:
+            del widoki[ref.indeks]
+            if not widoki:
+                self._widoki = None
+    
+    def _odlacz_widok(self, indeks: int) -> None:
+        """Odłącza widok oceny usuwanej lub zastępowanej (przed zmianą kolumn)"""
+        ref = self._widoki.pop(indeks, None) if self._widoki else None
+        widok = ref() if ref is not None else None
+        if widok is not None:
+            widok._odlacz()
+    
+    def _przesun_indeksy(self, od: int, o: int) -> None:
+        """Przesuwa indeksy widoków i dat ze strefą od podanego miejsca (wstawienie, usunięcie)"""
+        if self._daty_strefowe:
+            self._daty_strefowe = {i + o if i >= od else i: data
+                                   for i, data in self._daty_strefowe.items()}
+        if self._widoki:
+            widoki = {}
+            for i, ref in self._widoki.items():
+                widok = ref()
+                if widok is None:
+                    continue
+                if i >= od:
+                    i += o
+                    widok._indeks = ref.indeks = i
+                widoki[i] = ref
+            self._widoki = widoki or None
+    
+    def _zywe_widoki(self) -> Dict[int, WidokOceny]:
+        widoki = {}
+        for indeks, ref in list((self._widoki or {}).items()):
+            widok = ref()
+            if widok is not None:
+                widoki[indeks] = widok
+        return widoki
+    
+    def _ustaw_kolejnosc(self, elementy: List[Any]) -> None:
+        """
+        Zastępuje zawartość zbioru (wspólna podstawa zmian innych niż dopisywanie)
+        
+        Args:
+            elementy: Nowa zawartość - int = istniejąca ocena spod tego indeksu
+                      (razem z jej widokiem), inny obiekt = nowa ocena
+                      (pola wartosc i data_dodania)
+        """
+        stare_strefowe = self._daty_strefowe or {}
+        wartosci, daty = array('b'), array('q')
+        strefowe: Dict[int, datetime] = {}
+        zachowane: Dict[int, int] = {}  # stary indeks -> nowy
+        # Wszystko jest sprawdzane przed zmianą - przy błędzie zbiór się nie zmienia
+        for nowy, element in enumerate(elementy):
+            if type(element) is int:
+                wartosci.append(self.wartosci[element])
+                daty.append(self.daty[element])
+                data = stare_strefowe.get(element)
+                zachowane[element] = nowy
+            else:
+                wartosci.append(wartosc_do_kolumny(element.wartosc))
+                data = element.data_dodania
+                daty.append(data_na_mikrosekundy(data))
+                data = data if data.tzinfo is not None else None
+            if data is not None:
+                strefowe[nowy] = data
+        
+        widoki = self._zywe_widoki()
+        for stary, widok in widoki.items():
+            if stary not in zachowane:
+                widok._odlacz()
+        self.wartosci, self.daty = wartosci, daty
+        self._daty_strefowe = strefowe or None
+        # Widoki zachowanych ocen wskazują ich nowe miejsca
+        self._widoki = {zachowane[stary]: _RefWidoku(widok, self._widok_usuniety, zachowane[stary])
+                        for stary, widok in widoki.items() if stary in zachowane} or None
+        for stary, widok in widoki.items():
+            if stary in zachowane:
+                widok._indeks = zachowane[stary]
+        self._zmienione()
+    
+    def __len__(self) -> int:
+        return len(self.wartosci)
+    
+    def _sprawdz_indeks(self, indeks: int) -> int:
+        """Indeks oceny jak w liście (ujemny od końca); IndexError poza zakresem"""
+        if indeks < 0:
+            indeks += len(self)
+        if not 0 <= indeks < len(self):
+            raise IndexError("indeks oceny poza zakresem")
+        return indeks
+    
+    def __getitem__(self, indeks):
+        if isinstance(indeks, slice):
+            return [self._widok(i) for i in range(*indeks.indices(len(self)))]
+        return self._widok(self._sprawdz_indeks(indeks))
+    
+    # Pojedyncza ocena zmieniana jest w miejscu (usunięcie z końca w O(1)),
+    # wycinki i sortowanie budują kolumny od nowa (_ustaw_kolejnosc)
+    
+    def __setitem__(self, indeks, wartosc) -> None:
+        if isinstance(indeks, slice):
+            elementy: List[Any] = list(range(len(self)))
+            elementy[indeks] = list(wartosc)
+            self._ustaw_kolejnosc(elementy)
+            return
+        indeks = self._sprawdz_indeks(indeks)
+        nowa, data = wartosc_do_kolumny(wartosc.wartosc), wartosc.data_dodania
+        self._odlacz_widok(indeks)
+        self.wartosci[indeks] = nowa
+        self._ustaw_date(indeks, data)
+        self._zmienione()
+    
+    def __delitem__(self, indeks) -> None:
+        if isinstance(indeks, slice):
+            elementy: List[Any] = list(range(len(self)))
+            del elementy[indeks]
+            self._ustaw_kolejnosc(elementy)
+            return
+        indeks = self._sprawdz_indeks(indeks)
+        self._odlacz_widok(indeks)
+        if self._daty_strefowe:
+            self._daty_strefowe.pop(indeks, None)
+        del self.daty[indeks]
+        del self.wartosci[indeks]
+        if indeks < len(self):
+            self._przesun_indeksy(indeks + 1, -1)
+        self._zmienione()
+    
+    def insert(self, indeks: int, ocena: Union[OcenaGra, WidokOceny]) -> None:
+        indeks = max(indeks + len(self), 0) if indeks < 0 else min(indeks, len(self))
+        if indeks == len(self):
+            self.append(ocena)
+            return
+        wartosc, data = wartosc_do_kolumny(ocena.wartosc), ocena.data_dodania
+        mikrosekundy = data_na_mikrosekundy(data)
+        self._przesun_indeksy(indeks, 1)
+        self.wartosci.insert(indeks, wartosc)
+        self.daty.insert(indeks, mikrosekundy)
+        if data.tzinfo is not None:
+            self._strefowe()[indeks] = data
+        self._zmienione()
+    
+    def clear(self) -> None:
+        self._ustaw_kolejnosc([])
+    
+    def reverse(self) -> None:
+        self._ustaw_kolejnosc(list(range(len(self) - 1, -1, -1)))
+    
+    def sort(self, *, key: Optional[Callable[[WidokOceny], Any]] = None,
+             reverse: bool = False) -> None:
+        """Sortuje oceny jak list.sort (np. key=lambda o: o.wartosc)"""
+        widoki = self[:]
+        kolejnosc = sorted(range(len(widoki)), reverse=reverse,
+                           key=(lambda i: widoki[i]) if key is None else (lambda i: key(widoki[i])))
+        self._ustaw_kolejnosc(kolejnosc)
+    
+    def __iter__(self) -> Iterator[WidokOceny]:
+        # Długość ustalona z góry - oceny dopisane w trakcie iteracji są pomijane
+        for i in range(len(self)):
+            yield self._widok(i)
+    
+    def __eq__(self, inne: object) -> bool:
+        if not isinstance(inne, (KolumnyOcen, list)):
+            return NotImplemented
+        return len(self) == len(inne) and all(a == b for a, b in zip(self, inne))
+    
+    __hash__ = None  # Jak lista - zbiór jest zmienny
+    
+    def __repr__(self) -> str:
+        return f"KolumnyOcen({list(self.wartosci)})"
 
 
 class Pozycja(ElementKatalogu):
@@ -62,6 +566,12 @@ class Pozycja(ElementKatalogu):
     Dziedziczy po ElementKatalogu i rozszerza o specyficzne pola dla gier.
     """
     
+    __slots__ = ('wydawca', '_gatunek', '_oceny',
+                 '_liczba_ocen', '_suma_ocen', '_min_ocena', '_max_ocena', '_obserwator',
+                 '_opis')
+    
+    gatunek = _pole_obserwowane('gatunek', "Gatunek gry", _wspolny_napis)
+    
     def __init__(self, id: int = 0, tytul: str = "", wydawca: str = "", 
                  gatunek: str = "", rok: int = 2020):
         """
@@ -73,20 +583,114 @@ class Pozycja(ElementKatalogu):
             rok: Rok wydania
         """
         super().__init__(id, tytul, rok)
-        self.wydawca = wydawca
-        self.gatunek = gatunek
-        self.oceny: List[OcenaGra] = []
+        # Wydawcy i gatunki powtarzają się - jedna kopia napisu na cały katalog
+        # (inne wartości niż str zapisywane bez zmian)
+        self.wydawca = _wspolny_napis(wydawca)
+        self._gatunek = _wspolny_napis(gatunek)
+        # Zapamiętany wiersz listy: (pola użyte w opisie, tekst) lub None
+        self._opis: Optional[tuple] = None
+        # Funkcja wywoływana z nazwą pola ('oceny', 'tytul', ...) po jego zmianie
+        # (ustawia ją katalog zawierający grę)
+        self._obserwator: Optional[Callable[['Pozycja', str], None]] = None
+        self.oceny = KolumnyOcen()
+        # Agregaty ocen aktualizowane przy każdej nowej ocenie
+        self._liczba_ocen = 0
+        self._suma_ocen = 0
+        self._min_ocena = 0
+        self._max_ocena = 0
+    
+    @property
+    def oceny(self) -> KolumnyOcen:
+        """Oceny gry (przechowywane kolumnowo)"""
+        return self._oceny
+    
+    @oceny.setter
+    def oceny(self, oceny: Iterable[Union[OcenaGra, WidokOceny]]) -> None:
+        kolumny = oceny if isinstance(oceny, KolumnyOcen) else KolumnyOcen(oceny)
+        kolumny._wlasciciel = self
+        self._oceny = kolumny
+        self._oceny_zmienione()
+    
+    def _oceny_zmienione(self) -> None:
+        """
+        Unieważnia agregaty i opis po zmianie ocen z pominięciem dodaj_ocene
+        i powiadamia katalog (ranking ocen)
+        """
+        # Agregaty (i zapamiętany opis) przeliczą się przy następnym odczycie
+        self._liczba_ocen = -1
+        self._opis = None
+        if self._obserwator is not None:
+            self._obserwator(self, 'oceny')
+    
+    def _pole_zmienione(self, pole: str) -> None:
+        """Powiadamia katalog o zmianie pola (aktualizacja indeksów)"""
+        if self._obserwator is not None:
+            self._obserwator(self, pole)
+    
+    def dodaj_ocene(self, ocena: OcenaGra) -> None:
+        """
+        Dodaje ocenę i aktualizuje agregaty
+        
+        Args:
+            ocena: Nowa ocena gry
+        """
+        self._agregaty_aktualne()
+        wartosc = self._oceny._dopisz(ocena.wartosc, ocena.data_dodania)
+        
+        if self._liczba_ocen == 0:
+            self._min_ocena = self._max_ocena = wartosc
+        else:
+            self._min_ocena = min(self._min_ocena, wartosc)
+            self._max_ocena = max(self._max_ocena, wartosc)
+        self._liczba_ocen += 1
+        self._suma_ocen += wartosc
+        self._opis = None
+        
+        if self._obserwator is not None:
+            self._obserwator(self, 'oceny')
+    
+    def _agregaty_aktualne(self) -> None:
+        """
+        Przelicza agregaty po zmianie ocen z pominięciem dodaj_ocene
+        (unieważnione przez _oceny_zmienione lub - przy zmianie samych
+        tablic kolumn - wykryte po liczbie ocen)
+        """
+        if self._liczba_ocen == len(self.oceny):
+            return
+        wartosci = self.oceny.wartosci
+        self._liczba_ocen = len(wartosci)
+        self._suma_ocen = sum(wartosci)
+        self._min_ocena = min(wartosci, default=0)
+        self._max_ocena = max(wartosci, default=0)
+        self._opis = None
     
     def srednia_ocena(self) -> float:
         """
-        Oblicza średnią ocenę gry
+        Oblicza średnią ocenę gry (w czasie stałym, z agregatów)
         
         Returns:
             Średnia ocen lub 0 jeśli brak ocen
         """
-        if not self.oceny:
+        self._agregaty_aktualne()
+        if not self._liczba_ocen:
             return 0.0
-        return sum(o.wartosc for o in self.oceny) / len(self.oceny)
+        return self._suma_ocen / self._liczba_ocen
+    
+    def najnizsza_ocena(self) -> int:
+        """
+        Returns:
+            Najniższa ocena gry lub 0 jeśli brak ocen
+        """
+        self._agregaty_aktualne()
+        return self._min_ocena
+    
+    def najwyzsza_ocena(self) -> int:
+        """
+        Returns:
+            Najwyższa ocena gry lub 0 jeśli brak ocen
+        """
+        self._agregaty_aktualne()
+        return self._max_ocena
     
     def ocena_gwiazdkami(self) -> str:
         """
@@ -96,32 +700,36 @@ class Pozycja(ElementKatalogu):
             String z gwiazdkami ★ i ☆
         """
         if not self.oceny:
-            return "☆☆☆☆☆ (Brak ocen)"
+            return f"{GWIAZDKI[0]} (Brak ocen)"
         
         srednia = self.srednia_ocena()
-        pelne_gwiazdki = round(srednia / 2.0)  # 10 punktów -> 5 gwiazdek
-        puste_gwiazdki = 5 - pelne_gwiazdki
-        
-        gwiazdki = "★" * pelne_gwiazdki + "☆" * puste_gwiazdki
-        return f"{gwiazdki} ({srednia:.2f}/10)"
+        return f"{gwiazdki(srednia)} ({srednia:.2f}/10)"
     
     def __str__(self) -> str:
         """
         Formatowanie gry do wyświetlenia na liście.
         
+        Tekst jest zapamiętywany i tworzony ponownie dopiero po zmianie ocen
+        albo któregoś z wyświetlanych pól.
+        
         Returns:
             Sformatowany string z wydawcą
         """
-        if self.oceny:
-            srednia = self.srednia_ocena()
-            pelne = round(srednia / 2.0)
-            puste = 5 - pelne
-            gwiazdki = "★" * pelne + "☆" * puste
-            ocena_str = f"{gwiazdki} {srednia:.2f}"
+        self._agregaty_aktualne()
+        pola = (self.id, self.tytul, self.wydawca, self.gatunek, self.rok)
+        opis = self._opis
+        if opis is not None and opis[0] == pola:
+            return opis[1]
+        
+        if self._liczba_ocen:
+            srednia = self._suma_ocen / self._liczba_ocen
+            ocena_str = f"{gwiazdki(srednia)} {srednia:.2f}"
         else:
-            ocena_str = "☆☆☆☆☆"
+            ocena_str = GWIAZDKI[0]
         
-        return f"[ID: {self.id}] {self.tytul} | {self.wydawca} | {self.gatunek} ({self.rok}) | {ocena_str}"
+        tekst = f"[ID: {self.id}] {self.tytul} | {self.wydawca} | {self.gatunek} ({self.rok}) | {ocena_str}"
+        self._opis = (pola, tekst)
+        return tekst
     
     def to_dict(self) -> dict:
         """
@@ -130,14 +738,16 @@ class Pozycja(ElementKatalogu):
         Returns:
             Słownik z danymi gry (z wydawcą)
         """
+        # Zapis w tle może czytać grę, której oceny są właśnie dopisywane -
+        # pary() kopiuje tylko oceny kompletne
         return {
             'id': self.id,
             'tytul': self.tytul,
             'wydawca': self.wydawca,
             'gatunek': self.gatunek,
             'rok': self.rok,
-            'oceny': [{'wartosc': o.wartosc, 'data_dodania': o.data_dodania.isoformat()} 
-                     for o in self.oceny]
+            'oceny': [{'wartosc': w, 'data_dodania': d.isoformat()}
+                      for w, d in self._oceny.pary()]
         }
     
     @staticmethod
@@ -159,10 +769,11 @@ class Pozycja(ElementKatalogu):
             rok=data['rok']
         )
         
+        # Oceny trafiają prosto do kolumn; agregaty przeliczą się przy odczycie
+        oceny = pozycja.oceny
         for ocena_data in data.get('oceny', []):
-            ocena = OcenaGra(ocena_data['wartosc'])
-            if 'data_dodania' in ocena_data:
-                ocena.data_dodania = datetime.fromisoformat(ocena_data['data_dodania'])
-            pozycja.oceny.append(ocena)
+            data_dodania = ocena_data.get('data_dodania')
+            oceny._dopisz(ocena_data['wartosc'],
+                        datetime.fromisoformat(data_dodania) if data_dodania else datetime.now())
         
         return pozycja
@@ -0,0 +1,216 @@
+"""
+===============================================================================
+PLIK: statystyki.py
+OPIS: Kolumnowy eksport katalogu i rozbudowane statystyki (raporty offline)
+===============================================================================
+
+Statystyki liczone są jednym przebiegiem po kolumnach. Gdy dostępny jest
+NumPy, przebieg jest wektorowy (bincount, percentile); bez niego moduł
+korzysta z pętli po tablicach array - wyniki są takie same.
+"""
+
+import math
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy jest opcjonalny
+    np = None
+
+from modele import OCENA_MAX, OCENA_MIN, Pozycja
+
+# Percentyle średnich ocen gier zwracane w raporcie
+PERCENTYLE = (25, 50, 75, 90)
+
+
+class KolumnyKatalogu:
+    """
+    Katalog w postaci kolumnowej: jedna tablica array na pole, wiersz = gra.
+
+    Gatunki zapisane są jako kody (indeksy listy `gatunki`), a oceny gry
+    jako suma i liczba. Wszystkie oceny katalogu trafiają do jednej tablicy
+    `oceny` (kolejno gra po grze), z której liczony jest histogram.
+    """
+    
+    __slots__ = ('id', 'rok', 'gatunek', 'gatunki', 'suma_ocen', 'liczba_ocen', 'oceny')
+    
+    def __init__(self):
+        """Konstruktor pustego zbioru kolumn"""
+        self.id = array('q')
+        self.rok = array('i')
+        self.gatunek = array('I')
+        self.gatunki: List[str] = []
+        self.suma_ocen = array('q')
+        self.liczba_ocen = array('I')
+        self.oceny = array('b')
+    
+    @classmethod
+    def z_pozycji(cls, pozycje: Iterable[Pozycja]) -> 'KolumnyKatalogu':
+        """
+        Zamienia listę gier na kolumny
+
+        Args:
+            pozycje: Gry katalogu
+
+        Returns:
+            Kolumny z jednym wierszem na grę, w kolejności pozycji
+        """
+        kolumny = cls()
+        kody: Dict[str, int] = {}
+        for pozycja in pozycje:
+            kod = kody.get(pozycja.gatunek)
+            if kod is None:
+                kod = kody[pozycja.gatunek] = len(kolumny.gatunki)
+                kolumny.gatunki.append(pozycja.gatunek)
+            wartosci = pozycja.oceny.wartosci
+            kolumny.id.append(pozycja.id)
+            kolumny.rok.append(pozycja.rok)
+            kolumny.gatunek.append(kod)
+            kolumny.suma_ocen.append(sum(wartosci))
+            kolumny.liczba_ocen.append(len(wartosci))
+            kolumny.oceny.extend(wartosci)
+        return kolumny
+    
+    def __len__(self) -> int:
+        return len(self.id)
+
+
+# =============================================================================
+# RAPORT
+# =============================================================================
+
+def raport(kolumny: KolumnyKatalogu, uzyj_numpy: Optional[bool] = None) -> Dict[str, Any]:
+    """
+    Liczy statystyki katalogu jednym przebiegiem po kolumnach
+
+    Średnie, odchylenia i percentyle dotyczą średnich ocen gier (tak jak
+    Katalog.srednia_ocena_katalogu); gry bez ocen liczą się tylko do liczby gier.
+
+    Args:
+        kolumny: Katalog w postaci kolumnowej (Katalog.kolumny())
+        uzyj_numpy: None = NumPy, jeśli jest zainstalowany; False = pętle po tablicach
+
+    Returns:
+        Słownik z kluczami:
+            liczba_gier, liczba_ocenionych, liczba_ocen,
+            srednia, odchylenie (populacyjne), percentyle {p: wartość},
+            histogram {ocena: liczba ocen},
+            gatunki i lata: {wartość: {'liczba_gier', 'ocenione', 'srednia', 'odchylenie'}}
+
+    Raises:
+        ImportError: Gdy uzyj_numpy=True, a NumPy nie jest zainstalowany
+    """
+    if uzyj_numpy is None:
+        uzyj_numpy = np is not None
+    if uzyj_numpy and np is None:
+        raise ImportError("Obliczenia wektorowe wymagają pakietu numpy")
+    return _raport_numpy(kolumny) if uzyj_numpy else _raport_tablice(kolumny)
+
+
+def _grupa(liczba_gier: int, ocenione: int, suma: float, suma_kwadratow: float) -> Dict[str, Any]:
+    """Statystyki jednej grupy (gatunku lub roku) z sum średnich i ich kwadratów"""
+    srednia = suma / ocenione if ocenione else 0.0
+    wariancja = suma_kwadratow / ocenione - srednia * srednia if ocenione else 0.0
+    return {
+        'liczba_gier': liczba_gier,
+        'ocenione': ocenione,
+        'srednia': srednia,
+        'odchylenie': math.sqrt(max(wariancja, 0.0)),
+    }
+
+
+def _percentyl(posortowane: Sequence[float], procent: float) -> float:
+    """Percentyl z interpolacją liniową (jak domyślnie numpy.percentile)"""
+    pozycja = (len(posortowane) - 1) * procent / 100
+    dolny = math.floor(pozycja)
+    gorny = min(dolny + 1, len(posortowane) - 1)
+    return posortowane[dolny] + (posortowane[gorny] - posortowane[dolny]) * (pozycja - dolny)
+
+
+def _raport_tablice(kolumny: KolumnyKatalogu) -> Dict[str, Any]:
+    """Raport liczony pętlą po tablicach array (bez NumPy)"""
+    gatunki: Dict[int, List[float]] = {}
+    lata: Dict[int, List[float]] = {}
+    srednie = array('d')
+    for kod, rok, suma, liczba in zip(kolumny.gatunek, kolumny.rok,
+                                      kolumny.suma_ocen, kolumny.liczba_ocen):
+        # [liczba gier, ocenione, suma średnich, suma kwadratów średnich]
+        grupa_gatunku = gatunki.get(kod)
+        if grupa_gatunku is None:
+            grupa_gatunku = gatunki[kod] = [0, 0, 0.0, 0.0]
+        grupa_roku = lata.get(rok)
+        if grupa_roku is None:
+            grupa_roku = lata[rok] = [0, 0, 0.0, 0.0]
+        grupa_gatunku[0] += 1
+        grupa_roku[0] += 1
+        if liczba:
+            srednia = suma / liczba
+            srednie.append(srednia)
+            for grupa in (grupa_gatunku, grupa_roku):
+                grupa[1] += 1
+                grupa[2] += srednia
+                grupa[3] += srednia * srednia
+    
+    ocenione = len(srednie)
+    srednia = math.fsum(srednie) / ocenione if ocenione else 0.0
+    wariancja = math.fsum((s - srednia) ** 2 for s in srednie) / ocenione if ocenione else 0.0
+    posortowane = sorted(srednie)
+    return {
+        'liczba_gier': len(kolumny),
+        'liczba_ocenionych': ocenione,
+        'liczba_ocen': len(kolumny.oceny),
+        'srednia': srednia,
+        'odchylenie': math.sqrt(wariancja),
+        'percentyle': {p: _percentyl(posortowane, p) for p in PERCENTYLE} if ocenione else {},
+        'histogram': {ocena: kolumny.oceny.count(ocena)
+                      for ocena in range(OCENA_MIN, OCENA_MAX + 1)},
+        'gatunki': {kolumny.gatunki[kod]: _grupa(*grupa) for kod, grupa in gatunki.items()},
+        'lata': {rok: _grupa(*grupa) for rok, grupa in sorted(lata.items())},
+    }
+
+
+def _raport_numpy(kolumny: KolumnyKatalogu) -> Dict[str, Any]:
+    """Raport liczony wektorowo w NumPy (tablice array czytane bez kopiowania)"""
+    def wektor(tablica: array):
+        return np.frombuffer(tablica, dtype=tablica.typecode)
+    
+    kody, lata = wektor(kolumny.gatunek), wektor(kolumny.rok)
+    sumy, liczby = wektor(kolumny.suma_ocen), wektor(kolumny.liczba_ocen)
+    ocenione = liczby > 0
+    srednie = sumy[ocenione] / liczby[ocenione]
+    kwadraty = srednie * srednie
+    
+    def grupy(klucze, nazwy) -> Dict[Any, Dict[str, Any]]:
+        """Sumy grup z bincount; klucze to kody 0..n-1"""
+        rozmiar = len(nazwy)
+        klucze_ocenionych = klucze[ocenione]
+        liczba_gier = np.bincount(klucze, minlength=rozmiar)
+        liczba_ocenionych = np.bincount(klucze_ocenionych, minlength=rozmiar)
+        suma = np.bincount(klucze_ocenionych, weights=srednie, minlength=rozmiar)
+        suma_kwadratow = np.bincount(klucze_ocenionych, weights=kwadraty, minlength=rozmiar)
+        return {nazwy[i]: _grupa(int(liczba_gier[i]), int(liczba_ocenionych[i]),
+                                 float(suma[i]), float(suma_kwadratow[i]))
+                for i in np.flatnonzero(liczba_gier)}
+    
+    if len(lata):
+        najstarszy = int(lata.min())
+        lata_grupy = grupy(lata.astype(np.int64) - najstarszy,
+                           range(najstarszy, int(lata.max()) + 1))
+    else:
+        lata_grupy = {}
+    
+    histogram = np.bincount(wektor(kolumny.oceny).astype(np.intp), minlength=OCENA_MAX + 1)
+    liczba_ocenionych = len(srednie)
+    return {
+        'liczba_gier': len(kolumny),
+        'liczba_ocenionych': liczba_ocenionych,
+        'liczba_ocen': len(kolumny.oceny),
+        'srednia': float(srednie.mean()) if liczba_ocenionych else 0.0,
+        'odchylenie': float(srednie.std()) if liczba_ocenionych else 0.0,
+        'percentyle': dict(zip(PERCENTYLE, map(float, np.percentile(srednie, PERCENTYLE))))
+                      if liczba_ocenionych else {},
+        'histogram': {ocena: int(histogram[ocena]) for ocena in range(OCENA_MIN, OCENA_MAX + 1)},
+        'gatunki': grupy(kody.astype(np.intp), kolumny.gatunki),
+        'lata': lata_grupy,
+    }
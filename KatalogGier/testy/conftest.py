@@ -0,0 +1,11 @@
+"""
+===============================================================================
+PLIK: testy/conftest.py
+OPIS: Wspólna konfiguracja testów (moduły aplikacji importowane jak w main.py)
+===============================================================================
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,88 @@
+"""
+===============================================================================
+PLIK: testy/test_dziennik.py
+OPIS: Testy magazynu JSON w trybie dziennika (numeracja i odtwarzanie zmian)
+===============================================================================
+"""
+
+import json
+
+import pytest
+
+from katalog import Katalog
+from magazyn import MagazynJSON
+from modele import Pozycja
+
+
+def skompaktowany_katalog(sciezka: str) -> None:
+    """Plik katalogu z trzema grami i nr_zmiany = 3, bez dziennika"""
+    katalog = Katalog(sciezka, tryb_dziennika=True)
+    for tytul in ("Pierwsza", "Druga", "Trzecia"):
+        katalog.dodaj_pozycje(tytul, "Studio", "RPG", 2020)
+    katalog.zapisz()
+    katalog.zamknij()
+
+
+def tytuly(sciezka: str) -> list:
+    katalog = Katalog(sciezka, tryb_dziennika=True)
+    katalog.wczytaj()
+    katalog.zamknij()
+    return [p.tytul for p in katalog.pozycje]
+
+
+def test_zmiana_w_niewczytanym_katalogu_nie_ginie(tmp_path):
+    sciezka = str(tmp_path / "katalog.json")
+    skompaktowany_katalog(sciezka)
+    with open(sciezka, encoding='utf-8') as f:
+        assert json.load(f)['nr_zmiany'] == 3
+    
+    katalog = Katalog(sciezka, tryb_dziennika=True)
+    katalog.dodaj_pozycje("NEW", "Studio", "RPG", 2020)
+    katalog.zamknij()
+    assert tytuly(sciezka) == ["NEW"]
+
+
+def test_dziennik_niewczytanego_magazynu_numerowany_po_pliku(tmp_path):
+    sciezka = str(tmp_path / "katalog.json")
+    skompaktowany_katalog(sciezka)
+    
+    magazyn = MagazynJSON(sciezka, tryb_dziennika=True)
+    nowa = Pozycja(4, "NEW", "Studio", "RPG", 2020)
+    magazyn.zapisz_zmiane({'op': 'dodaj', 'pozycja': nowa.to_dict()}, None)
+    magazyn.zapisz_zmiane({'op': 'ocena', 'id': 4, 'wartosc': 7,
+                           'data_dodania': "2024-05-01T12:00:00"}, None)
+    with open(magazyn.sciezka_dziennika, encoding='utf-8') as f:
+        assert [json.loads(linia)['nr'] for linia in f] == [4, 5]
+    assert tytuly(sciezka) == ["Pierwsza", "Druga", "Trzecia", "NEW"]
+
+
+@pytest.mark.parametrize('urwany_wpis', ['{"nr":9,"op":"us', '{"nr":9,"op":"usun","id":1}'])
+def test_odtworzenie_dziennika_po_awarii(tmp_path, urwany_wpis):
+    sciezka = str(tmp_path / "katalog.json")
+    skompaktowany_katalog(sciezka)
+    katalog = Katalog(sciezka, tryb_dziennika=True)
+    katalog.wczytaj()
+    czwarta = katalog.dodaj_pozycje("Czwarta", "Studio", "RPG", 2021)
+    katalog.dodaj_ocene(2, 8)
+    katalog.dodaj_ocene(czwarta.id, 5)
+    katalog.usun_pozycje(3)
+    # Awaria: proces kończy się bez zamknięcia katalogu, w trakcie dopisywania wpisu
+    with open(katalog.magazyn.sciezka_dziennika, 'a', encoding='utf-8') as f:
+        f.write(urwany_wpis)
+    
+    po_awarii = Katalog(sciezka, tryb_dziennika=True)
+    po_awarii.wczytaj()
+    # Kompletny (choć niezakończony znakiem nowej linii) wpis jest odtwarzany
+    oczekiwane = ["Druga", "Czwarta"] if urwany_wpis.endswith('}') else ["Pierwsza", "Druga", "Czwarta"]
+    assert [p.tytul for p in po_awarii.pozycje] == oczekiwane
+    assert [o.wartosc for o in po_awarii.pobierz_pozycje(2).oceny] == [8]
+    assert [o.wartosc for o in po_awarii.pobierz_pozycje(czwarta.id).oceny] == [5]
+    
+    # Zmiany po awarii nie mogą zostać doklejone do urwanego wpisu
+    po_awarii.dodaj_pozycje("Piąta", "Studio", "RPG", 2022)
+    po_awarii.dodaj_ocene(2, 9)
+    po_awarii.zamknij()
+    assert tytuly(sciezka) == oczekiwane + ["Piąta"]
+    ponownie = Katalog(sciezka, tryb_dziennika=True)
+    ponownie.wczytaj()
+    assert [o.wartosc for o in ponownie.pobierz_pozycje(2).oceny] == [8, 9]
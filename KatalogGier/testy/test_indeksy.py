@@ -0,0 +1,146 @@
+"""
+===============================================================================
+PLIK: testy/test_indeksy.py
+OPIS: Testy indeksów katalogu (trigramy, ranking ocen, aktualność po zmianach gier)
+===============================================================================
+"""
+
+import random
+from fractions import Fraction
+
+from indeksy import IndeksRankingu, IndeksTrigramow
+from katalog import Katalog
+from modele import Pozycja
+
+
+SLOWA = ["Wiedźmin", "wojna", "SMOK", "miasto", "cień", "dom", "Gra", "żółw", "aa", "x"]
+
+
+def test_trigramy_jak_przeglad_tytulow():
+    los = random.Random(11)
+    indeks = IndeksTrigramow()
+    tytuly = {}
+    for krok in range(6000):
+        id = los.randrange(3000)
+        if los.random() < 0.3:
+            indeks.usun(id)
+            tytuly.pop(id, None)
+        else:
+            tytuly[id] = " ".join(los.choices(SLOWA, k=los.randint(1, 3)))
+            if krok % 2:
+                indeks.dodaj(id, tytuly[id])
+            else:
+                indeks.dodaj_wiele([(id, tytuly[id])])
+    # Numery usuniętych i zastąpionych tytułów są usuwane z list na bieżąco
+    assert indeks._nieaktualne <= max(1024, indeks._rozmiar_list // 2)
+    assert len(indeks) == len(tytuly)
+    
+    for fraza in ["", "a", "Ż", "dom", "DOM", "cień gra", "wiedźmin wojna", "miasto x", "brak"]:
+        oczekiwane = {id for id, tytul in tytuly.items() if fraza.lower() in tytul.lower()}
+        wynik = list(indeks.szukaj(fraza))
+        assert len(wynik) == len(set(wynik)) and set(wynik) == oczekiwane, fraza
+        assert indeks.oszacuj(fraza) >= len(oczekiwane)
+
+
+def test_wyszukaj_w_kolejnosci_katalogu(tmp_path):
+    katalog = Katalog(str(tmp_path / "katalog.json"))
+    los = random.Random(12)
+    katalog.dodaj_wiele((" ".join(los.choices(SLOWA, k=2)), "Studio", "RPG", 2000) for _ in range(500))
+    for fraza in ["smok", "Ń", "wojna cień"]:
+        oczekiwane = [p for p in katalog.pozycje if fraza.lower() in p.tytul.lower()]
+        assert katalog.wyszukaj(fraza) == oczekiwane
+        assert katalog.wyszukaj(fraza, limit=5, offset=3) == oczekiwane[3:8]
+
+
+def test_srednia_rankingu_bez_bledow_zaokraglen():
+    losowe = random.Random(7)
+    ranking = IndeksRankingu()
+    srednie = {}
+    for krok in range(20_000):
+        id = losowe.randrange(200)
+        liczba = losowe.randint(1, 30)
+        srednie[id] = sum(losowe.randint(1, 10) for _ in range(liczba)) / liczba
+        ranking.ustaw(id, srednie[id])
+        if krok % 5000 == 0:
+            ranking.ustaw_wiele(dict(srednie))
+    # Dokładna średnia zaokrąglona raz do float
+    assert ranking.srednia() == float(sum(map(Fraction, srednie.values())) / len(srednie))
+    
+    pozostala = next(iter(srednie))
+    for id in list(srednie)[1:]:
+        ranking.usun(id)
+    assert ranking.srednia() == srednie[pozostala]
+    ranking.usun(pozostala)
+    assert ranking.srednia() is None and ranking.liczba_ocenionych() == 0
+
+
+def test_ranking_jak_sortowanie_listy(tmp_path):
+    katalog = Katalog(str(tmp_path / "katalog.json"))
+    los = random.Random(13)
+    katalog.dodaj_wiele({'tytul': f"Gra {i}", 'wydawca': "Studio", 'gatunek': "RPG", 'rok': 2000,
+                         'oceny': los.choices(range(1, 11), k=los.randint(0, 3))} for i in range(300))
+    for krok in range(200):
+        gra = los.choice(katalog.pozycje)
+        if krok % 4 == 0:
+            katalog.dodaj_oceny_wiele((los.choice(katalog.pozycje).id, los.randint(1, 10))
+                                      for _ in range(5))
+        elif krok % 4 == 1:
+            gra.oceny = []  # Zmiana z pominięciem API katalogu
+        elif krok % 4 == 2:
+            katalog.usun_pozycje(gra.id)
+        else:
+            katalog.dodaj_ocene(gra.id, los.randint(1, 10))
+        
+        # Jak pierwotne sortuj_po_ocenie: stabilne sortowanie ocenionych, nieocenione na końcu
+        ocenione = [p for p in katalog.pozycje if p.oceny]
+        nieocenione = [p for p in katalog.pozycje if not p.oceny]
+        for malejaco in (True, False):
+            oczekiwane = sorted(ocenione, key=Pozycja.srednia_ocena, reverse=malejaco) + nieocenione
+            assert katalog.sortuj_po_ocenie(malejaco) == oczekiwane
+            assert katalog.sortuj_po_ocenie(malejaco, limit=10, offset=5) == oczekiwane[5:15]
+        assert katalog.najlepsza() is max(ocenione, key=Pozycja.srednia_ocena)
+        assert katalog.najgorsza() is min(ocenione, key=Pozycja.srednia_ocena)
+
+
+def test_bezposrednia_zmiana_tytulu_aktualizuje_indeks(tmp_path):
+    sciezka = str(tmp_path / "katalog.json")
+    katalog = Katalog(sciezka)
+    gra = katalog.dodaj_pozycje("Stary tytuł", "Studio", "RPG", 2001)
+    inna = katalog.dodaj_pozycje("Inna gra", "Studio", "RPG", 2002)
+    assert katalog.usun_pozycje(inna.id)
+    
+    gra.tytul = "Brand New"
+    assert katalog.wyszukaj("brand") == [gra]
+    assert katalog.wyszukaj("stary") == []
+    # Gra usunięta z katalogu nie wraca do indeksu po zmianie tytułu
+    inna.tytul = "Brand Old"
+    assert katalog.wyszukaj("brand") == [gra]
+    
+    # Magazyn nie jest już zgodny z katalogiem - zamknięcie zapisuje zmianę
+    katalog.zamknij()
+    wczytany = Katalog(sciezka)
+    wczytany.wczytaj()
+    assert [p.tytul for p in wczytany.pozycje] == ["Brand New"]
+
+
+def test_bezposrednia_zmiana_gatunku_i_roku_aktualizuje_indeksy(tmp_path):
+    katalog = Katalog(str(tmp_path / "katalog.json"))
+    gry = [katalog.dodaj_pozycje(f"Gra {i}", "Studio", "RPG", 2000 + i) for i in range(20)]
+    gra = gry[3]
+    
+    gra.gatunek = "Akcja"
+    gra.rok = 2010
+    assert katalog.filtruj_po_gatunku("Akcja") == [gra]
+    assert gra not in katalog.filtruj_po_gatunku("RPG")
+    assert katalog.rozklad_gatunkow() == {"RPG": 19, "Akcja": 1}
+    assert katalog.pobierz_gatunki() == ["Akcja", "RPG"]
+    assert sorted(p.id for p in katalog.filtruj_po_roku(2010, 2010)) == sorted([gra.id, gry[10].id])
+    assert katalog.filtruj_po_roku(2003, 2003) == []
+    
+    # Ostatnia gra danego gatunku i roku opuszcza indeksy razem z wartością
+    gra.gatunek = "RPG"
+    gry[0].rok = 1990
+    assert katalog.pobierz_gatunki() == ["RPG"]
+    assert katalog.zakres_lat() == (1990, 2019)
+    assert katalog.filtruj_po_roku(1990, 1999) == [gry[0]]
+    assert katalog.kursor('gatunek', "RPG", rozmiar_strony=50).nastepna() == katalog.filtruj_po_gatunku("RPG")
@@ -0,0 +1,134 @@
+"""
+===============================================================================
+PLIK: testy/test_katalog.py
+OPIS: Testy katalogu (indeks ID, przydział wolnych ID, migawki)
+===============================================================================
+"""
+
+import random
+
+import pytest
+
+from katalog import Katalog
+from modele import Pozycja
+
+
+def najmniejsze_wolne_id(katalog: Katalog, liczba: int = 1) -> list:
+    """Przydział jak w pierwotnym dodaj_pozycje (przegląd od 1)"""
+    uzyte = {p.id for p in katalog.pozycje}
+    ids, id = [], 1
+    while len(ids) < liczba:
+        if id not in uzyte:
+            ids.append(id)
+        id += 1
+    return ids
+
+
+def katalog_z_grami(sciezka: str, gier: int) -> Katalog:
+    katalog = Katalog(sciezka)
+    katalog.dodaj_wiele((f"Gra {i}", "Studio", "RPG", 2000) for i in range(gier))
+    return katalog
+
+
+def test_indeks_id_nadaza_za_zmianami_listy(tmp_path):
+    katalog = katalog_z_grami(str(tmp_path / "katalog.json"), 10)
+    gry = list(katalog.pozycje)
+    assert all(katalog.pobierz_pozycje(p.id) is p for p in gry)
+    assert katalog.pobierz_pozycje(0) is None and katalog.pobierz_pozycje(11) is None
+    
+    # Bezpośrednie zmiany listy są odzwierciedlane w indeksie
+    nowa = Pozycja(50, "Dopisana", "Studio", "RPG", 2001)
+    katalog.pozycje.append(nowa)
+    del katalog.pozycje[0]
+    zdjeta = katalog.pozycje.pop()
+    katalog.pozycje[1:3] = [Pozycja(60, "Wstawiona", "Studio", "RPG", 2002)]
+    assert zdjeta is nowa
+    assert katalog.pobierz_pozycje(gry[0].id) is None
+    assert katalog.pobierz_pozycje(50) is None
+    assert katalog.pobierz_pozycje(gry[2].id) is None and katalog.pobierz_pozycje(gry[3].id) is None
+    assert katalog.pobierz_pozycje(60).tytul == "Wstawiona"
+    assert sorted(katalog._indeks_id) == sorted(p.id for p in katalog.pozycje)
+    
+    # ID zmienione na samym obiekcie - nieaktualny wpis przebudowuje indeks przy odczycie
+    gra = gry[5]
+    gra.id = 99
+    assert katalog.pobierz_pozycje(gry[6].id) is gry[6]
+    assert katalog.pobierz_pozycje(6) is None
+    assert katalog.pobierz_pozycje(99) is gra
+
+
+def test_indeks_id_po_wczytaniu(tmp_path):
+    sciezka = str(tmp_path / "katalog.json")
+    katalog_z_grami(sciezka, 100).zamknij()
+    katalog = Katalog(sciezka)
+    katalog.wczytaj()
+    assert [katalog.pobierz_pozycje(id).tytul for id in (1, 50, 100)] == ["Gra 0", "Gra 49", "Gra 99"]
+    assert katalog.usun_pozycje(50) and katalog.pobierz_pozycje(50) is None
+    assert not katalog.usun_pozycje(50)
+
+
+def test_nowe_gry_dostaja_najmniejsze_wolne_id(tmp_path):
+    katalog = katalog_z_grami(str(tmp_path / "katalog.json"), 30)
+    los = random.Random(3)
+    for _ in range(300):
+        rodzaj = los.random()
+        if rodzaj < 0.4 and katalog.pozycje:
+            assert katalog.usun_pozycje(los.choice(katalog.pozycje).id)
+        elif rodzaj < 0.5:
+            # Gra dopisana z pominięciem API zajmuje wolne ID
+            id = los.randint(1, 40)
+            if katalog.pobierz_pozycje(id) is None:
+                katalog.pozycje.append(Pozycja(id, "Bezpośrednio", "Studio", "RPG", 2000))
+        elif rodzaj < 0.6:
+            oczekiwane = najmniejsze_wolne_id(katalog, 3)
+            nowe = katalog.dodaj_wiele([("Partia", "Studio", "RPG", 2000)] * 3)
+            assert [p.id for p in nowe] == oczekiwane
+        else:
+            oczekiwane = najmniejsze_wolne_id(katalog)
+            assert [katalog.dodaj_pozycje("Nowa", "Studio", "RPG", 2000).id] == oczekiwane
+
+
+def test_luki_z_wczytanego_pliku_sa_wykorzystywane(tmp_path):
+    sciezka = str(tmp_path / "katalog.json")
+    katalog = katalog_z_grami(sciezka, 10)
+    for id in (2, 5, 9):
+        katalog.usun_pozycje(id)
+    katalog.zamknij()
+    
+    katalog = Katalog(sciezka)
+    katalog.wczytaj()
+    assert [katalog.dodaj_pozycje("Nowa", "Studio", "RPG", 2000).id for _ in range(5)] == [2, 5, 9, 11, 12]
+
+
+def test_migawka_nie_widzi_pozniejszych_zmian(tmp_path):
+    katalog = katalog_z_grami(str(tmp_path / "katalog.json"), 20)
+    los = random.Random(4)
+    migawki = []
+    zmiany = [
+        lambda lista: katalog.dodaj_pozycje("Nowa", "Studio", "RPG", 2000),
+        lambda lista: lista.extend([Pozycja(100 + len(lista), "Dopisana")]),
+        lambda lista: katalog.usun_pozycje(los.choice(lista).id),
+        lambda lista: lista.insert(3, Pozycja(200 + len(lista), "Wstawiona")),
+        lambda lista: lista.sort(key=lambda p: p.tytul),
+        lambda lista: lista.reverse(),
+        lambda lista: lista.__setitem__(slice(2, 5), [Pozycja(300 + len(lista), "Zamiast trzech")]),
+        lambda lista: lista.pop(0),
+    ]
+    for krok in range(40):
+        migawka = katalog.migawka()
+        migawki.append((migawka, list(katalog.pozycje), migawka.wersja))
+        zmiany[krok % len(zmiany)](katalog.pozycje)
+        for migawka, zawartosc, wersja in migawki:
+            assert list(migawka) == zawartosc and len(migawka) == len(zawartosc)
+            assert migawka[1:4] == zawartosc[1:4] and migawka[-1] is zawartosc[-1]
+            assert migawka.wersja == wersja
+    assert migawki[-1][2] < katalog.migawka().wersja
+    
+    # Dopisywanie na końcu nie kopiuje listy; pierwsza zmiana wcześniejszej części - tak
+    migawka = katalog.migawka()
+    katalog.dodaj_pozycje("Na końcu", "Studio", "RPG", 2000)
+    assert migawka._dane is katalog.pozycje
+    katalog.pozycje.clear()
+    assert migawka._dane is not katalog.pozycje and len(migawka) > 0
+    with pytest.raises(IndexError):
+        migawka[len(migawka)]
@@ -0,0 +1,339 @@
+"""
+===============================================================================
+PLIK: testy/test_magazyn.py
+OPIS: Testy współpracy katalogu z magazynami (JSON z dziennikiem, binarny, SQLite)
+===============================================================================
+"""
+
+import gzip
+import lzma
+import os
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from katalog import Katalog
+from magazyn import (Magazyn, MagazynBinarny, MagazynJSON, MagazynSQLite, MagazynWTle, konwertuj,
+                     utworz_magazyn, zapis_atomowy)
+from modele import OcenaGra, Pozycja
+
+
+def przykladowe_gry(liczba: int = 50) -> list:
+    """Gry z polskimi znakami, powtarzającymi się wydawcami i ocenami z różnymi datami"""
+    gry = []
+    for i in range(liczba):
+        gra = Pozycja(i + 1, f"Gra {i} – żółć \"cudzysłów\"", f"Wydawca {i % 4}",
+                      ["RPG", "Akcja", "Strategia"][i % 3], 1990 + i % 30)
+        for j in range(i % 5):
+            gra.dodaj_ocene(OcenaGra(1 + (i + j) % 10, datetime(2024, 1, 1 + j, 12, i % 60, 0, 1000 * j)))
+        gry.append(gra)
+    return gry
+
+
+def stan(pozycje) -> list:
+    """Wszystkie zapisywane dane gier (do porównań po odczycie)"""
+    return [(p.id, p.tytul, p.wydawca, p.gatunek, p.rok, [(o.wartosc, o.data_dodania) for o in p.oceny])
+            for p in pozycje]
+
+
+@pytest.mark.parametrize('nazwa, tryb_dziennika', [("nowy.db", False), ("nowy.json", True)])
+def test_zmiana_sciezki_zapisuje_caly_katalog(tmp_path, nazwa, tryb_dziennika):
+    katalog = Katalog(str(tmp_path / "katalog.json"), tryb_dziennika=tryb_dziennika)
+    katalog.dodaj_dane_testowe()
+    gra = katalog.wyszukaj("wiedźmin")[0]
+    liczba_gier = katalog.liczba_gier()
+    
+    katalog.sciezka_pliku = str(tmp_path / nazwa)
+    # Zapytania nie mogą korzystać z pustego jeszcze magazynu
+    assert katalog.wyszukaj("wiedźmin") == [gra]
+    assert len(katalog.filtruj_po_gatunku("RPG")) == 4
+    assert len(katalog.sortuj_po_ocenie()) == liczba_gier
+    assert katalog.dodaj_ocene(gra.id, 7)
+    katalog.zamknij()
+    
+    wczytany = Katalog(str(tmp_path / nazwa), tryb_dziennika=tryb_dziennika)
+    assert wczytany.wczytaj()
+    assert wczytany.liczba_gier() == liczba_gier
+    assert [o.wartosc for o in wczytany.pobierz_pozycje(gra.id).oceny] == [10, 10, 9, 7]
+    wczytany.zamknij()
+
+
+@pytest.mark.parametrize('zapis_w_tle', [None, 0.01])
+def test_niewczytany_magazyn_z_danymi_jest_zastepowany(tmp_path, zapis_w_tle):
+    sciezka = str(tmp_path / "katalog.db")
+    stary = Katalog(sciezka)
+    stary.dodaj_dane_testowe()
+    stary.zamknij()
+    
+    # Bez wczytaj() katalog jest pusty - pierwszy zapis zastępuje bazę (jak pełny zapis JSON)
+    katalog = Katalog(sciezka, zapis_w_tle=zapis_w_tle)
+    katalog.dodaj_pozycje("Nowa", "Studio", "RPG", 2020)
+    katalog.dodaj_ocene(1, 8)
+    katalog.zamknij()
+    
+    wczytany = Katalog(sciezka)
+    assert wczytany.wczytaj()
+    assert [(p.id, p.tytul, [o.wartosc for o in p.oceny]) for p in wczytany.pozycje] == [
+        (1, "Nowa", [8])]
+    wczytany.zamknij()
+
+
+def test_zapytania_na_sqlite_jak_na_json(tmp_path):
+    wyniki = []
+    for nazwa in ("katalog.json", "katalog.db"):
+        katalog = Katalog(str(tmp_path / nazwa))
+        katalog.dodaj_dane_testowe()
+        katalog.dodaj_ocene(katalog.wyszukaj("portal")[0].id, 1)
+        wyniki.append([[p.id for p in wynik] for wynik in (
+            katalog.wyszukaj("ŹDŹ"), katalog.wyszukaj("of", limit=3, offset=1),
+            katalog.filtruj_po_gatunku("RPG"), katalog.filtruj_po_roku(2015, 2017, limit=5),
+            katalog.sortuj_po_ocenie(), katalog.sortuj_po_ocenie(False, limit=10, offset=5))])
+        katalog.zamknij()
+    assert wyniki[0] == wyniki[1]
+
+
+def test_zapytania_sql_bez_wczytywania_bazy(tmp_path):
+    sciezka = str(tmp_path / "katalog.db")
+    katalog = Katalog(sciezka, zapis_w_tle=0.01)
+    katalog.dodaj_dane_testowe()
+    katalog.dodaj_ocene(katalog.wyszukaj("portal")[0].id, 1)
+    oczekiwane = [
+        ('wyszukaj', ("ŹDŹ",), {}, katalog.wyszukaj("ŹDŹ")),
+        ('wyszukaj', ("of",), {'limit': 3, 'offset': 1}, katalog.wyszukaj("of", limit=3, offset=1)),
+        ('gatunek', ("RPG",), {}, katalog.filtruj_po_gatunku("RPG")),
+        ('rok', (2015, 2017), {'limit': 5}, katalog.filtruj_po_roku(2015, 2017, limit=5)),
+        ('sortuj', (True,), {}, katalog.sortuj_po_ocenie()),
+        ('sortuj', (False,), {'limit': 10, 'offset': 5},
+         katalog.sortuj_po_ocenie(False, limit=10, offset=5))]
+    # Magazyn w tle najpierw zapisuje kolejkę zmian
+    assert [p.id for p in katalog.magazyn.zapytaj('gatunek', "RPG")] == [
+        p.id for p in katalog.filtruj_po_gatunku("RPG")]
+    katalog.zamknij()
+    
+    magazyn = MagazynSQLite(sciezka)
+    for zapytanie, argumenty, strona, wynik in oczekiwane:
+        z_bazy = magazyn.zapytaj(zapytanie, *argumenty, **strona)
+        assert [(p.id, p.tytul, [o.wartosc for o in p.oceny]) for p in z_bazy] == [
+            (p.id, p.tytul, [o.wartosc for o in p.oceny]) for p in wynik]
+    indeksy = {nazwa for (nazwa,) in magazyn.polaczenie.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {'idx_gry_gatunek', 'idx_gry_rok', 'idx_gry_tytul'} <= indeksy
+    plan = " ".join(str(w) for w in magazyn.polaczenie.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM gry WHERE gatunek = ? ORDER BY rowid", ("RPG",)))
+    assert 'idx_gry_gatunek' in plan
+    magazyn.zamknij()
+
+
+@pytest.mark.parametrize('tryb_dziennika', [False, True])
+def test_transakcja_odklada_opisy_tylko_dla_magazynu_przyrostowego(tmp_path, tryb_dziennika):
+    sciezka = str(tmp_path / "katalog.json")
+    katalog = Katalog(sciezka, tryb_dziennika=tryb_dziennika)
+    with katalog.transakcja():
+        katalog.dodaj_wiele({'tytul': f"Gra {i}", 'wydawca': "Studio", 'gatunek': "RPG",
+                             'rok': 2020, 'oceny': [5, 6]} for i in range(50))
+        katalog.dodaj_oceny_wiele((p.id, 7) for p in katalog.pobierz_wszystkie())
+        katalog.usun_pozycje(1)
+        assert len(katalog._odlozone) == (101 if tryb_dziennika else 1)
+    katalog.zamknij()
+    
+    wczytany = Katalog(sciezka, tryb_dziennika=tryb_dziennika)
+    assert wczytany.wczytaj()
+    assert wczytany.liczba_gier() == 49
+    assert all([o.wartosc for o in p.oceny] == [5, 6, 7] for p in wczytany.pozycje)
+
+
+@pytest.mark.parametrize('tryb_dziennika', [False, True])
+def test_transakcja_przerwana_wyjatkiem(tmp_path, tryb_dziennika):
+    sciezka = str(tmp_path / "katalog.json")
+    katalog = Katalog(sciezka, tryb_dziennika=tryb_dziennika)
+    katalog.dodaj_wiele([("Pierwsza", "Studio", "RPG", 2020), ("Druga", "Studio", "RPG", 2021)])
+    zapisy = []
+    zapisz_zmiany = katalog.magazyn.zapisz_zmiany
+    
+    def zapisz_liczac(rekordy, pozycje) -> None:
+        zapisy.append(len(rekordy))
+        zapisz_zmiany(rekordy, pozycje)
+    katalog.magazyn.zapisz_zmiany = zapisz_liczac
+    
+    with pytest.raises(ValueError):
+        with katalog.transakcja():
+            katalog.dodaj_pozycje("Trzecia", "Studio", "RPG", 2022)
+            katalog.dodaj_ocene(1, 8)
+            # Niepoprawne dane w operacjach zbiorczych: operacja nie zmienia niczego
+            with pytest.raises(ValueError):
+                katalog.dodaj_wiele([("Czwarta", "Studio", "RPG", 2022), ("", "Studio", "RPG", 2022)])
+            with pytest.raises(ValueError):
+                katalog.dodaj_oceny_wiele([(1, 9), (2, 11)])
+            assert katalog.liczba_gier() == 3 and zapisy == []
+            raise ValueError("błąd w bloku transakcji")
+    
+    # Zmiany sprzed wyjątku zostają i są utrwalone jednym zapisem
+    assert zapisy == [2 if tryb_dziennika else 1]
+    katalog.zamknij()
+    wczytany = Katalog(sciezka, tryb_dziennika=tryb_dziennika)
+    wczytany.wczytaj()
+    assert [(p.tytul, [o.wartosc for o in p.oceny]) for p in wczytany.pozycje] == [
+        ("Pierwsza", [8]), ("Druga", []), ("Trzecia", [])]
+
+
+class LiczacyMagazyn(Magazyn):
+    """Magazyn zapamiętujący serie zapisanych zmian"""
+    
+    def __init__(self):
+        super().__init__("brak")
+        self.zapisy = []
+    
+    def zapisz_zmiany(self, rekordy, pozycje):
+        self.zapisy.append([rekord['nr'] for rekord in rekordy])
+
+
+def test_zapis_w_tle_laczy_serie_zmian():
+    docelowy = LiczacyMagazyn()
+    magazyn = MagazynWTle(docelowy, opoznienie=0.2)
+    for nr in range(20):
+        magazyn.zapisz_zmiane({'nr': nr}, [])
+    assert docelowy.zapisy == []  # Nic przed upływem opóźnienia
+    time.sleep(0.6)
+    assert docelowy.zapisy == [list(range(20))]
+    
+    # oproznij zapisuje od razu, bez czekania na koniec serii
+    magazyn.zapisz_zmiany([{'nr': 20}, {'nr': 21}], [])
+    poczatek = time.monotonic()
+    magazyn.oproznij()
+    assert time.monotonic() - poczatek < 0.2
+    assert docelowy.zapisy[1:] == [[20, 21]]
+    
+    # Nieprzerwana seria jest zapisywana najpóźniej po MAKS_OPOZNIEN opóźnieniach
+    magazyn.opoznienie, magazyn.MAKS_OPOZNIEN = 0.1, 3
+    nr = 22
+    koniec = time.monotonic() + 0.9
+    while time.monotonic() < koniec:
+        magazyn.zapisz_zmiane({'nr': nr}, [])
+        nr += 1
+        time.sleep(0.02)
+    assert len(docelowy.zapisy) > 2
+    magazyn.zamknij()
+    assert sum(docelowy.zapisy, []) == list(range(nr))
+    with pytest.raises(RuntimeError):
+        magazyn.zapisz_zmiane({'nr': nr}, [])
+
+
+def test_zamkniecie_zapisu_w_tle_po_bledzie_konczy_watek(capsys):
+    class ZepsutyMagazyn(Magazyn):
+        proby = 0
+        
+        def zapisz_zmiany(self, rekordy, pozycje):
+            ZepsutyMagazyn.proby += 1
+            raise OSError("dysk niedostępny")
+    
+    magazyn = MagazynWTle(ZepsutyMagazyn("brak"), opoznienie=0.01)
+    magazyn.zapisz_zmiane({'op': 'zmiana'}, [])
+    bledy = []
+    
+    def zamknij() -> None:
+        try:
+            magazyn.zamknij()
+        except OSError as blad:
+            bledy.append(blad)
+    zamykanie = threading.Thread(target=zamknij, daemon=True)
+    zamykanie.start()
+    zamykanie.join(5)
+    assert not zamykanie.is_alive() and not magazyn._watek.is_alive()
+    assert len(bledy) == 1 and ZepsutyMagazyn.proby <= 3
+
+
+@pytest.mark.parametrize('tryb_dziennika', [False, True])
+def test_format_binarny_zachowuje_dane(tmp_path, tryb_dziennika):
+    sciezka = str(tmp_path / "katalog.bin")
+    gry = przykladowe_gry()
+    magazyn = utworz_magazyn(sciezka, tryb_dziennika)
+    assert type(magazyn) is MagazynBinarny
+    magazyn.zapisz(gry)
+    assert stan(MagazynBinarny(sciezka).wczytaj()) == stan(gry)
+    
+    katalog = Katalog(sciezka, tryb_dziennika=tryb_dziennika)
+    katalog.wczytaj()
+    katalog.dodaj_ocene(3, 10)
+    katalog.usun_pozycje(1)
+    katalog.dodaj_pozycje("Nowa", "Studio", "RPG", 2020)
+    katalog.zamknij()
+    wczytany = Katalog(sciezka, tryb_dziennika=tryb_dziennika)
+    wczytany.wczytaj()
+    assert stan(wczytany.pozycje) == stan(katalog.pozycje)
+    
+    # Przeniesienie JSON -> binarny -> JSON nie zmienia danych
+    assert konwertuj(sciezka, str(tmp_path / "kopia.json")) == len(katalog.pozycje)
+    konwertuj(str(tmp_path / "kopia.json"), str(tmp_path / "kopia.bin"))
+    assert stan(MagazynBinarny(str(tmp_path / "kopia.bin")).wczytaj()) == stan(katalog.pozycje)
+
+
+def test_format_binarny_odrzuca_obcy_plik(tmp_path):
+    sciezka = tmp_path / "katalog.bin"
+    sciezka.write_text('{"pozycje": []}', encoding='utf-8')
+    with pytest.raises(ValueError):
+        MagazynBinarny(str(sciezka)).wczytaj()
+
+
+def test_zapis_atomowy_z_pokoleniami(tmp_path):
+    sciezka = str(tmp_path / "plik.txt")
+    for wersja in range(1, 5):
+        with zapis_atomowy(sciezka, 'w', pokolenia=2, encoding='utf-8') as f:
+            f.write(f"wersja {wersja}")
+    zawartosc = {p.name: p.read_text(encoding='utf-8') for p in tmp_path.iterdir()}
+    assert zawartosc == {"plik.txt": "wersja 4", "plik.txt.1": "wersja 3", "plik.txt.2": "wersja 2"}
+    
+    # Błąd w trakcie zapisu: plik i jego pokolenia bez zmian, bez pliku tymczasowego
+    with pytest.raises(RuntimeError):
+        with zapis_atomowy(sciezka, 'w', pokolenia=2, encoding='utf-8') as f:
+            f.write("urwana wersja")
+            raise RuntimeError("awaria")
+    assert {p.name: p.read_text(encoding='utf-8') for p in tmp_path.iterdir()} == zawartosc
+
+
+def test_poprzednia_wersja_katalogu_da_sie_wczytac(tmp_path):
+    sciezka = str(tmp_path / "katalog.json")
+    gry = przykladowe_gry(10)
+    magazyn = MagazynJSON(sciezka)
+    magazyn.zapisz(gry[:5])
+    magazyn.zapisz(gry)
+    assert stan(MagazynJSON(sciezka).wczytaj()) == stan(gry)
+    assert stan(MagazynJSON(sciezka + ".1").wczytaj()) == stan(gry[:5])
+
+
+@pytest.mark.parametrize('nazwa, otworz', [("katalog.json.gz", gzip.open), ("katalog.json.xz", lzma.open)])
+def test_skompresowany_json_zachowuje_dane(tmp_path, nazwa, otworz):
+    sciezka = str(tmp_path / nazwa)
+    gry = przykladowe_gry(200)
+    magazyn = utworz_magazyn(sciezka, tryb_dziennika=True)
+    magazyn.zapisz(gry)
+    assert magazyn.kompaktowy
+    with otworz(sciezka, 'rt', encoding='utf-8') as f:
+        dokument = f.read()
+    assert '\n' not in dokument and len(dokument) > 3 * os.path.getsize(sciezka)
+    assert stan(MagazynJSON(sciezka).wczytaj()) == stan(gry)
+    
+    # Dziennik obok pliku skompresowanego jest zwykłym tekstem
+    katalog = Katalog(sciezka, tryb_dziennika=True)
+    katalog.wczytaj()
+    katalog.dodaj_ocene(5, 9)
+    katalog.usun_pozycje(7)
+    katalog.zamknij()
+    with open(sciezka + ".dziennik", encoding='utf-8') as f:
+        assert len(f.readlines()) == 2
+    wczytany = Katalog(sciezka, tryb_dziennika=True)
+    wczytany.wczytaj()
+    assert stan(wczytany.pozycje) == stan(katalog.pozycje)
+    wczytany.kompaktuj()
+    assert not os.path.exists(sciezka + ".dziennik")
+    assert stan(MagazynJSON(sciezka).wczytaj()) == stan(katalog.pozycje)
+
+
+def test_skompresowany_zapis_jest_powtarzalny(tmp_path):
+    gry = przykladowe_gry(20)
+    pliki = []
+    for nazwa in ("a.json.gz", "b.json.gz"):
+        MagazynJSON(str(tmp_path / nazwa)).zapisz(gry)
+        pliki.append((tmp_path / nazwa).read_bytes())
+    assert pliki[0] == pliki[1]
@@ -0,0 +1,156 @@
+"""
+===============================================================================
+PLIK: testy/test_modele.py
+OPIS: Testy modelu danych (kolumnowe oceny gry jako lista, agregaty ocen, opis gry)
+===============================================================================
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from modele import Pozycja, OcenaGra
+
+DATA = datetime(2024, 5, 1, 12, 30)
+
+
+def gra_z_ocenami(*wartosci: int) -> Pozycja:
+    gra = Pozycja(1, "Gra", "Studio", "RPG", 2020)
+    for i, wartosc in enumerate(wartosci):
+        gra.dodaj_ocene(OcenaGra(wartosc, DATA + timedelta(days=i)))
+    return gra
+
+
+def test_oceny_jak_lista():
+    gra = gra_z_ocenami(5, 9, 7)
+    oceny = gra.oceny
+    assert oceny[0] is oceny[0]
+    assert oceny == [OcenaGra(5, DATA), OcenaGra(9, DATA + timedelta(days=1)),
+                     OcenaGra(7, DATA + timedelta(days=2))]
+    
+    zachowana = oceny[2]
+    usunieta = oceny.pop(0)
+    assert usunieta.wartosc == 5 and usunieta.data_dodania == DATA
+    assert oceny[1] is zachowana
+    assert gra.srednia_ocena() == 8
+    
+    oceny.insert(0, OcenaGra(1, DATA))
+    oceny.sort(key=lambda o: o.wartosc, reverse=True)
+    assert [o.wartosc for o in oceny] == [9, 7, 1]
+    assert gra.najnizsza_ocena() == 1
+    
+    oceny.remove(OcenaGra(1, DATA))
+    oceny[1:] = [OcenaGra(3, DATA), OcenaGra(4, DATA)]
+    assert [o.wartosc for o in oceny] == [9, 3, 4]
+    assert gra.srednia_ocena() == pytest.approx(16 / 3)
+    del oceny[:]
+    assert not oceny and gra.srednia_ocena() == 0
+
+
+def test_odrzuca_niepoprawne_oceny():
+    gra = gra_z_ocenami(5)
+    for zla in (0, 11, 7.5, "abc", None):
+        with pytest.raises(ValueError):
+            gra.oceny.append(OcenaGra(zla, DATA))
+        with pytest.raises(ValueError):
+            gra.oceny[0] = OcenaGra(zla, DATA)
+    with pytest.raises(ValueError):
+        Pozycja.from_dict({'id': 1, 'tytul': "Gra", 'gatunek': "RPG", 'rok': 2020,
+                           'oceny': [{'wartosc': 12, 'data_dodania': DATA.isoformat()}]})
+    assert [o.wartosc for o in gra.oceny] == [5]
+
+
+def test_daty_ze_strefa_bez_zmian():
+    strefa = timezone(timedelta(hours=-5))
+    gra = gra_z_ocenami(8)
+    gra.dodaj_ocene(OcenaGra(6, DATA.replace(tzinfo=strefa)))
+    gra.oceny.insert(0, OcenaGra(7, DATA.replace(tzinfo=timezone.utc)))
+    
+    daty = [o.data_dodania for o in gra.oceny]
+    assert daty == [DATA.replace(tzinfo=timezone.utc), DATA, DATA.replace(tzinfo=strefa)]
+    assert [d.tzinfo for d in daty] == [timezone.utc, None, strefa]
+    wczytana = Pozycja.from_dict(gra.to_dict())
+    assert [o.data_dodania for o in wczytana.oceny] == daty
+    assert [o.data_dodania.tzinfo for o in wczytana.oceny] == [timezone.utc, None, strefa]
+
+
+def test_zmiany_w_miejscu_przesuwaja_widoki_i_strefy():
+    strefa = timezone(timedelta(hours=2))
+    gra = gra_z_ocenami(1, 2, 3, 4)
+    oceny = gra.oceny
+    oceny[2] = OcenaGra(9, DATA.replace(tzinfo=strefa))
+    trzecia, czwarta = oceny[2], oceny[3]
+    oceny.insert(1, OcenaGra(7, DATA))
+    assert oceny[3] is trzecia and oceny[4] is czwarta
+    assert trzecia.data_dodania.tzinfo is strefa
+    
+    pierwsza = oceny[0]
+    assert oceny.pop(0) is pierwsza and pierwsza.wartosc == 1
+    assert oceny.pop() is czwarta and czwarta.wartosc == 4
+    assert [o.wartosc for o in oceny] == [7, 2, 9]
+    assert oceny[2] is trzecia and oceny[2].data_dodania == DATA.replace(tzinfo=strefa)
+    assert gra.srednia_ocena() == 6
+
+
+def test_zwolnione_widoki_znikaja_z_pamieci_podrecznej():
+    gra = gra_z_ocenami(*[i % 10 + 1 for i in range(20_000)])
+    widoki = list(gra.oceny)
+    gra.oceny.sort(key=lambda o: o.wartosc)
+    assert widoki[0] is gra.oceny[widoki[0]._indeks]
+    del widoki
+    assert not gra.oceny._widoki
+
+
+def test_agregaty_zgodne_z_przeliczeniem_ocen():
+    los = random.Random(5)
+    gra = gra_z_ocenami()
+    for _ in range(2000):
+        oceny, rodzaj = gra.oceny, los.randrange(6)
+        if rodzaj == 0 or not oceny:
+            gra.dodaj_ocene(OcenaGra(los.randint(1, 10), DATA))
+        elif rodzaj == 1:
+            oceny.append(OcenaGra(los.randint(1, 10), DATA))
+        elif rodzaj == 2:
+            del oceny[los.randrange(len(oceny))]
+        elif rodzaj == 3:
+            oceny[los.randrange(len(oceny))] = OcenaGra(los.randint(1, 10), DATA)
+        elif rodzaj == 4:
+            oceny[los.randrange(len(oceny))].wartosc = los.randint(1, 10)
+        elif los.random() < 0.1:
+            gra.oceny = [OcenaGra(w, DATA) for w in los.choices(range(1, 11), k=los.randint(0, 5))]
+        
+        wartosci = [o.wartosc for o in gra.oceny]
+        assert gra.srednia_ocena() == (sum(wartosci) / len(wartosci) if wartosci else 0.0)
+        assert gra.najnizsza_ocena() == min(wartosci, default=0)
+        assert gra.najwyzsza_ocena() == max(wartosci, default=0)
+
+
+def test_zapamietany_opis_aktualny_po_zmianach():
+    def swiezy_opis(gra: Pozycja) -> str:
+        kopia = Pozycja(gra.id, gra.tytul, gra.wydawca, gra.gatunek, gra.rok)
+        kopia.oceny = [OcenaGra(o.wartosc, o.data_dodania) for o in gra.oceny]
+        return str(kopia)
+    
+    gra = gra_z_ocenami()
+    assert str(gra) == "[ID: 1] Gra | Studio | RPG (2020) | ☆☆☆☆☆"
+    assert str(gra) is str(gra)  # Tekst tworzony raz
+    
+    zmiany = [
+        lambda: gra.dodaj_ocene(OcenaGra(7, DATA)),
+        lambda: gra.oceny.append(OcenaGra(2, DATA)),
+        lambda: setattr(gra.oceny[0], 'wartosc', 10),
+        lambda: setattr(gra, 'tytul', "Nowy tytuł"),
+        lambda: setattr(gra, 'wydawca', "Inne studio"),
+        lambda: setattr(gra, 'gatunek', "Akcja"),
+        lambda: setattr(gra, 'rok', 1999),
+        lambda: setattr(gra, 'id', 42),
+        lambda: gra.oceny.clear(),
+    ]
+    for zmiana in zmiany:
+        zmiana()
+        assert str(gra) == swiezy_opis(gra)
+    assert str(gra) == "[ID: 42] Nowy tytuł | Inne studio | Akcja (1999) | ☆☆☆☆☆"
+    
+    gra.dodaj_ocene(OcenaGra(9, DATA))
+    assert gra.ocena_gwiazdkami() == "★★★★☆ (9.00/10)"
@@ -0,0 +1,91 @@
+"""
+===============================================================================
+PLIK: testy/test_statystyki.py
+OPIS: Testy raportu statystyk (pętle po tablicach array i NumPy)
+===============================================================================
+"""
+
+import collections
+import random
+import statistics
+
+import pytest
+
+import statystyki
+from katalog import Katalog
+from statystyki import KolumnyKatalogu, raport
+
+
+@pytest.fixture
+def katalog(tmp_path) -> Katalog:
+    katalog = Katalog(str(tmp_path / "katalog.json"))
+    los = random.Random(31)
+    katalog.dodaj_wiele({'tytul': f"Gra {i}", 'wydawca': "Studio",
+                         'gatunek': los.choice(Katalog.GATUNKI), 'rok': los.randint(1995, 2005),
+                         'oceny': los.choices(range(1, 11), k=los.choice([0, 1, 2, 7]))}
+                        for i in range(500))
+    return katalog
+
+
+def grupa(gry: list) -> dict:
+    srednie = [p.srednia_ocena() for p in gry if p.oceny]
+    return {
+        'liczba_gier': len(gry),
+        'ocenione': len(srednie),
+        'srednia': pytest.approx(statistics.fmean(srednie) if srednie else 0.0),
+        'odchylenie': pytest.approx(statistics.pstdev(srednie) if srednie else 0.0, abs=1e-9),
+    }
+
+
+def test_raport_zgodny_z_przegladem_gier(katalog):
+    wynik = raport(katalog.kolumny(), uzyj_numpy=False)
+    
+    pozycje = katalog.pozycje
+    srednie = [p.srednia_ocena() for p in pozycje if p.oceny]
+    assert wynik['liczba_gier'] == len(pozycje)
+    assert wynik['liczba_ocenionych'] == len(srednie)
+    assert wynik['liczba_ocen'] == sum(len(p.oceny) for p in pozycje)
+    assert wynik['srednia'] == pytest.approx(katalog.srednia_ocena_katalogu())
+    assert wynik['odchylenie'] == pytest.approx(statistics.pstdev(srednie))
+    # Interpolacja liniowa percentyli = kwantyle 'inclusive'
+    kwantyle = statistics.quantiles(srednie, n=100, method='inclusive')
+    assert wynik['percentyle'] == {p: pytest.approx(kwantyle[p - 1]) for p in statystyki.PERCENTYLE}
+    histogram = collections.Counter(o.wartosc for p in pozycje for o in p.oceny)
+    assert wynik['histogram'] == {ocena: histogram[ocena] for ocena in range(1, 11)}
+    
+    gatunki = collections.defaultdict(list)
+    lata = collections.defaultdict(list)
+    for p in pozycje:
+        gatunki[p.gatunek].append(p)
+        lata[p.rok].append(p)
+    assert wynik['gatunki'] == {g: grupa(gry) for g, gry in gatunki.items()}
+    assert wynik['lata'] == {rok: grupa(lata[rok]) for rok in sorted(lata)}
+    assert list(wynik['lata']) == sorted(lata)
+
+
+def test_pusty_katalog():
+    wynik = raport(KolumnyKatalogu(), uzyj_numpy=False)
+    assert wynik['liczba_gier'] == wynik['liczba_ocenionych'] == 0
+    assert wynik['srednia'] == 0.0 and wynik['percentyle'] == {}
+    assert wynik['gatunki'] == wynik['lata'] == {}
+
+
+def test_numpy_i_tablice_daja_te_same_wyniki(katalog):
+    if statystyki.np is None:
+        with pytest.raises(ImportError):
+            raport(katalog.kolumny(), uzyj_numpy=True)
+        pytest.skip("brak pakietu numpy")
+    
+    for kolumny in (katalog.kolumny(), katalog.kolumny(katalog.pozycje[:1]), KolumnyKatalogu()):
+        tablice = raport(kolumny, uzyj_numpy=False)
+        wektorowo = raport(kolumny, uzyj_numpy=True)
+        assert wektorowo.keys() == tablice.keys()
+        for klucz, wartosc in tablice.items():
+            if klucz in ('gatunki', 'lata'):
+                assert list(wektorowo[klucz]) == list(wartosc)
+                for nazwa, grupa_tablic in wartosc.items():
+                    assert wektorowo[klucz][nazwa] == pytest.approx(grupa_tablic, abs=1e-9)
+            elif klucz == 'percentyle':
+                assert wektorowo[klucz] == pytest.approx(wartosc)
+            else:
+                assert wektorowo[klucz] == pytest.approx(wartosc, abs=1e-9)
@@ -0,0 +1,60 @@
+"""
+===============================================================================
+PLIK: testy/test_wczytywanie.py
+OPIS: Testy stopniowego wczytywania katalogu (wczytuj_partiami)
+===============================================================================
+"""
+
+import pytest
+
+from katalog import Katalog
+
+LICZBA_GIER = 250
+
+
+def zapisany_katalog(sciezka: str, tryb_dziennika: bool) -> None:
+    """Tworzy zapisany katalog z LICZBA_GIER grami (część zmian w dzienniku)"""
+    katalog = Katalog(sciezka, tryb_dziennika=tryb_dziennika)
+    katalog.dodaj_wiele({'tytul': f"Gra {i}", 'wydawca': "Studio", 'gatunek': "RPG",
+                         'rok': 2000 + i % 20, 'oceny': [i % 10 + 1]}
+                        for i in range(LICZBA_GIER - 1))
+    katalog.zapisz()
+    katalog.dodaj_pozycje("Ostatnia", "Studio", "RPG", 2020)
+    katalog.zamknij()
+
+
+def liczba_gier_w(sciezka: str, tryb_dziennika: bool) -> int:
+    katalog = Katalog(sciezka, tryb_dziennika=tryb_dziennika)
+    assert katalog.wczytaj()
+    katalog.zamknij()
+    return katalog.liczba_gier()
+
+
+@pytest.mark.parametrize('tryb_dziennika', [False, True])
+@pytest.mark.parametrize('przerwij', [False, True])
+def test_zamkniecie_w_trakcie_wczytywania_nie_nadpisuje_magazynu(tmp_path, tryb_dziennika,
+                                                                   przerwij):
+    sciezka = str(tmp_path / "katalog.json")
+    zapisany_katalog(sciezka, tryb_dziennika)
+    
+    katalog = Katalog(sciezka, tryb_dziennika=tryb_dziennika)
+    wczytywanie = katalog.wczytuj_partiami(partia=100)
+    assert next(wczytywanie) == 100
+    if przerwij:
+        wczytywanie.close()  # Okno zamknięte w trakcie wczytywania
+    katalog.zamknij()
+    
+    assert liczba_gier_w(sciezka, tryb_dziennika) == LICZBA_GIER
+
+
+def test_katalog_po_wczytaniu_zapisuje_zmiany(tmp_path):
+    sciezka = str(tmp_path / "katalog.json")
+    zapisany_katalog(sciezka, tryb_dziennika=True)
+    
+    katalog = Katalog(sciezka, tryb_dziennika=True)
+    for _ in katalog.wczytuj_partiami(partia=100):
+        pass
+    katalog.dodaj_pozycje("Nowa", "Studio", "RPG", 2021)
+    katalog.zamknij()
+    
+    assert liczba_gier_w(sciezka, tryb_dziennika=True) == LICZBA_GIER + 1
@@ -0,0 +1,64 @@
+"""
+===============================================================================
+PLIK: testy/test_widzety.py
+OPIS: Testy własnych widżetów (lista wirtualna; pomijane bez ekranu dla Tk)
+===============================================================================
+"""
+
+import tkinter as tk
+
+import pytest
+
+from widzety import ListaWirtualna
+
+
+@pytest.fixture
+def okno():
+    try:
+        okno = tk.Tk()
+    except tk.TclError:
+        pytest.skip("brak ekranu dla Tk")
+    okno.geometry("400x300")
+    yield okno
+    okno.destroy()
+
+
+def test_lista_formatuje_tylko_widoczne_wiersze(okno):
+    sformatowane = []
+    
+    def formatuj(element: int) -> str:
+        sformatowane.append(element)
+        return f"Wiersz {element}"
+    
+    lista = ListaWirtualna(okno, formatuj=formatuj)
+    lista.pack(fill=tk.BOTH, expand=True)
+    okno.update()
+    lista.ustaw(range(100_000))
+    widoczne = lista._widoczne_wiersze()
+    assert lista.size() == 100_000
+    assert 1 < widoczne < 100
+    assert sorted(set(sformatowane)) == list(range(widoczne + 1))
+    
+    # Przewinięcie formatuje tylko nowo widoczne wiersze, powrót korzysta z zapamiętanych
+    sformatowane.clear()
+    lista.yview('moveto', 0.5)
+    assert sformatowane == list(range(50_000, 50_000 + widoczne + 1))
+    sformatowane.clear()
+    lista.yview('scroll', 1, 'pages')
+    lista.yview('scroll', -1, 'pages')
+    assert sformatowane == list(range(50_000 + widoczne + 1, 50_000 + 2 * widoczne + 1))
+    
+    zdarzenia = []
+    lista.bind('<<ListboxSelect>>', lambda e: zdarzenia.append(lista.curselection()))
+    lista.selection_set(99_999)
+    lista.see(99_999)
+    assert lista.curselection() == (99_999,)
+    assert lista._pierwszy == 100_000 - widoczne
+    lista._przesun_zaznaczenie(1)  # Strzałka w dół na ostatnim wierszu
+    assert zdarzenia == [(99_999,)]
+    
+    # Lista wydłużona z zachowaniem widoku nie traci zaznaczenia; nowe dane - traci
+    lista.ustaw(range(200_000), zachowaj_widok=True)
+    assert lista.curselection() == (99_999,) and lista._pierwszy == 100_000 - widoczne
+    lista.ustaw(range(10))
+    assert lista.curselection() == () and lista._pierwszy == 0
@@ -0,0 +1,158 @@
+"""
+===============================================================================
+PLIK: testy/test_wspolbieznosc.py
+OPIS: Testy katalogu wielowątkowego (blokada czytelników i pisarzy)
+===============================================================================
+"""
+
+import collections
+import random
+import threading
+import time
+
+from katalog import Katalog
+
+SLOWA = ["gra", "wojna", "smok", "miasto", "cien", "dom"]
+
+
+def katalog_wielowatkowy(sciezka: str, gier: int = 2000) -> Katalog:
+    katalog = Katalog(sciezka, zapis_w_tle=0.02, wielowatkowy=True)
+    los = random.Random(1)
+    katalog.dodaj_wiele({'tytul': f"{los.choice(SLOWA)} {i}", 'wydawca': "Studio",
+                         'gatunek': los.choice(Katalog.GATUNKI), 'rok': los.randint(1980, 2024),
+                         'oceny': [los.randint(1, 10) for _ in range(2)]}
+                        for i in range(gier))
+    return katalog
+
+
+def sprawdz_niezmienniki(katalog: Katalog) -> None:
+    """Spójność listy i indeksów w jednym, niezmiennym stanie katalogu"""
+    with katalog.blokada.czytanie():
+        lista = katalog.pozycje
+        ids = [p.id for p in lista]
+        assert len(set(ids)) == len(ids), "powtórzone ID"
+        assert len(lista) == len(katalog._indeks_id) == katalog.liczba_gier()
+        assert all(katalog._indeks_id[p.id] is p for p in lista)
+        assert sum(katalog.rozklad_gatunkow().values()) == len(lista)
+        assert (katalog._indeks_ocen.liczba_ocenionych()
+                == sum(1 for p in lista if p.oceny)), "ranking niezgodny z ocenami"
+
+
+def test_pobierz_pozycje_przebudowuje_indeksy_pod_blokada_zapisu(tmp_path):
+    katalog = katalog_wielowatkowy(str(tmp_path / "katalog.json"), 200)
+    przebudowy = []
+    przebuduj = katalog._przebuduj_indeksy
+    
+    def przebuduj_sprawdzajac() -> None:
+        przebudowy.append(katalog.blokada._pisarz == threading.get_ident())
+        przebuduj()
+    katalog._przebuduj_indeksy = przebuduj_sprawdzajac
+    
+    with katalog.blokada.pisanie():
+        gra = katalog.pozycje[10]
+        gra.id = 1000
+    # Wątek z blokadą odczytu nie może przebudować indeksów - szuka na liście
+    with katalog.blokada.czytanie():
+        assert katalog.pobierz_pozycje(11) is None
+        assert katalog.pobierz_pozycje(12) is katalog.pozycje[11]
+    assert przebudowy == []
+    
+    start = threading.Barrier(8)
+    wyniki = []
+    
+    def czytelnik() -> None:
+        start.wait()
+        wyniki.append(katalog.pobierz_pozycje(11))
+    watki = [threading.Thread(target=czytelnik) for _ in range(8)]
+    for watek in watki:
+        watek.start()
+    for watek in watki:
+        watek.join()
+    
+    # Jedna przebudowa pod blokadą zapisu, pozostałe wątki widzą aktualny indeks
+    assert przebudowy == [True]
+    assert wyniki == [None] * 8
+    assert katalog.pobierz_pozycje(1000) is gra
+    sprawdz_niezmienniki(katalog)
+    katalog.zamknij()
+
+
+def test_rownolegle_zapytania_i_zmiany_zachowuja_niezmienniki(tmp_path):
+    sciezka = str(tmp_path / "katalog.json")
+    katalog = katalog_wielowatkowy(sciezka)
+    katalog.zapisz()
+    chronione = [p.id for p in katalog.pozycje[:50]]  # Gry, których pisarze nie usuwają
+    poczatkowe = {id: len(katalog.pobierz_pozycje(id).oceny) for id in chronione}
+    stop = threading.Event()
+    bledy = []
+    oceny_watkow = []
+    
+    def pisarz(numer: int) -> None:
+        los = random.Random(numer)
+        dodane = []
+        while not stop.is_set():
+            if dodane and los.random() < 0.4:
+                assert katalog.usun_pozycje(dodane.pop(los.randrange(len(dodane))))
+            else:
+                dodane.append(katalog.dodaj_pozycje(f"Gra wątku {numer}", "Wydawca",
+                                                    los.choice(Katalog.GATUNKI),
+                                                    los.randint(1980, 2024)).id)
+    
+    def oceniajacy(numer: int) -> None:
+        los = random.Random(100 + numer)
+        moje = collections.Counter()
+        while not stop.is_set():
+            id = los.choice(chronione)
+            if katalog.dodaj_ocene(id, los.randint(1, 10)):
+                moje[id] += 1
+        oceny_watkow.append(moje)
+    
+    def czytelnik(numer: int) -> None:
+        los = random.Random(200 + numer)
+        operacje = 0
+        while not stop.is_set():
+            gatunek = los.choice(Katalog.GATUNKI)
+            rodzaj = operacje % 5
+            if rodzaj == 0:
+                katalog.wyszukaj(los.choice(SLOWA), limit=20)
+            elif rodzaj == 1:
+                assert katalog.statystyki()['liczba_gier'] >= 2000
+            elif rodzaj == 2:
+                katalog.kursor('gatunek', gatunek, rozmiar_strony=50).nastepna()
+            elif rodzaj == 3:
+                katalog.najlepsze(10, gatunek)
+            else:
+                sprawdz_niezmienniki(katalog)
+            operacje += 1
+    
+    def uruchom(funkcja, numer: int) -> None:
+        try:
+            funkcja(numer)
+        except BaseException as blad:
+            bledy.append(blad)
+            stop.set()
+    
+    funkcje = [czytelnik] * 3 + [pisarz] * 2 + [oceniajacy] * 2
+    watki = [threading.Thread(target=uruchom, args=(funkcja, numer))
+             for numer, funkcja in enumerate(funkcje)]
+    for watek in watki:
+        watek.start()
+    time.sleep(1.0)
+    stop.set()
+    for watek in watki:
+        watek.join()
+    katalog.zamknij()
+    if bledy:
+        raise bledy[0]
+    
+    sprawdz_niezmienniki(katalog)
+    dodane_oceny = sum(oceny_watkow, collections.Counter())
+    for id in chronione:
+        assert len(katalog.pobierz_pozycje(id).oceny) == poczatkowe[id] + dodane_oceny[id]
+    
+    # Zapis w tle korzystał z migawek - plik musi odpowiadać pamięci
+    wczytany = Katalog(sciezka)
+    wczytany.wczytaj()
+    assert [p.id for p in wczytany.pozycje] == [p.id for p in katalog.pozycje]
+    assert all(len(wczytany.pobierz_pozycje(id).oceny) == len(katalog.pobierz_pozycje(id).oceny)
+               for id in chronione)
@@ -0,0 +1,44 @@
+"""
+===============================================================================
+PLIK: testy/test_wymiana.py
+OPIS: Testy importu i eksportu CSV / JSON Lines
+===============================================================================
+"""
+
+import pytest
+
+from katalog import Katalog
+
+
+@pytest.mark.parametrize('nazwa, tresc, komunikat', [
+    ("gry.csv", "tytul,wydawca,gatunek,rok,oceny\nGra,Studio,RPG,2020,5\n"
+                "Gra," + "x" * 200_000 + ",RPG,2020,5\n", "Linia 3"),
+    ("gry.csv", b"tytul,wydawca,gatunek,rok\nGra,Studio,RPG,2020\n\xff\xfe,,,\n", "Linia 3"),
+    ("gry.jsonl", '{"tytul": "Gra", "wydawca": "S", "gatunek": "RPG", "rok": 2020}\n\n{"tytul":\n',
+     "Linia 3"),
+    ("gry.jsonl", '{"tytul": "Gra", "wydawca": "S", "gatunek": "RPG", "rok": 2020}\n[1, 2]\n',
+     "Linia 2"),
+    ("gry.jsonl", '{"tytul": "Gra", "wydawca": "S", "gatunek": "RPG", "rok": 2020, "oceny": 5}\n',
+     "Linia 1"),
+], ids=['csv-za-dlugie-pole', 'csv-nie-utf8', 'jsonl-uciety', 'jsonl-lista', 'jsonl-oceny'])
+def test_bledy_pliku_to_valueerror_z_numerem_linii(tmp_path, nazwa, tresc, komunikat):
+    sciezka = tmp_path / nazwa
+    if isinstance(tresc, bytes):
+        sciezka.write_bytes(tresc)
+    else:
+        sciezka.write_text(tresc, encoding='utf-8')
+    katalog = Katalog(str(tmp_path / "katalog.json"))
+    with pytest.raises(ValueError, match=komunikat):
+        katalog.importuj(str(sciezka))
+
+
+@pytest.mark.parametrize('nazwa', ["gry.csv", "gry.jsonl"])
+def test_eksport_i_import(tmp_path, nazwa):
+    zrodlo = Katalog(str(tmp_path / "zrodlo.json"))
+    zrodlo.dodaj_dane_testowe()
+    assert zrodlo.eksportuj(str(tmp_path / nazwa)) == zrodlo.liczba_gier()
+    
+    cel = Katalog(str(tmp_path / "cel.json"))
+    assert cel.importuj(str(tmp_path / nazwa)) == zrodlo.liczba_gier()
+    assert ([(p.tytul, [o.wartosc for o in p.oceny]) for p in cel.pozycje]
+            == [(p.tytul, [o.wartosc for o in p.oceny]) for p in zrodlo.pozycje])
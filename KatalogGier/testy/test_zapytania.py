@@ -0,0 +1,109 @@
+"""
+===============================================================================
+PLIK: testy/test_zapytania.py
+OPIS: Testy zapytań katalogu (strony wyników, kursor, najlepsze gry, składane zapytania)
+===============================================================================
+"""
+
+import random
+
+import pytest
+
+from katalog import Katalog
+from modele import Pozycja
+
+SLOWA = ["smok", "wojna", "miasto", "cień", "dom"]
+
+
+@pytest.fixture
+def katalog(tmp_path) -> Katalog:
+    katalog = Katalog(str(tmp_path / "katalog.json"))
+    los = random.Random(21)
+    katalog.dodaj_wiele({'tytul': f"{los.choice(SLOWA)} {i}", 'wydawca': "Studio",
+                         'gatunek': los.choice(Katalog.GATUNKI[:3]), 'rok': los.randint(1990, 2020),
+                         'oceny': los.choices(range(1, 11), k=los.randint(0, 3))}
+                        for i in range(400))
+    return katalog
+
+
+def test_strony_jak_wycinki_pelnych_wynikow(katalog):
+    zapytania = [
+        (katalog.pobierz_wszystkie, ()),
+        (katalog.wyszukaj, ("smok",)),
+        (katalog.filtruj_po_gatunku, ("Akcja",)),
+        (katalog.filtruj_po_roku, (2000, 2000)),
+        (katalog.filtruj_po_roku, (1990, 2015)),
+        (katalog.sortuj_po_ocenie, (False,)),
+    ]
+    for metoda, argumenty in zapytania:
+        wszystkie = metoda(*argumenty)
+        assert wszystkie
+        for offset, limit in [(0, 10), (7, 25), (len(wszystkie) - 3, 10), (len(wszystkie), 5)]:
+            assert metoda(*argumenty, limit=limit, offset=offset) == wszystkie[offset:offset + limit]
+
+
+def test_najlepsze_jak_poczatek_rankingu(katalog):
+    ocenione = sorted((p for p in katalog.pozycje if p.oceny), key=Pozycja.srednia_ocena, reverse=True)
+    assert katalog.najlepsze(15) == ocenione[:15]
+    assert katalog.najlepsze(len(katalog.pozycje)) == ocenione
+    for gatunek in Katalog.GATUNKI[:4]:
+        assert katalog.najlepsze(5, gatunek) == [p for p in ocenione if p.gatunek == gatunek][:5]
+
+
+def test_kursor_zwraca_kazda_gre_raz(katalog):
+    oczekiwane = katalog.filtruj_po_gatunku("RPG")
+    assert [p for strona in katalog.kursor('gatunek', "RPG", rozmiar_strony=30) for p in strona] == oczekiwane
+    
+    # Zmiana katalogu między stronami: strumień tworzony od nowa od miejsca, w którym skończono
+    kursor = katalog.kursor('gatunek', "RPG", rozmiar_strony=30)
+    pobrane = kursor.nastepna()
+    nowa = katalog.dodaj_pozycje("Dopisana", "Studio", "RPG", 2001)
+    for strona in kursor:
+        pobrane += strona
+    assert pobrane == oczekiwane + [nowa]
+    assert kursor.koniec and kursor.nastepna() == []
+    
+    with pytest.raises(ValueError):
+        katalog.kursor('nieznane')
+
+
+def test_skladane_zapytania_jak_przeglad_listy(katalog):
+    los = random.Random(22)
+    for _ in range(300):
+        zapytanie, warunki = katalog.zapytanie(), []
+        if los.random() < 0.5:
+            gatunek = los.choice(Katalog.GATUNKI[:4])
+            zapytanie = zapytanie.gatunek(gatunek)
+            warunki.append(lambda p, g=gatunek: p.gatunek == g)
+        if los.random() < 0.5:
+            od = los.randint(1988, 2020)
+            do = od + los.choice([0, 3, 30])
+            zapytanie = zapytanie.lata(od, do)
+            warunki.append(lambda p, od=od, do=do: od <= p.rok <= do)
+        if los.random() < 0.5:
+            fraza = los.choice(SLOWA + ["SMOK 1", "m", "brak"])
+            zapytanie = zapytanie.tytul_zawiera(fraza)
+            warunki.append(lambda p, f=fraza.lower(): f in p.tytul.lower())
+        oczekiwane = [p for p in katalog.pozycje if all(w(p) for w in warunki)]
+        if los.random() < 0.6:
+            malejaco = los.random() < 0.5
+            zapytanie = zapytanie.sortuj_ocena(malejaco)
+            ocenione = sorted((p for p in oczekiwane if p.oceny), key=Pozycja.srednia_ocena,
+                              reverse=malejaco)
+            oczekiwane = ocenione + [p for p in oczekiwane if not p.oceny]
+        
+        assert zapytanie.wykonaj() == oczekiwane, zapytanie.plan()
+        assert zapytanie.liczba() == len(oczekiwane)
+        offset, limit = los.randint(0, 20), los.choice([1, 5, 50])
+        strona = zapytanie.offset(offset).limit(limit)
+        assert strona.wykonaj() == oczekiwane[offset:offset + limit], strona.plan()
+        assert strona.liczba() == len(oczekiwane[offset:offset + limit])
+        # Rozbudowa zapytania nie zmienia poprzedniego
+        assert zapytanie.wykonaj() == oczekiwane
+
+
+def test_plan_wybiera_najwezszy_indeks(katalog):
+    rzadki = katalog.zapytanie().gatunek("RPG").tytul_zawiera("smok 12")
+    assert rzadki.plan().startswith("źródło: tytul")
+    assert katalog.zapytanie().lata(2005, 2005).gatunek("RPG").plan().startswith("źródło: lata")
+    assert "przegląd rankingu" in katalog.zapytanie().sortuj_ocena().limit(3).plan()
@@ -0,0 +1,196 @@
+"""
+===============================================================================
+PLIK: widzety.py
+OPIS: Własne widżety interfejsu aplikacji Katalog Gier
+===============================================================================
+"""
+
+import tkinter as tk
+from tkinter import font as tkfont
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+
+class ListaWirtualna(tk.Frame):
+    """
+    Lista rysująca tylko widoczne wiersze (zamiennik tk.Listbox dla dużych danych).
+
+    Elementy nie są kopiowane do widżetu - lista trzyma referencję do sekwencji
+    i formatuje wiersz dopiero wtedy, gdy ma on zostać narysowany. Udostępnia
+    podzbiór API Listboxa (curselection, selection_set, see, size) i generuje
+    zdarzenie <<ListboxSelect>> przy zmianie zaznaczenia.
+    """
+    
+    def __init__(self, parent, formatuj: Callable[[object], str] = str,
+                 font: Optional[tkfont.Font] = None, bg: str = 'white', fg: str = 'black',
+                 selectbackground: str = 'blue', selectforeground: str = 'white'):
+        """
+        Args:
+            parent: Widżet nadrzędny
+            formatuj: Funkcja zamieniająca element na tekst wiersza
+            font: Czcionka wierszy (obiekt tkinter.font.Font)
+            bg, fg: Kolory tła i tekstu
+            selectbackground, selectforeground: Kolory zaznaczonego wiersza
+        """
+        super().__init__(parent, bg=bg)
+        self.formatuj = formatuj
+        self.font = font or tkfont.nametofont('TkFixedFont')
+        self.kolory = {'bg': bg, 'fg': fg, 'sel_bg': selectbackground, 'sel_fg': selectforeground}
+        
+        self._elementy: Sequence = ()
+        self._teksty: Dict[int, str] = {}   # Sformatowane wiersze (tylko już narysowane)
+        self._pierwszy = 0                  # Indeks pierwszego widocznego wiersza
+        self._zaznaczony: Optional[int] = None
+        
+        self.scrollbar = tk.Scrollbar(self, command=self.yview, bg=bg)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        self.canvas = tk.Canvas(self, bg=bg, highlightthickness=0, borderwidth=0,
+                                takefocus=1)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        
+        self.canvas.bind('<Configure>', lambda e: self._rysuj())
+        self.canvas.bind('<Button-1>', self._on_klikniecie)
+        self.canvas.bind('<MouseWheel>', self._on_kolko)
+        self.canvas.bind('<Button-4>', lambda e: self.yview('scroll', -3, 'units'))
+        self.canvas.bind('<Button-5>', lambda e: self.yview('scroll', 3, 'units'))
+        self.canvas.bind('<Up>', lambda e: self._przesun_zaznaczenie(-1))
+        self.canvas.bind('<Down>', lambda e: self._przesun_zaznaczenie(1))
+        self.canvas.bind('<Prior>', lambda e: self._przesun_zaznaczenie(-self._widoczne_wiersze()))
+        self.canvas.bind('<Next>', lambda e: self._przesun_zaznaczenie(self._widoczne_wiersze()))
+    
+    # =========================================================================
+    # DANE
+    # =========================================================================
+    
+    def ustaw(self, elementy: Sequence, zachowaj_widok: bool = False) -> None:
+        """
+        Podmienia wyświetlane elementy (bez formatowania ich z góry)
+
+        Args:
+            elementy: Sekwencja elementów (indeksowanie + len)
+            zachowaj_widok: True = bez przewijania na początek i bez czyszczenia
+                            zaznaczenia (np. gdy lista tylko się wydłużyła)
+        """
+        self._elementy = elementy
+        self._teksty = {}
+        if not zachowaj_widok or (self._zaznaczony is not None
+                                  and self._zaznaczony >= len(elementy)):
+            self._zaznaczony = None
+        if not zachowaj_widok:
+            self._pierwszy = 0
+        self._rysuj()
+    
+    def odswiez(self) -> None:
+        """Ponownie formatuje i rysuje widoczne wiersze (np. po zmianie ocen)"""
+        self._teksty = {}
+        self._rysuj()
+    
+    def size(self) -> int:
+        """Liczba elementów listy"""
+        return len(self._elementy)
+    
+    # =========================================================================
+    # ZAZNACZENIE (API zgodne z tk.Listbox)
+    # =========================================================================
+    
+    def curselection(self) -> Tuple[int, ...]:
+        """Zwraca krotkę z indeksem zaznaczonego wiersza (lub pustą)"""
+        return () if self._zaznaczony is None else (self._zaznaczony,)
+    
+    def selection_set(self, indeks: int) -> None:
+        """Zaznacza wiersz o podanym indeksie"""
+        if 0 <= indeks < self.size():
+            self._zaznaczony = indeks
+            self._rysuj()
+    
+    def selection_clear(self, *_) -> None:
+        """Usuwa zaznaczenie"""
+        self._zaznaczony = None
+        self._rysuj()
+    
+    def see(self, indeks: int) -> None:
+        """Przewija listę tak, aby wiersz był widoczny"""
+        widoczne = self._widoczne_wiersze()
+        if indeks < self._pierwszy:
+            self._pierwszy = indeks
+        elif indeks >= self._pierwszy + widoczne:
+            self._pierwszy = indeks - widoczne + 1
+        self._rysuj()
+    
+    # =========================================================================
+    # PRZEWIJANIE I RYSOWANIE
+    # =========================================================================
+    
+    def _wysokosc_wiersza(self) -> int:
+        return self.font.metrics('linespace') + 2
+    
+    def _widoczne_wiersze(self) -> int:
+        return max(self.canvas.winfo_height() // self._wysokosc_wiersza(), 1)
+    
+    def yview(self, *argumenty) -> None:
+        """Obsługuje polecenia paska przewijania ('moveto' i 'scroll')"""
+        if not argumenty:
+            return
+        widoczne = self._widoczne_wiersze()
+        if argumenty[0] == 'moveto':
+            self._pierwszy = int(float(argumenty[1]) * self.size())
+        elif argumenty[0] == 'scroll':
+            krok = int(argumenty[1])
+            self._pierwszy += krok * (widoczne if argumenty[2] == 'pages' else 1)
+        self._rysuj()
+    
+    def _rysuj(self) -> None:
+        """Rysuje wyłącznie wiersze mieszczące się w oknie"""
+        liczba = self.size()
+        widoczne = self._widoczne_wiersze()
+        self._pierwszy = max(0, min(self._pierwszy, liczba - widoczne))
+        
+        self.canvas.delete('wiersz')
+        wysokosc = self._wysokosc_wiersza()
+        szerokosc = self.canvas.winfo_width()
+        koniec = min(self._pierwszy + widoczne + 1, liczba)
+        
+        for indeks in range(self._pierwszy, koniec):
+            tekst = self._teksty.get(indeks)
+            if tekst is None:
+                tekst = self._teksty[indeks] = self.formatuj(self._elementy[indeks])
+            
+            y = (indeks - self._pierwszy) * wysokosc
+            kolor_tekstu = self.kolory['fg']
+            if indeks == self._zaznaczony:
+                self.canvas.create_rectangle(0, y, szerokosc, y + wysokosc, width=0,
+                                             fill=self.kolory['sel_bg'], tags='wiersz')
+                kolor_tekstu = self.kolory['sel_fg']
+            self.canvas.create_text(4, y + 1, text=tekst, anchor='nw', font=self.font,
+                                    fill=kolor_tekstu, tags='wiersz')
+        
+        if liczba:
+            self.scrollbar.set(self._pierwszy / liczba, min(koniec / liczba, 1.0))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+    
+    # =========================================================================
+    # ZDARZENIA
+    # =========================================================================
+    
+    def _on_klikniecie(self, event) -> None:
+        self.canvas.focus_set()
+        indeks = self._pierwszy + event.y // self._wysokosc_wiersza()
+        if indeks < self.size():
+            self._zmien_zaznaczenie(indeks)
+    
+    def _on_kolko(self, event) -> None:
+        self.yview('scroll', -1 if event.delta > 0 else 1, 'units')
+    
+    def _przesun_zaznaczenie(self, o: int) -> None:
+        if not self.size():
+            return
+        indeks = 0 if self._zaznaczony is None else self._zaznaczony + o
+        indeks = max(0, min(indeks, self.size() - 1))
+        self._zmien_zaznaczenie(indeks)
+        self.see(indeks)
+    
+    def _zmien_zaznaczenie(self, indeks: int) -> None:
+        self._zaznaczony = indeks
+        self._rysuj()
+        self.event_generate('<<ListboxSelect>>')
@@ -0,0 +1,186 @@
+"""
+===============================================================================
+PLIK: wspolbieznosc.py
+OPIS: Blokada czytelników i pisarzy dla katalogu używanego z wielu wątków
+===============================================================================
+"""
+
+import functools
+import threading
+from typing import Callable, Dict, Optional
+
+
+class _Sekcja:
+    """Menedżer kontekstu wywołujący podane funkcje przy wejściu i wyjściu"""
+    
+    __slots__ = ('_wejscie', '_wyjscie')
+    
+    def __init__(self, wejscie: Callable[[], None], wyjscie: Callable[[], None]):
+        self._wejscie = wejscie
+        self._wyjscie = wyjscie
+    
+    def __enter__(self) -> None:
+        self._wejscie()
+    
+    def __exit__(self, *_) -> None:
+        self._wyjscie()
+
+
+class BlokadaRW:
+    """
+    Blokada czytelników i pisarzy (wielu czytelników naraz albo jeden pisarz).
+
+    Pisarze mają pierwszeństwo: nowy czytelnik czeka, gdy pisarz czeka na
+    wejście, więc ciągły strumień zapytań nie zagłodzi zmian. Blokada jest
+    wielowejściowa w obrębie wątku - pisarz może ponownie wejść jako pisarz
+    lub czytelnik (np. metoda zmieniająca katalog wywołuje zapytanie),
+    a czytelnik ponownie jako czytelnik. Czytelnik nie może stać się
+    pisarzem - to prowadziłoby do zakleszczenia dwóch takich wątków.
+
+    Użycie:
+        with blokada.czytanie(): ...
+        with blokada.pisanie(): ...
+    """
+    
+    def __init__(self):
+        """Konstruktor wolnej blokady"""
+        # Warunek korzysta z tego samego zamka; `with self._zamek` jest szybsze
+        # niż `with self._warunek` (bez wywołań metod Pythona)
+        self._zamek = threading.Lock()
+        self._warunek = threading.Condition(self._zamek)
+        # id wątku -> liczba zagnieżdżonych wejść czytelnika
+        self._czytelnicy: Dict[int, int] = {}
+        self._pisarz: Optional[int] = None
+        self._wejscia_pisarza = 0
+        self._czekajacy_pisarze = 0
+        self._czytanie = _Sekcja(self.zablokuj_czytanie, self.zwolnij_czytanie)
+        self._pisanie = _Sekcja(self.zablokuj_pisanie, self.zwolnij_pisanie)
+    
+    def czytanie(self) -> _Sekcja:
+        """Menedżer kontekstu dostępu współdzielonego (zapytania)"""
+        return self._czytanie
+    
+    def pisanie(self) -> _Sekcja:
+        """Menedżer kontekstu dostępu wyłącznego (zmiany)"""
+        return self._pisanie
+    
+    def czyta_bez_pisania(self) -> bool:
+        """Czy bieżący wątek ma blokadę odczytu bez blokady zapisu (nie może zmieniać)"""
+        watek = threading.get_ident()
+        with self._zamek:
+            return watek in self._czytelnicy and self._pisarz != watek
+    
+    # =========================================================================
+    # CZYTELNICY
+    # =========================================================================
+    
+    def zablokuj_czytanie(self) -> None:
+        """Czeka na dostęp współdzielony"""
+        watek = threading.get_ident()
+        with self._zamek:
+            if watek in self._czytelnicy or self._pisarz == watek:
+                self._czytelnicy[watek] = self._czytelnicy.get(watek, 0) + 1
+                return
+            while self._pisarz is not None or self._czekajacy_pisarze:
+                self._warunek.wait()
+            self._czytelnicy[watek] = 1
+    
+    def zwolnij_czytanie(self) -> None:
+        """
+        Zwalnia dostęp współdzielony
+
+        Raises:
+            RuntimeError: Gdy wątek nie jest czytelnikiem
+        """
+        watek = threading.get_ident()
+        with self._zamek:
+            wejscia = self._czytelnicy.get(watek)
+            if wejscia is None:
+                raise RuntimeError("Wątek nie posiada blokady odczytu")
+            if wejscia > 1:
+                self._czytelnicy[watek] = wejscia - 1
+                return
+            del self._czytelnicy[watek]
+            # Na wyjście ostatniego czytelnika czekają tylko pisarze
+            if not self._czytelnicy and self._czekajacy_pisarze:
+                self._warunek.notify_all()
+    
+    # =========================================================================
+    # PISARZE
+    # =========================================================================
+    
+    def zablokuj_pisanie(self) -> None:
+        """
+        Czeka na dostęp wyłączny
+
+        Raises:
+            RuntimeError: Gdy wątek jest czytelnikiem (bez pisania)
+        """
+        watek = threading.get_ident()
+        with self._zamek:
+            if self._pisarz == watek:
+                self._wejscia_pisarza += 1
+                return
+            if watek in self._czytelnicy:
+                raise RuntimeError("Nie można zmieniać katalogu wewnątrz blokady odczytu")
+            self._czekajacy_pisarze += 1
+            try:
+                while self._pisarz is not None or self._czytelnicy:
+                    self._warunek.wait()
+            except BaseException:
+                # Przerwane czekanie - wstrzymani czytelnicy mogą wejść
+                self._czekajacy_pisarze -= 1
+                self._warunek.notify_all()
+                raise
+            self._czekajacy_pisarze -= 1
+            self._pisarz = watek
+            self._wejscia_pisarza = 1
+    
+    def zwolnij_pisanie(self) -> None:
+        """
+        Zwalnia dostęp wyłączny
+
+        Raises:
+            RuntimeError: Gdy wątek nie jest pisarzem
+        """
+        with self._zamek:
+            if self._pisarz != threading.get_ident():
+                raise RuntimeError("Wątek nie posiada blokady zapisu")
+            self._wejscia_pisarza -= 1
+            if not self._wejscia_pisarza:
+                self._pisarz = None
+                self._warunek.notify_all()
+
+
+# =============================================================================
+# DEKORATORY METOD
+# =============================================================================
+
+def pod_odczytem(metoda: Callable) -> Callable:
+    """Wykonuje metodę pod blokadą odczytu obiektu (atrybut `blokada`, None = bez blokady)"""
+    @functools.wraps(metoda)
+    def opakowana(self, *argumenty, **opcje):
+        blokada = self.blokada
+        if blokada is None:
+            return metoda(self, *argumenty, **opcje)
+        blokada.zablokuj_czytanie()
+        try:
+            return metoda(self, *argumenty, **opcje)
+        finally:
+            blokada.zwolnij_czytanie()
+    return opakowana
+
+
+def pod_pisaniem(metoda: Callable) -> Callable:
+    """Wykonuje metodę pod blokadą zapisu obiektu (atrybut `blokada`, None = bez blokady)"""
+    @functools.wraps(metoda)
+    def opakowana(self, *argumenty, **opcje):
+        blokada = self.blokada
+        if blokada is None:
+            return metoda(self, *argumenty, **opcje)
+        blokada.zablokuj_pisanie()
+        try:
+            return metoda(self, *argumenty, **opcje)
+        finally:
+            blokada.zwolnij_pisanie()
+    return opakowana
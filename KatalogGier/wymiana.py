@@ -0,0 +1,210 @@
+"""
+===============================================================================
+PLIK: wymiana.py
+OPIS: Strumieniowy import i eksport gier w formatach CSV i JSON Lines
+===============================================================================
+"""
+
+import csv
+import json
+import os
+from typing import BinaryIO, Callable, Iterable, Iterator, Optional
+
+from magazyn import zapis_atomowy
+from modele import Pozycja
+
+# Funkcja postępu: postep(wykonano, razem) - dla odczytu w bajtach, dla zapisu w grach
+Postep = Callable[[int, int], None]
+
+# Co ile gier zgłaszany jest postęp
+CO_ILE = 1000
+
+KOLUMNY_CSV = ('id', 'tytul', 'wydawca', 'gatunek', 'rok', 'oceny')
+
+ROZSZERZENIA = ('.csv', '.jsonl')
+
+
+def _format(sciezka: str) -> str:
+    """
+    Rozpoznaje format pliku po rozszerzeniu
+
+    Raises:
+        ValueError: Gdy rozszerzenie nie jest obsługiwane
+    """
+    rozszerzenie = os.path.splitext(sciezka)[1].lower()
+    if rozszerzenie not in ROZSZERZENIA:
+        raise ValueError(f"Nieobsługiwany format pliku: {rozszerzenie or sciezka} "
+                         f"(obsługiwane: {', '.join(ROZSZERZENIA)})")
+    return rozszerzenie
+
+
+# =============================================================================
+# ODCZYT
+# =============================================================================
+
+def czytaj(sciezka: str, postep: Optional[Postep] = None) -> Iterator[dict]:
+    """
+    Czyta gry z pliku CSV lub JSON Lines, po jednej
+
+    Plik nie jest wczytywany w całości - w pamięci jest tylko bieżący wiersz.
+
+    Args:
+        sciezka: Ścieżka pliku (.csv lub .jsonl)
+        postep: Funkcja postępu (przeczytane bajty, rozmiar pliku)
+
+    Returns:
+        Generator słowników {'tytul', 'wydawca', 'gatunek', 'rok', 'oceny'}
+        w postaci przyjmowanej przez Katalog.dodaj_wiele
+
+    Raises:
+        ValueError: Gdy format pliku nie jest obsługiwany
+    """
+    czytnik = czytaj_csv if _format(sciezka) == '.csv' else czytaj_jsonl
+    return czytnik(sciezka, postep)
+
+
+def _z_postepem(plik: BinaryIO, wpisy: Iterator[dict],
+                postep: Optional[Postep]) -> Iterator[dict]:
+    """Przekazuje wpisy dalej, zgłaszając co CO_ILE wpisów pozycję w pliku"""
+    if postep is None:
+        yield from wpisy
+        return
+    razem = os.fstat(plik.fileno()).st_size
+    for nr, wpis in enumerate(wpisy, 1):
+        yield wpis
+        if nr % CO_ILE == 0:
+            postep(plik.tell(), razem)
+    postep(razem, razem)
+
+
+def _linie(plik: BinaryIO) -> Iterator[str]:
+    """
+    Dekoduje plik UTF-8 linia po linii (bez znacznika BOM)
+
+    Raises:
+        ValueError: Gdy linia nie jest w UTF-8 (z numerem linii)
+    """
+    for nr, linia in enumerate(plik, 1):
+        try:
+            tekst = linia.decode('utf-8-sig' if nr == 1 else 'utf-8')
+        except UnicodeDecodeError:
+            raise ValueError(f"Linia {nr}: plik nie jest w kodowaniu UTF-8")
+        yield tekst
+
+
+def czytaj_csv(sciezka: str, postep: Optional[Postep] = None) -> Iterator[dict]:
+    """
+    Czyta gry z pliku CSV z nagłówkiem (kolumny jak w KOLUMNY_CSV)
+
+    Kolumna 'oceny' zawiera wartości ocen oddzielone spacjami; kolumna 'id'
+    jest ignorowana - importowane gry dostają nowe ID.
+
+    Raises:
+        ValueError: Gdy plik nie jest poprawnym CSV w UTF-8 (z numerem linii)
+    """
+    with open(sciezka, 'rb') as plik:
+        wiersze = csv.DictReader(_linie(plik))
+        
+        def wpisy() -> Iterator[dict]:
+            try:
+                for wiersz in wiersze:
+                    yield {
+                        'tytul': wiersz.get('tytul') or '',
+                        'wydawca': wiersz.get('wydawca') or '',
+                        'gatunek': wiersz.get('gatunek') or '',
+                        'rok': wiersz.get('rok') or '',
+                        'oceny': (wiersz.get('oceny') or '').split(),
+                    }
+            except csv.Error as e:
+                raise ValueError(f"Linia {wiersze.reader.line_num}: niepoprawny CSV ({e})")
+        yield from _z_postepem(plik, wpisy(), postep)
+
+
+def czytaj_jsonl(sciezka: str, postep: Optional[Postep] = None) -> Iterator[dict]:
+    """
+    Czyta gry z pliku JSON Lines (jeden obiekt Pozycja.to_dict() w linii)
+
+    Puste linie są pomijane. Oceny zachowują daty dodania.
+
+    Raises:
+        ValueError: Gdy linia nie jest obiektem gry w poprawnym JSON-ie
+                    lub plik nie jest w UTF-8 (z numerem linii)
+    """
+    with open(sciezka, 'rb') as plik:
+        def wpisy() -> Iterator[dict]:
+            for nr, linia in enumerate(_linie(plik), 1):
+                if not linia.strip():
+                    continue
+                try:
+                    wpis = json.loads(linia)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"Linia {nr}: niepoprawny JSON ({e.msg})")
+                if not isinstance(wpis, dict):
+                    raise ValueError(f"Linia {nr}: oczekiwano obiektu gry, "
+                                     f"a jest {type(wpis).__name__}")
+                if not isinstance(wpis.get('oceny', []), list):
+                    raise ValueError(f"Linia {nr}: pole 'oceny' musi być listą")
+                yield wpis
+        yield from _z_postepem(plik, wpisy(), postep)
+
+
+# =============================================================================
+# ZAPIS
+# =============================================================================
+
+def eksportuj(pozycje: Iterable[Pozycja], sciezka: str,
+              postep: Optional[Postep] = None) -> int:
+    """
+    Zapisuje gry do pliku CSV lub JSON Lines, po jednej
+
+    Args:
+        pozycje: Gry do zapisania (dowolny iterowalny obiekt, np. generator)
+        sciezka: Ścieżka pliku (.csv lub .jsonl)
+        postep: Funkcja postępu (zapisane gry, liczba gier lub 0 gdy nieznana)
+
+    Returns:
+        Liczba zapisanych gier
+
+    Raises:
+        ValueError: Gdy format pliku nie jest obsługiwany
+    """
+    zapis = eksportuj_csv if _format(sciezka) == '.csv' else eksportuj_jsonl
+    return zapis(pozycje, sciezka, postep)
+
+
+def _zapisz_wiersze(wiersze: Iterator, zapisz: Callable, razem: int,
+                    postep: Optional[Postep]) -> int:
+    """Zapisuje kolejne wiersze, zgłaszając postęp co CO_ILE gier"""
+    liczba = 0
+    for liczba, wiersz in enumerate(wiersze, 1):
+        zapisz(wiersz)
+        if postep is not None and liczba % CO_ILE == 0:
+            postep(liczba, razem)
+    if postep is not None:
+        postep(liczba, razem or liczba)
+    return liczba
+
+
+def eksportuj_csv(pozycje: Iterable[Pozycja], sciezka: str,
+                  postep: Optional[Postep] = None) -> int:
+    """
+    Zapisuje gry do pliku CSV (oceny jako wartości oddzielone spacjami, bez dat)
+    """
+    razem = len(pozycje) if hasattr(pozycje, '__len__') else 0
+    with zapis_atomowy(sciezka, 'w', encoding='utf-8', newline='') as plik:
+        zapis = csv.writer(plik)
+        zapis.writerow(KOLUMNY_CSV)
+        wiersze = ((p.id, p.tytul, p.wydawca, p.gatunek, p.rok,
+                    ' '.join(map(str, p.oceny.wartosci))) for p in pozycje)
+        return _zapisz_wiersze(wiersze, zapis.writerow, razem, postep)
+
+
+def eksportuj_jsonl(pozycje: Iterable[Pozycja], sciezka: str,
+                    postep: Optional[Postep] = None) -> int:
+    """
+    Zapisuje gry do pliku JSON Lines (Pozycja.to_dict() w każdej linii)
+    """
+    razem = len(pozycje) if hasattr(pozycje, '__len__') else 0
+    with zapis_atomowy(sciezka, 'w', encoding='utf-8') as plik:
+        linie = (json.dumps(p.to_dict(), ensure_ascii=False) + '\n' for p in pozycje)
+        return _zapisz_wiersze(linie, plik.write, razem, postep)
@@ -0,0 +1,273 @@
+"""
+===============================================================================
+PLIK: zapytania.py
+OPIS: Leniwe, składane zapytania do katalogu (filtry + sortowanie + strony)
+===============================================================================
+"""
+
+import copy
+import heapq
+from itertools import islice
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from modele import Pozycja
+
+
+class Kursor:
+    """
+    Stronicowanie wyników zapytania bez kopiowania całej listy.
+
+    Kolejne strony pobierane są z tego samego, leniwego strumienia wyników.
+    Jeżeli katalog zmienił się między stronami, strumień jest tworzony od
+    nowa i przewijany o liczbę już zwróconych gier (jak przy offset).
+    """
+    
+    def __init__(self, katalog: 'Katalog', zrodlo: Callable[[], Iterator[Pozycja]],
+                 rozmiar_strony: int = 50):
+        """
+        Args:
+            katalog: Przeglądany katalog
+            zrodlo: Funkcja tworząca strumień wyników zapytania
+            rozmiar_strony: Liczba gier na stronie
+        """
+        self._katalog = katalog
+        self._zrodlo = zrodlo
+        self.rozmiar_strony = rozmiar_strony
+        self.pobrane = 0
+        self.koniec = False
+        with katalog._czytanie():
+            self._strumien = zrodlo()
+            self._wersja = katalog._wersja
+    
+    def nastepna(self) -> List[Pozycja]:
+        """
+        Zwraca kolejną stronę wyników
+        
+        Returns:
+            Lista gier (pusta, gdy wyniki się skończyły)
+        """
+        if self.koniec:
+            return []
+        # Strona czytana w całości pod blokadą odczytu katalogu wielowątkowego
+        with self._katalog._czytanie():
+            if self._wersja != self._katalog._wersja:
+                self._strumien = islice(self._zrodlo(), self.pobrane, None)
+                self._wersja = self._katalog._wersja
+            strona = list(islice(self._strumien, self.rozmiar_strony))
+        self.pobrane += len(strona)
+        if len(strona) < self.rozmiar_strony:
+            self.koniec = True
+        return strona
+    
+    def __iter__(self) -> Iterator[List[Pozycja]]:
+        """Przegląda wszystkie pozostałe strony"""
+        while True:
+            strona = self.nastepna()
+            if not strona:
+                return
+            yield strona
+
+
+def _klucz_oceny(malejaco: bool) -> Callable[[Pozycja], tuple]:
+    """Klucz sortowania jak w rankingu: gry bez ocen zawsze na końcu"""
+    if malejaco:
+        return lambda p: (not p.oceny, -p.srednia_ocena())
+    return lambda p: (not p.oceny, p.srednia_ocena())
+
+
+# Rodzaj filtra -> (zapytanie Katalog._strumien, oszacowanie liczby kandydatów, predykat)
+FILTRY = {
+    'gatunek': (
+        'gatunek',
+        lambda katalog, gatunek: katalog._indeks_gatunkow.liczba(gatunek),
+        lambda gatunek: lambda p: p.gatunek == gatunek,
+    ),
+    'lata': (
+        'rok',
+        lambda katalog, od, do: katalog._indeks_lat.liczba_w_zakresie(od, do),
+        lambda od, do: lambda p: od <= p.rok <= do,
+    ),
+    'tytul': (
+        'wyszukaj',
+        lambda katalog, fraza: katalog._indeks_tytulow.oszacuj(fraza),
+        lambda fraza: (lambda f: lambda p: f in p.tytul.lower())(fraza.lower()),
+    ),
+}
+
+
+class Zapytanie:
+    """
+    Zapytanie budowane łańcuchowo, np.:
+
+        katalog.zapytanie().gatunek("RPG").lata(2010, 2020) \\
+               .tytul_zawiera("ring").sortuj_ocena().limit(50).wykonaj()
+
+    Każda metoda zwraca nowe zapytanie (poprzednie można dalej rozbudowywać).
+    Nic nie jest liczone do chwili iteracji: wtedy wybierany jest indeks
+    dający najmniej kandydatów, pozostałe filtry sprawdzane są na kandydatach
+    w generatorze, a lista powstaje dopiero w wykonaj().
+    """
+    
+    def __init__(self, katalog: 'Katalog'):
+        """
+        Args:
+            katalog: Katalog, którego dotyczy zapytanie
+        """
+        self._katalog = katalog
+        self._filtry: List[Tuple[str, tuple]] = []
+        self._malejaco: Optional[bool] = None  # None = kolejność katalogu
+        self._limit: Optional[int] = None
+        self._offset = 0
+    
+    def _z(self, **zmiany) -> 'Zapytanie':
+        """Zwraca kopię zapytania ze zmienionymi polami"""
+        nowe = copy.copy(self)
+        nowe._filtry = list(self._filtry)
+        for pole, wartosc in zmiany.items():
+            setattr(nowe, pole, wartosc)
+        return nowe
+    
+    def _z_filtrem(self, rodzaj: str, *argumenty) -> 'Zapytanie':
+        nowe = self._z()
+        nowe._filtry.append((rodzaj, argumenty))
+        return nowe
+    
+    # =========================================================================
+    # BUDOWANIE
+    # =========================================================================
+    
+    def gatunek(self, gatunek: str) -> 'Zapytanie':
+        """Tylko gry z podanego gatunku"""
+        return self._z_filtrem('gatunek', gatunek)
+    
+    def lata(self, od_roku: int, do_roku: int) -> 'Zapytanie':
+        """Tylko gry wydane w latach [od_roku, do_roku]"""
+        return self._z_filtrem('lata', od_roku, do_roku)
+    
+    def tytul_zawiera(self, fraza: str) -> 'Zapytanie':
+        """Tylko gry, których tytuł zawiera frazę (bez rozróżniania wielkości liter)"""
+        return self._z_filtrem('tytul', fraza)
+    
+    def sortuj_ocena(self, malejaco: bool = True) -> 'Zapytanie':
+        """Wyniki według średniej oceny (gry bez ocen na końcu)"""
+        return self._z(_malejaco=malejaco)
+    
+    def limit(self, limit: int) -> 'Zapytanie':
+        """Co najwyżej `limit` wyników"""
+        return self._z(_limit=limit)
+    
+    def offset(self, offset: int) -> 'Zapytanie':
+        """Pomija pierwsze `offset` wyników"""
+        return self._z(_offset=offset)
+    
+    # =========================================================================
+    # PLANOWANIE
+    # =========================================================================
+    
+    def _plan(self) -> Tuple[str, int, float, Callable[[], Iterator[Pozycja]], List[Callable]]:
+        """
+        Wybiera źródło kandydatów
+
+        Returns:
+            (opis, liczba kandydatów, szacowana liczba wyników,
+             funkcja tworząca strumień, predykaty do sprawdzenia)
+        """
+        katalog = self._katalog
+        wszystkich = len(katalog.pozycje)
+        predykaty = [FILTRY[rodzaj][2](*argumenty) for rodzaj, argumenty in self._filtry]
+        if not self._filtry or not wszystkich:
+            # Pusty katalog: brak podstaw do szacowania selektywności filtrów
+            return ('wszystkie', wszystkich, wszystkich,
+                    lambda: iter(katalog.pozycje), predykaty)
+        
+        szacunki = [FILTRY[rodzaj][1](katalog, *argumenty) for rodzaj, argumenty in self._filtry]
+        najlepszy = min(range(len(szacunki)), key=szacunki.__getitem__)
+        # Wyniki szacowane przy założeniu niezależności filtrów
+        trafienia = float(wszystkich)
+        for szacunek in szacunki:
+            trafienia *= szacunek / wszystkich
+        
+        rodzaj, argumenty = self._filtry[najlepszy]
+        zapytanie = FILTRY[rodzaj][0]
+        # Warunek indeksu wybranego jako źródło jest już spełniony
+        del predykaty[najlepszy]
+        return (rodzaj, szacunki[najlepszy], trafienia,
+                lambda: katalog._strumien(zapytanie, *argumenty), predykaty)
+    
+    @staticmethod
+    def _filtruj(strumien: Iterator[Pozycja], predykaty: List[Callable]) -> Iterator[Pozycja]:
+        """Przepuszcza kandydatów spełniających wszystkie predykaty"""
+        for warunek in predykaty:
+            strumien = filter(warunek, strumien)
+        return strumien
+    
+    def _z_rankingu(self, kandydaci: int, trafienia: float) -> bool:
+        """
+        Czy przeglądać ranking ocen (zamiast sortować kandydatów)
+
+        Przegląd rankingu zatrzymuje się po offset + limit trafieniach; przy
+        trafieniach rozłożonych równomiernie wymaga to ok. (offset + limit) *
+        n / trafienia kroków, wobec `kandydaci` kroków wyboru przez kopiec.
+        """
+        if self._limit is None or trafienia <= 0:
+            return False
+        potrzebne = self._offset + self._limit
+        return potrzebne * len(self._katalog.pozycje) < kandydaci * trafienia
+    
+    def plan(self) -> str:
+        """Opisuje sposób wykonania zapytania (do diagnostyki)"""
+        zrodlo, kandydaci, trafienia, _, predykaty = self._plan()
+        opis = (f"źródło: {zrodlo} (~{kandydaci} kandydatów, ~{trafienia:.0f} wyników), "
+                f"filtry na kandydatach: {len(predykaty)}")
+        if self._malejaco is not None:
+            opis += (", sortowanie: przegląd rankingu" if self._z_rankingu(kandydaci, trafienia)
+                     else ", sortowanie: kandydaci" + (" (kopiec)" if self._limit is not None else ""))
+        return opis
+    
+    # =========================================================================
+    # WYKONANIE
+    # =========================================================================
+    
+    def __iter__(self) -> Iterator[Pozycja]:
+        """Leniwie zwraca wyniki zapytania (bez blokady - w wielu wątkach wykonaj())"""
+        _, kandydaci, trafienia, zrodlo, predykaty = self._plan()
+        koniec = None if self._limit is None else self._offset + self._limit
+        
+        if self._malejaco is None:
+            return islice(self._filtruj(zrodlo(), predykaty), self._offset, koniec)
+        
+        if self._z_rankingu(kandydaci, trafienia):
+            wszystkie = [FILTRY[rodzaj][2](*argumenty) for rodzaj, argumenty in self._filtry]
+            ranking = self._filtruj(self._katalog.iteruj_po_ocenie(self._malejaco), wszystkie)
+            return islice(ranking, self._offset, koniec)
+        
+        pasujace = self._filtruj(zrodlo(), predykaty)
+        klucz = _klucz_oceny(self._malejaco)
+        if koniec is None:
+            posortowane = sorted(pasujace, key=klucz)
+        else:
+            # nsmallest jest stabilne - remisy w kolejności katalogu, jak w rankingu
+            posortowane = heapq.nsmallest(koniec, pasujace, key=klucz)
+        return iter(posortowane[self._offset:])
+    
+    def wykonaj(self) -> List[Pozycja]:
+        """
+        Wykonuje zapytanie
+
+        Returns:
+            Lista wyników
+        """
+        with self._katalog._czytanie():
+            return list(self)
+    
+    def liczba(self) -> int:
+        """Liczba wyników (z uwzględnieniem limit/offset, bez sortowania)"""
+        with self._katalog._czytanie():
+            _, _, _, zrodlo, predykaty = self._plan()
+            wszystkich = sum(1 for _ in self._filtruj(zrodlo(), predykaty))
+        wynikow = max(wszystkich - self._offset, 0)
+        return wynikow if self._limit is None else min(wynikow, self._limit)
+    
+    def kursor(self, rozmiar_strony: int = 50) -> Kursor:
+        """Zwraca kursor przeglądający wyniki stronami"""
+        return Kursor(self._katalog, lambda: iter(self), rozmiar_strony)